@@ -0,0 +1,437 @@
+"""
+LEVRA AI Voice Agent - Token Server Admission Control
+
+Keeps the token server from handing out more rooms than the agent workers
+can serve and from being flooded by a single client. Two mechanisms:
+
+- RoomCapacity bounds the number of active rooms. It counts the rooms
+  LiveKit reports (refreshed at most once per sync interval) plus rooms
+  allocated that nobody has joined yet, and refuses new rooms over the limit
+  with a retry-after hint instead of creating rooms no agent will ever pick up.
+- RateLimiter is a token bucket per key (identity or client IP).
+
+Both keep their state in AdmissionStore, a small SQLite file shared by every
+worker process of the token server on the same host, so the room cap and the
+rate limits hold for the host as a whole rather than once per worker. A
+request's rate limit charges and room reservation can run in one store
+transaction (see AdmissionStore.transaction). Token
+servers on several hosts each enforce the limits separately: divide
+LEVRA_MAX_ACTIVE_ROOMS and the rate limits by the number of hosts.
+"""
+
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterable
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# ADMISSION CONFIGURATION
+# ------------------------------------------------------------------------
+
+# Maximum active rooms across the deployment, roughly agent workers times the
+# sessions each worker can host (0 disables the limit)
+MAX_ACTIVE_ROOMS = int(os.getenv("LEVRA_MAX_ACTIVE_ROOMS", "0"))
+
+# Seconds between refreshes of the active room count from LiveKit
+ROOM_SYNC_INTERVAL = float(os.getenv("LEVRA_ROOM_SYNC_INTERVAL", "5"))
+
+# Seconds an allocated room counts as active before a participant must have
+# joined it (after which LiveKit's own room list is authoritative)
+ROOM_JOIN_GRACE = float(os.getenv("LEVRA_ROOM_JOIN_GRACE", "60"))
+
+# Token requests allowed per minute for one identity and one client IP
+# (0 disables the respective limit)
+RATE_LIMIT_PER_IDENTITY = float(os.getenv("LEVRA_RATE_LIMIT_PER_IDENTITY", "30"))
+RATE_LIMIT_PER_IP = float(os.getenv("LEVRA_RATE_LIMIT_PER_IP", "600"))
+
+# SQLite file holding the admission state shared by the server's worker processes
+ADMISSION_DB_PATH = os.getenv("LEVRA_ADMISSION_DB",
+                              os.path.join(tempfile.gettempdir(), "levra_admission.db"))
+
+# Seconds between purges of rate limit buckets that have refilled completely
+BUCKET_PRUNE_INTERVAL = 60.0
+
+# SHARED STATE
+# ------------------------------------------------------------------------
+
+CREATE_ADMISSION_TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS rate_buckets (
+        scope TEXT NOT NULL,
+        key TEXT NOT NULL,
+        tokens REAL NOT NULL,
+        updated REAL NOT NULL,
+        PRIMARY KEY (scope, key)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS pending_rooms (
+        name TEXT PRIMARY KEY,
+        allocated REAL NOT NULL
+    )
+    """,
+]
+
+class AdmissionStore:
+    """
+    Admission state shared between processes through one SQLite file.
+
+    Every check runs in an IMMEDIATE transaction, so concurrent worker
+    processes cannot both take the last free slot or token. Checks made
+    inside an open transaction() join it, so one request's checks cost a
+    single cross-process lock. The file is in WAL mode with synchronous=NORMAL:
+    a power loss may forget the last few checks, which only loosens the limits
+    briefly, but never corrupts the file. Times are wall-clock seconds, which
+    all processes share.
+    """
+    def __init__(self, path=ADMISSION_DB_PATH, timeout=5.0):
+        """
+        Initialize the store; the file is opened on first use.
+
+        Args:
+            path (str): SQLite file shared by the worker processes
+            timeout (float): Seconds to wait for another process's transaction
+        """
+        self.path = path
+        self.timeout = timeout
+        self._conn = None
+        self._pid = None
+        self._lock = threading.RLock()
+        self._depth = 0
+
+    def _connect(self):
+        """Open the connection for this process (the caller holds the lock)"""
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                               check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in CREATE_ADMISSION_TABLES_SQL:
+            conn.execute(statement)
+        self._conn, self._pid = conn, os.getpid()
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block in an IMMEDIATE transaction on the shared file.
+
+        A transaction opened while this thread already holds one joins the
+        outer transaction, which commits or rolls back everything together.
+
+        Yields:
+            sqlite3.Connection: Connection inside the transaction
+        """
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self._conn
+                finally:
+                    self._depth -= 1
+                return
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    def take_tokens(self, scope, key, per_minute, cost):
+        """
+        Take cost tokens from a key's bucket if available.
+
+        Args:
+            scope (str): Limiter the bucket belongs to
+            key (str): Identity or client address
+            per_minute (float): Bucket size and refill per minute
+            cost (int): Tokens to take
+
+        Returns:
+            float: 0 if taken, otherwise seconds until enough tokens are available
+        """
+        rate = per_minute / 60.0
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute("SELECT tokens, updated FROM rate_buckets WHERE scope = ? AND key = ?",
+                               (scope, key)).fetchone()
+            tokens = per_minute if row is None else min(per_minute, row[0] + max(0.0, now - row[1]) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                retry_after = 0.0
+            else:
+                retry_after = (cost - tokens) / rate
+            conn.execute("INSERT OR REPLACE INTO rate_buckets (scope, key, tokens, updated) VALUES (?, ?, ?, ?)",
+                         (scope, key, tokens, now))
+        return retry_after
+
+    def prune_buckets(self, scope):
+        """
+        Forget buckets that have refilled completely, which behave exactly
+        like keys never seen, so the table only holds recently active keys.
+        """
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM rate_buckets WHERE scope = ? AND updated < ?",
+                         (scope, time.time() - 60.0))
+
+    def count_buckets(self, scope):
+        """Number of keys with a partially used bucket"""
+        with self.transaction() as conn:
+            return conn.execute("SELECT COUNT(*) FROM rate_buckets WHERE scope = ?", (scope,)).fetchone()[0]
+
+    def pending_rooms(self, since):
+        """Names of rooms allocated after a time and not yet seen on LiveKit"""
+        with self.transaction() as conn:
+            return {row[0] for row in conn.execute("SELECT name FROM pending_rooms WHERE allocated >= ?", (since,))}
+
+    def settle_rooms(self, live, since):
+        """
+        Drop pending rooms that LiveKit now reports or whose join grace expired.
+
+        Args:
+            live (set): Room names open on the LiveKit server
+            since (float): Allocation time before which pending rooms expire
+        """
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM pending_rooms WHERE allocated < ?", (since,))
+            names = [row[0] for row in conn.execute("SELECT name FROM pending_rooms")]
+            conn.executemany("DELETE FROM pending_rooms WHERE name = ?",
+                             [(name,) for name in names if name in live])
+
+    def reserve_rooms(self, names, live, max_rooms, since):
+        """
+        Record rooms as pending if the active total stays within the limit.
+
+        Rooms already open or pending are not counted again, so joining an
+        existing room never needs free capacity.
+
+        Args:
+            names (list): Rooms about to be handed out
+            live (set): Room names open on the LiveKit server
+            max_rooms (int): Maximum active rooms
+            since (float): Allocation time before which pending rooms have expired
+
+        Returns:
+            bool: True if the rooms were reserved
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            in_use = live.union(row[0] for row in conn.execute(
+                "SELECT name FROM pending_rooms WHERE allocated >= ?", (since,)))
+            new = [name for name in dict.fromkeys(names) if name not in in_use]
+            if len(in_use) + len(new) > max_rooms:
+                return False
+            conn.executemany("INSERT OR REPLACE INTO pending_rooms (name, allocated) VALUES (?, ?)",
+                             [(name, now) for name in new])
+        return True
+
+# Admission state shared by the worker processes of this host
+ADMISSION_STORE = AdmissionStore()
+
+# RATE LIMITING
+# ------------------------------------------------------------------------
+
+class RateLimiter:
+    """
+    Token bucket rate limiter keyed by an arbitrary string.
+
+    Each key may burst up to one minute's allowance and then refills
+    continuously. Buckets live in the shared admission store, so a key's
+    allowance is shared by every worker process. Buckets that have refilled
+    completely are purged periodically; a purged key starts with a full
+    bucket, exactly as it would have.
+    """
+    def __init__(self, scope, per_minute, store=ADMISSION_STORE):
+        """
+        Initialize the limiter.
+
+        Args:
+            scope (str): Name separating this limiter's keys from others in the store
+            per_minute (float): Requests allowed per minute per key, 0 disables limiting
+            store (AdmissionStore): Shared state
+        """
+        self.scope = scope
+        self.per_minute = per_minute
+        self._store = store
+        self._pruned_at = time.monotonic()
+        self._limited = 0
+
+    def acquire(self, key, cost=1):
+        """
+        Take cost requests from the key's bucket if available.
+
+        Blocks briefly on the shared store; call it off the event loop.
+
+        Args:
+            key (str): Identity or client address being limited
+            cost (int): Number of requests to charge
+
+        Returns:
+            float: 0 if allowed, otherwise seconds until the request would be allowed
+        """
+        if self.per_minute <= 0:
+            return 0.0
+        if time.monotonic() - self._pruned_at >= BUCKET_PRUNE_INTERVAL:
+            self._pruned_at = time.monotonic()
+            self._store.prune_buckets(self.scope)
+        retry_after = self._store.take_tokens(self.scope, key, self.per_minute, cost)
+        if retry_after:
+            self._limited += 1
+        return retry_after
+
+    def stats(self):
+        """
+        Report limiter usage.
+
+        Returns:
+            dict: Configured rate, keys tracked by all workers and requests
+                this worker rejected
+        """
+        return {
+            "per_minute": self.per_minute,
+            "tracked_keys": self._store.count_buckets(self.scope) if self.per_minute > 0 else 0,
+            "limited": self._limited,
+        }
+
+# ROOM CAPACITY
+# ------------------------------------------------------------------------
+
+class RoomCapacity:
+    """
+    Bounded count of active rooms used to admit or refuse new rooms.
+
+    Each worker process refreshes LiveKit's room list on its own; rooms
+    handed out but not joined yet are kept in the shared admission store, so
+    every worker counts the rooms allocated by the others. Checking capacity
+    and recording new rooms happen in one store transaction, so concurrent
+    requests cannot both take the last free slot.
+    """
+    def __init__(self, list_rooms: Callable[[], Awaitable[Iterable[str]]], max_rooms=MAX_ACTIVE_ROOMS,
+                 sync_interval=ROOM_SYNC_INTERVAL, join_grace=ROOM_JOIN_GRACE, store=ADMISSION_STORE):
+        """
+        Initialize the capacity tracker.
+
+        Args:
+            list_rooms (callable): Coroutine function returning the names of
+                rooms currently open on the LiveKit server
+            max_rooms (int): Maximum active rooms, 0 disables the limit
+            sync_interval (float): Seconds between refreshes of the LiveKit room list
+            join_grace (float): Seconds an allocated, not yet joined room is counted
+            store (AdmissionStore): Shared state
+        """
+        self.max_rooms = max_rooms
+        self.sync_interval = sync_interval
+        self.join_grace = join_grace
+        self._list_rooms = list_rooms
+        self._store = store
+        self._live = set()
+        self._synced_at = None
+        self._syncing = None
+        self._admitted = 0
+        self._rejected = 0
+        self._sync_errors = 0
+
+    @property
+    def enabled(self):
+        """Whether a room limit is configured"""
+        return self.max_rooms > 0
+
+    def _pending(self):
+        """Rooms allocated by any worker and not joined yet"""
+        return self._store.pending_rooms(time.time() - self.join_grace) - self._live
+
+    def in_use(self):
+        """Number of rooms currently counted against the limit"""
+        if not self.enabled:
+            return len(self._live)
+        return len(self._live.union(self._pending()))
+
+    async def sync(self):
+        """Refresh the LiveKit room list if it is older than the sync interval"""
+        if self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        # Concurrent admissions share one in-flight refresh
+        if self._syncing is None:
+            self._syncing = asyncio.ensure_future(self._refresh())
+        await asyncio.shield(self._syncing)
+
+    async def _refresh(self):
+        """Reload the LiveKit room list and expire unjoined rooms"""
+        try:
+            self._live = set(await self._list_rooms())
+            # Rooms LiveKit knows about are counted there; unjoined rooms expire
+            await asyncio.to_thread(self._store.settle_rooms, self._live, time.time() - self.join_grace)
+        except Exception as e:
+            # Keep the last known count; a stale count beats refusing everyone
+            self._sync_errors += 1
+            print(f"Error refreshing active room count: {str(e)}")
+        finally:
+            self._syncing = None
+        self._synced_at = time.monotonic()
+
+    async def admit(self, names):
+        """
+        Admit rooms if capacity allows, recording new ones as active.
+
+        Rooms that are already open or pending (a client joining an existing
+        room) are admitted without taking capacity.
+
+        Args:
+            names (list): Names of the rooms about to be handed out or joined
+
+        Returns:
+            float: 0 if admitted, otherwise suggested seconds before retrying
+        """
+        if not self.enabled or not names:
+            return 0.0
+        await self.sync()
+        return await asyncio.to_thread(self.reserve, names)
+
+    def reserve(self, names):
+        """
+        Admit rooms against the room list from the last sync().
+
+        Blocks briefly on the shared store; call it off the event loop.
+
+        Args:
+            names (list): Names of the rooms about to be handed out or joined
+
+        Returns:
+            float: 0 if admitted, otherwise suggested seconds before retrying
+        """
+        if not self.enabled or not names:
+            return 0.0
+        reserved = self._store.reserve_rooms(names, self._live, self.max_rooms, time.time() - self.join_grace)
+        if not reserved:
+            self._rejected += 1
+            return max(1.0, self._synced_at + self.sync_interval - time.monotonic())
+        self._admitted += 1
+        return 0.0
+
+    def stats(self):
+        """
+        Report capacity usage. Admitted and rejected counts are this
+        worker's; room counts cover every worker.
+
+        Returns:
+            dict: Limit, rooms in use, admitted/rejected requests and sync errors
+        """
+        pending = len(self._pending()) if self.enabled else 0
+        return {
+            "max_rooms": self.max_rooms,
+            "rooms_in_use": len(self._live) + pending,
+            "rooms_pending_join": pending,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "sync_errors": self._sync_errors,
+        }
@@ -2,6 +2,7 @@ from __future__ import annotations
 from livekit.agents import (
     AutoSubscribe,
     JobContext,
+    JobProcess,
     WorkerOptions,
     cli,
     llm
@@ -9,11 +10,20 @@ from livekit.agents import (
 from livekit.agents.multimodal import MultimodalAgent
 from dotenv import load_dotenv
 from api import AssistantFnc
-from prompts import WELCOME_MESSAGE, INSTRUCTIONS, SKILL_ASSESSMENT_MESSAGE, PROVIDE_FEEDBACK
+from latency import LatencyTracker, emit_event
+from welcome_audio import WELCOME_AUDIO, WELCOME_AUDIO_ENABLED, play_welcome_audio
+from context_window import ConversationWindow
+from speech_coalescer import TurnCoalescer
+from worker_load import WorkerLoad, load_threshold
+from prompts import WELCOME_MESSAGE, INSTRUCTIONS, SKILL_ASSESSMENT_MESSAGE, PROVIDE_FEEDBACK, SESSIONS, get_conversation_state
+import asyncio
+import collections
+import dataclasses
 import os
 import sys
 import importlib
 import inspect
+import time
 
 # Load environment variables first to ensure API keys are available
 load_dotenv(override=True)
@@ -21,6 +31,16 @@ load_dotenv(override=True)
 # OPENAI CONFIGURATION
 # ------------------------------------------------------------------------
 
+# Voice of the realtime model, also used for the cached welcome audio
+AGENT_VOICE = "shimmer"
+
+# Metadata marking the responses the agent requests, so they can be told
+# apart from responses the model starts on its own (e.g. after a function call)
+AGENT_RESPONSE_METADATA = {"source": "levra_agent"}
+
+# Seconds agent startup waits for the profile prefetched from the participant identity
+PROFILE_PREFETCH_TIMEOUT = float(os.getenv("LEVRA_PROFILE_PREFETCH_TIMEOUT", "2"))
+
 def setup_openai_api():
     """
     Configure OpenAI API with the key from environment variables.
@@ -48,11 +68,11 @@ def setup_openai_api():
     
     return openai_api_key
 
-# Initialize OpenAI plugin on main thread
+# Initialize OpenAI plugin on main thread. LiveKit only allows plugins to
+# register on the main thread, and prewarm runs on a worker thread when jobs
+# execute in threads (the default on Windows), so this import stays here.
 try:
-    # Import the openai plugin after setting the environment variable
     from livekit.plugins import openai as lk_openai
-    print("Successfully imported LiveKit OpenAI plugin on main thread.")
 except Exception as e:
     print(f"ERROR: Failed to import OpenAI plugin: {str(e)}")
     import traceback
@@ -76,9 +96,13 @@ def configure_model(api_key):
         model = lk_openai.realtime.RealtimeModel(
             api_key=api_key,
             instructions=INSTRUCTIONS,
-            voice="shimmer",
+            voice=AGENT_VOICE,
             temperature=0.8,
             modalities=["audio", "text"],
+            # The server still detects and commits turns, but the agent
+            # decides when to answer once a turn's fragments are merged
+            turn_detection=dataclasses.replace(lk_openai.realtime.DEFAULT_SERVER_VAD_OPTIONS,
+                                               create_response=False),
         )
         return model
     except Exception as e:
@@ -87,6 +111,119 @@ def configure_model(api_key):
         traceback.print_exc()
         sys.exit(1)
 
+# WORKER PREWARM
+# ------------------------------------------------------------------------
+
+def prewarm(proc: JobProcess):
+    """
+    Prepare a worker process before it is handed a job.
+    
+    Runs once per job process while it sits idle in the worker's pool, so
+    API key validation and the OpenAI client import are paid before a user
+    is waiting rather than inside every job. The cached welcome audio is
+    loaded here too. The realtime model itself is
+    still created per job because it binds to the job's event loop.
+    
+    Args:
+        proc (JobProcess): The process being initialized; results are kept in proc.userdata
+    """
+    started = time.perf_counter()
+    
+    openai_api_key = setup_openai_api()
+    import openai as openai_official
+    openai_official.api_key = openai_api_key
+    
+    proc.userdata["openai_api_key"] = openai_api_key
+    
+    # Report live sessions and the memory they hold while jobs are running
+    SESSIONS.start_reporting()
+    
+    # Load a previously synthesized greeting from disk into this process
+    if WELCOME_AUDIO_ENABLED:
+        WELCOME_AUDIO.get(AGENT_VOICE, WELCOME_MESSAGE)
+    proc.userdata["prewarm_ms"] = (time.perf_counter() - started) * 1000
+    print(f"Worker process {proc.pid} prewarmed in {proc.userdata['prewarm_ms']:.1f} ms")
+
+# WELCOME AUDIO
+# ------------------------------------------------------------------------
+
+def start_cached_welcome(ctx: JobContext, api_key, latency, participant_joined):
+    """
+    Play the welcome message from cached audio if it has been synthesized.
+    
+    When no cached audio exists yet, it is synthesized in the background
+    for later sessions and this session greets through the realtime model.
+    
+    Args:
+        ctx (JobContext): The job context with a connected room
+        api_key (str): OpenAI API key for synthesis
+        latency (LatencyTracker): Session latency tracker
+        participant_joined (float): perf_counter time the participant joined
+        
+    Returns:
+        asyncio.Task: The playback task resolving to False if playback failed,
+        or None if the model must greet
+    """
+    if not WELCOME_AUDIO_ENABLED:
+        return None
+    
+    audio = WELCOME_AUDIO.get(AGENT_VOICE, WELCOME_MESSAGE)
+    if audio is None:
+        async def synthesize():
+            try:
+                tts = lk_openai.TTS(model=WELCOME_AUDIO.tts_model, voice=AGENT_VOICE, api_key=api_key)
+                await WELCOME_AUDIO.synthesize(tts, AGENT_VOICE, WELCOME_MESSAGE)
+                print("Welcome audio synthesized and cached")
+            except Exception as e:
+                print(f"Error synthesizing welcome audio: {str(e)}")
+        synthesis_task = asyncio.create_task(synthesize())
+        
+        async def finish_synthesis():
+            await asyncio.wait([synthesis_task], timeout=5)
+        
+        ctx.add_shutdown_callback(finish_synthesis)
+        return None
+    
+    def on_started():
+        latency.observe("join_to_welcome", time.perf_counter() - participant_joined, source="cache")
+    
+    async def play():
+        try:
+            await play_welcome_audio(ctx.room, audio, on_started=on_started)
+            return True
+        except Exception as e:
+            print(f"Error playing cached welcome audio: {str(e)}")
+            return False
+    
+    print(f"Playing cached welcome audio ({audio.duration:.1f}s)")
+    return asyncio.create_task(play())
+
+# PROFILE PREFETCH
+# ------------------------------------------------------------------------
+
+async def prefetch_profile(assistant_fnc: AssistantFnc, identity, latency):
+    """
+    Load the stored profile for a participant identity into the assistant.
+    
+    Args:
+        assistant_fnc (AssistantFnc): Function context to preload
+        identity (str): Participant identity, used as the profile ID
+        latency (LatencyTracker): Session latency tracker
+        
+    Returns:
+        bool: True if a profile was found and loaded
+    """
+    started = time.perf_counter()
+    try:
+        found = await assistant_fnc.prefetch_profile(identity)
+    except Exception as e:
+        print(f"Error prefetching profile for {identity}: {str(e)}")
+        return False
+    latency.observe("profile_prefetch", time.perf_counter() - started, found=found)
+    if found:
+        print(f"Returning user {identity}: profile preloaded, skipping assessment")
+    return found
+
 # LIVEKIT AGENT IMPLEMENTATION
 # ------------------------------------------------------------------------
 
@@ -99,27 +236,62 @@ async def entrypoint(ctx: JobContext):
     Args:
         ctx (JobContext): The LiveKit job context providing room access
     """
-    # Set up OpenAI API globally
-    openai_api_key = setup_openai_api()
+    # Startup timing from the job being accepted to the agent being ready,
+    # excluding the time spent waiting for the user to join
+    job_started = time.perf_counter()
+    
+    # Reuse the key validated by prewarm; fall back for processes started without it
+    openai_api_key = ctx.proc.userdata.get("openai_api_key") or setup_openai_api()
     
     # Connect to LiveKit room and wait for participant
     await ctx.connect(auto_subscribe=AutoSubscribe.SUBSCRIBE_ALL)
-    await ctx.wait_for_participant()
+    connected = time.perf_counter()
+    
+    # Give this job its own conversation state, bound to the current context so
+    # handlers and function tools started below see it, and free it on shutdown
+    session_id = ctx.room.name or ctx.job.id
+    SESSIONS.create(session_id)
+    latency = LatencyTracker(session_id)
+    
+    context_window = None
+    coalescer = None
+    
+    async def release_session_state():
+        SESSIONS.release(session_id)
+        latency.close()
+        if context_window is not None:
+            print(f"Conversation context for {session_id}: {context_window.stats()}")
+        if coalescer is not None:
+            coalescer.close()
+            # Summed across sessions by latency_report.py
+            emit_event({"event": "speech_turns", "session_id": session_id, **coalescer.stats()})
+        print(f"Released session state for {session_id}: {SESSIONS.stats()}")
+    
+    ctx.add_shutdown_callback(release_session_state)
+    
+    participant = await ctx.wait_for_participant()
+    participant_joined = time.perf_counter()
+    
+    # Look up a stored profile for the participant identity (set by the token
+    # server) while the agent is set up, so returning users skip the assessment
+    assistant_fnc = AssistantFnc()
+    profile_prefetch = asyncio.create_task(prefetch_profile(assistant_fnc, participant.identity, latency))
+    
+    # Start the greeting from cached audio right away; the realtime model
+    # session is created in parallel and only takes over after it
+    welcome_task = start_cached_welcome(ctx, openai_api_key, latency, participant_joined)
     
     try:
-        # First create a client directly with correct API key
-        print("Creating custom OpenAI client with API key")
-        import openai as openai_official
-        openai_official.api_key = openai_api_key
-        
         # Initialize the OpenAI realtime model with API key
-        print("Creating RealtimeModel with explicit API key")
         model = configure_model(openai_api_key)
         
-        # Initialize assistant functionality and multimodal agent
-        assistant_fnc = AssistantFnc()
+        # Initialize multimodal agent
         assistant = MultimodalAgent(model=model, fnc_ctx=assistant_fnc)
         
+        # Give the lookup a moment so a returning user's profile is pinned
+        # and routes the first utterance
+        await asyncio.wait([profile_prefetch], timeout=PROFILE_PREFETCH_TIMEOUT)
+        
         # Start the assistant in the room
         print("Starting assistant in room...")
         assistant.start(ctx.room)
@@ -132,98 +304,205 @@ async def entrypoint(ctx: JobContext):
             
         session = model.sessions[0]
         print(f"Session initialized with ID: {session.id if hasattr(session, 'id') else 'unknown'}")
-        welcome_sent = False
         
-        # EVENT HANDLERS
+        # Keep the model's context within a token budget; profile and scenario
+        # facts stay pinned while older turns are compacted into a summary
+        def pinned_facts():
+            facts = []
+            if assistant_fnc.has_profile():
+                facts.append(assistant_fnc.get_profile_str())
+            scenario = get_conversation_state("current_scenario")
+            if scenario:
+                facts.append(f"Current practice scenario: {scenario}")
+            goals = get_conversation_state("session_goals")
+            if goals:
+                facts.append(f"Session goals: {', '.join(str(goal) for goal in goals)}")
+            return "\n".join(facts)
+        
+        context_window = ConversationWindow(session, session_id, facts=pinned_facts)
+        
+        # Put a prefetched profile in front of the model from the start; a
+        # lookup still running is pinned as soon as it completes
+        context_window.refresh_pinned()
+        if not profile_prefetch.done():
+            profile_prefetch.add_done_callback(lambda task: context_window.refresh_pinned())
+        
+        def add_to_conversation(message: llm.ChatMessage):
+            """Create a conversation item, remembering its text for compaction"""
+            context_window.record(message)
+            session.conversation.item.create(message)
+        
+        def request_response():
+            """Ask the model to answer, marking the response as the agent's"""
+            session.response.create(metadata=AGENT_RESPONSE_METADATA)
+        
+        def is_agent_response(response):
+            """Whether a response was requested by request_response"""
+            return (getattr(response, "metadata", None) or {}).get("source") == AGENT_RESPONSE_METADATA["source"]
+        
+        # Merge speech fragments that arrive in quick succession into one turn
+        # and cancel answers the user has already talked over
+        def route_turn(text, committed_at):
+            """Send one merged user turn to the matching conversation handler"""
+            latency.expect_response("speech_to_response", started=committed_at)
+            if assistant_fnc.has_profile():
+                handle_query(text)
+            else:
+                find_profile(text)
+        
+        coalescer = TurnCoalescer(route_turn, session.response.cancel)
+        
+        ready = time.perf_counter()
+        latency.observe("agent_ready", (connected - job_started) + (ready - participant_joined))
+        print(f"Agent ready in {((connected - job_started) + (ready - participant_joined)) * 1000:.1f} ms "
+              f"(connect {(connected - job_started) * 1000:.1f} ms, "
+              f"setup {(ready - participant_joined) * 1000:.1f} ms, "
+              f"waited {(participant_joined - connected) * 1000:.1f} ms for participant)")
+        
+        # WELCOME MESSAGE
         # ------------------------------------------------------------
         
-        @session.on("session_started")
-        def on_session_started():
+        def send_model_welcome(recorded=False):
             """
-            Handle session start event.
-            Sends welcome message to the user only once.
+            Have the realtime model greet the user.
+            
+            Args:
+                recorded (bool): Whether the welcome message is already in the conversation
             """
-            nonlocal welcome_sent
-            if not welcome_sent:
-                print("Sending welcome message to user")  # Debug log
-                try:
-                    session.conversation.item.create(
+            print("Sending welcome message to user")  # Debug log
+            latency.expect_response("join_to_welcome", started=participant_joined)
+            try:
+                if not recorded:
+                    add_to_conversation(
                         llm.ChatMessage(
                             role="assistant",
                             content=WELCOME_MESSAGE
                         )
                     )
-                    session.response.create()
-                    welcome_sent = True
-                    print("Welcome message sent successfully")  # Debug log
-                except Exception as e:
-                    print(f"Error sending welcome message: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-        
-        @session.on("user_speech_committed")
-        def on_user_speech_committed(msg: llm.ChatMessage):
+                request_response()
+                print("Welcome message sent successfully")  # Debug log
+            except Exception as e:
+                latency.cancel_expected_response()
+                print(f"Error sending welcome message: {str(e)}")
+                import traceback
+                traceback.print_exc()
+        
+        def on_cached_welcome_done(task):
+            """Let the model greet instead if cached playback failed"""
+            if task.cancelled() or not task.result():
+                send_model_welcome(recorded=True)
+        
+        if welcome_task is None:
+            send_model_welcome()
+        else:
+            # The greeting is already playing from cache, so only record it
+            # in the conversation instead of generating it again
+            add_to_conversation(
+                llm.ChatMessage(
+                    role="assistant",
+                    content=WELCOME_MESSAGE
+                )
+            )
+            welcome_task.add_done_callback(on_cached_welcome_done)
+        
+        # EVENT HANDLERS
+        # ------------------------------------------------------------
+        
+        # Times the model committed each user utterance, in order; their
+        # transcripts arrive later through user_speech_committed
+        speech_commits = collections.deque()
+        
+        @session.on("input_speech_committed")
+        def on_input_speech_committed():
+            speech_commits.append(time.perf_counter())
+        
+        @session.on("input_speech_transcription_failed")
+        def on_input_speech_transcription_failed(failure):
+            # No transcript will follow for this utterance
+            if speech_commits:
+                speech_commits.popleft()
+        
+        @assistant.on("user_speech_committed")
+        def on_user_speech_committed(text: str):
             """
-            Process user speech after it's been committed.
-            Routes to profile creation or query handling based on state.
+            Process user speech once its transcript is available.
+            The multimodal agent emits one transcript per committed speech
+            fragment; fragments are coalesced into turns, which are routed to
+            profile creation or query handling based on state.
             
             Args:
-                msg (ChatMessage): The message from the user
+                text (str): Transcript of the committed speech
             """
-            # Filter out empty messages
-            if not msg.content:
-                return
-                
-            if isinstance(msg.content, list):
-                # Process multimodal content (text and images)
-                content_items = [x for x in msg.content if x and (not isinstance(x, str) or x.strip())]
-                if not content_items:
-                    return
-                    
-                msg.content = "\n".join("[image]" if isinstance(x, llm.ChatImage) else x for x in content_items)
-            elif isinstance(msg.content, str) and not msg.content.strip():
-                # Skip empty string messages
+            # The user's wait began when the speech was committed, not once
+            # the transcript arrived
+            committed_at = speech_commits.popleft() if speech_commits else time.perf_counter()
+            
+            # Skip empty transcripts
+            if not text or not text.strip():
                 return
             
-            # Route message based on user profile state    
-            if assistant_fnc.has_profile():
-                handle_query(msg)
-            else:
-                find_profile(msg)
+            # Routed by profile state once the user has finished the turn
+            coalescer.add(text, committed_at)
+        
+        # LATENCY INSTRUMENTATION
+        # ------------------------------------------------------------
+        
+        # Only the agent's own responses answer a user turn or the greeting
+        @session.on("response_created")
+        def on_response_created(response):
+            if is_agent_response(response):
+                latency.response_created()
+                coalescer.response_created()
+        
+        @session.on("response_done")
+        def on_response_done(response):
+            if is_agent_response(response):
+                coalescer.response_done()
+        
+        @session.on("metrics_collected")
+        def on_metrics_collected(metrics):
+            latency.response_first_token(getattr(metrics, "ttft", None))
+        
+        @session.on("function_calls_collected")
+        def on_function_calls_collected(calls):
+            for call in calls:
+                latency.function_started(call.tool_call_id, call.function_info.name)
+        
+        @session.on("function_calls_finished")
+        def on_function_calls_finished(called_functions):
+            for called in called_functions:
+                error = repr(called.exception) if called.exception else None
+                latency.function_finished(called.call_info.tool_call_id, error=error)
             
         # CONVERSATION FLOW HANDLERS
         # ------------------------------------------------------------
         
-        def find_profile(msg: llm.ChatMessage):
+        def find_profile(text):
             """
             Handle conversation when user profile doesn't exist.
             Triggers skill assessment flow.
             
             Args:
-                msg (ChatMessage): The message from the user
+                text (str): Transcript of the user's turn
             """
-            session.conversation.item.create(
+            add_to_conversation(
                 llm.ChatMessage(
                     role="system",
-                    content=SKILL_ASSESSMENT_MESSAGE(msg)
+                    content=SKILL_ASSESSMENT_MESSAGE(text)
                 )
             )
-            session.response.create()
+            request_response()
             
-        def handle_query(msg: llm.ChatMessage):
+        def handle_query(text):
             """
             Handle regular conversation when user profile exists.
+            The user's speech is already in the conversation as committed
+            audio, so only a response is requested.
             
             Args:
-                msg (ChatMessage): The message from the user
+                text (str): Transcript of the user's turn
             """
-            session.conversation.item.create(
-                llm.ChatMessage(
-                    role="user",
-                    content=msg.content
-                )
-            )
-            session.response.create()
+            request_response()
             
     except Exception as e:
         print(f"ERROR: Failed to initialize OpenAI connection: {str(e)}")
@@ -235,4 +514,11 @@ async def entrypoint(ctx: JobContext):
 # ------------------------------------------------------------------------
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
\ No newline at end of file
+    # Report load from active sessions and CPU so new jobs go to idle
+    # workers, and stop taking jobs at the session cap or threshold
+    cli.run_app(WorkerOptions(
+        entrypoint_fnc=entrypoint,
+        prewarm_fnc=prewarm,
+        load_fnc=WorkerLoad(),
+        load_threshold=load_threshold(),
+    ))
\ No newline at end of file
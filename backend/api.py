@@ -2,7 +2,7 @@ import enum
 from typing import Annotated
 import logging
 from livekit.agents import llm
-from db_driver import DB
+from db_driver import ASYNC_DB
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -75,7 +75,7 @@ class AssistantFnc(llm.FunctionContext):
                f"and educational background: {self._profile_details[ProfileDetails.Education]}."
     
     @llm.ai_callable(description="lookup a career profile by ID")
-    def lookup_profile(self, id: Annotated[str, llm.TypeInfo(description="The ID of the user to lookup")]):
+    async def lookup_profile(self, id: Annotated[str, llm.TypeInfo(description="The ID of the user to lookup")]):
         """
         Look up a career profile by ID from the database.
         Updates the current profile if found.
@@ -88,19 +88,46 @@ class AssistantFnc(llm.FunctionContext):
         """
         logger.info("lookup profile - id: %s", id)
         
-        result = DB.get_profile_by_id(id)
+        result = await ASYNC_DB.get_profile_by_id(id)
         if result is None:
             return "Profile not found"
         
-        self._profile_details = {
-            ProfileDetails.ID: result.id,
-            ProfileDetails.DreamJob: result.dream_job,
-            ProfileDetails.CurrentSkills: result.current_skills,
-            ProfileDetails.Education: result.education
-        }
+        self.load_profile(result)
         
         return f"The profile details are: {self.get_profile_str()}"
     
+    async def prefetch_profile(self, id):
+        """
+        Load a stored profile without involving the model, e.g. from the
+        participant identity as soon as the user joins.
+        
+        Args:
+            id (str): The unique identifier for the user profile
+            
+        Returns:
+            bool: True if a profile was found and loaded
+        """
+        result = await ASYNC_DB.get_profile_by_id(id)
+        if result is None:
+            return False
+        
+        self.load_profile(result)
+        return True
+    
+    def load_profile(self, profile):
+        """
+        Make a profile the current profile.
+        
+        Args:
+            profile (CareerProfile): Profile read from or written to the database
+        """
+        self._profile_details = {
+            ProfileDetails.ID: profile.id,
+            ProfileDetails.DreamJob: profile.dream_job,
+            ProfileDetails.CurrentSkills: profile.current_skills,
+            ProfileDetails.Education: profile.education
+        }
+    
     @llm.ai_callable(description="get the details of the current profile")
     def get_profile_details(self):
         """
@@ -115,7 +142,7 @@ class AssistantFnc(llm.FunctionContext):
         return self.get_profile_str()
     
     @llm.ai_callable(description="create a new career profile")
-    def create_profile(
+    async def create_profile(
         self, 
         id: Annotated[str, llm.TypeInfo(description="The unique ID for the user")],
         dream_job: Annotated[str, llm.TypeInfo(description="The user's dream job or career aspiration")],
@@ -137,16 +164,11 @@ class AssistantFnc(llm.FunctionContext):
         logger.info("create profile - id: %s, dream_job: %s, current_skills: %s, education: %s", 
                    id, dream_job, current_skills, education)
         
-        result = DB.create_career_profile(id, dream_job, current_skills, education)
+        result = await ASYNC_DB.create_career_profile(id, dream_job, current_skills, education)
         if result is None:
             return "Failed to create profile"
         
-        self._profile_details = {
-            ProfileDetails.ID: result.id,
-            ProfileDetails.DreamJob: result.dream_job,
-            ProfileDetails.CurrentSkills: result.current_skills,
-            ProfileDetails.Education: result.education
-        }
+        self.load_profile(result)
         
         return f"Successfully created profile for {id} with dream job: {dream_job}"
     
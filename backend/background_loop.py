@@ -0,0 +1,112 @@
+"""
+Persistent Background Event Loop
+
+This module provides one long-lived asyncio event loop per process, running
+on a daemon thread. Code that is not itself running on an event loop (Flask
+views, worker threads) submits coroutines to it, so long-lived async resources
+such as HTTP connection pools are created once and keep working across
+requests instead of being bound to a loop that is discarded afterwards.
+"""
+
+from concurrent.futures import Future
+from typing import Coroutine, Optional
+import asyncio
+import atexit
+import threading
+
+class BackgroundEventLoop:
+    """
+    Event loop running forever on its own thread, started on first use.
+    """
+    def __init__(self, name: str = "levra-event-loop"):
+        """
+        Args:
+            name (str): Name of the loop's thread
+        """
+        self._name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        The running loop, starting the thread if needed.
+        
+        Returns:
+            asyncio.AbstractEventLoop: The background loop
+        """
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(target=loop.run_forever, name=self._name, daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def is_current(self) -> bool:
+        """
+        Returns:
+            bool: True when called from a coroutine running on this loop
+        """
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        Schedule a coroutine on the loop from any thread.
+        
+        Args:
+            coro (Coroutine): Coroutine to run
+            
+        Returns:
+            concurrent.futures.Future: Future resolving to the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None):
+        """
+        Run a coroutine on the loop and block the calling thread for the result.
+        Must not be called from the loop's own thread.
+        
+        Args:
+            coro (Coroutine): Coroutine to run
+            timeout (float, optional): Maximum seconds to wait
+            
+        Returns:
+            The coroutine's result
+        """
+        return self.submit(coro).result(timeout)
+
+    async def run_async(self, coro: Coroutine):
+        """
+        Await a coroutine on the background loop from any other event loop.
+        
+        Args:
+            coro (Coroutine): Coroutine to run
+            
+        Returns:
+            The coroutine's result
+        """
+        if self.is_current():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def close(self):
+        """
+        Stop the loop and wait for its thread. Safe to call more than once.
+        """
+        with self._lock:
+            loop, self._loop = self._loop, None
+            if loop is None:
+                return
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=5)
+            loop.close()
+
+# Shared loop for the token server process
+BACKGROUND_LOOP = BackgroundEventLoop()
+atexit.register(BACKGROUND_LOOP.close)
@@ -0,0 +1,409 @@
+"""
+Database Benchmark Utility
+
+This script benchmarks the DatabaseDriver against a temporary database file.
+It never touches the application's real database.
+
+    lookup  compares profile lookup throughput of the legacy connection-per-call
+            mode with the pooled WAL configuration
+    search  compares indexed dream job and full-text skill searches with the
+            equivalent table scans; note that ranked full-text search has to
+            score every match, so very common terms cost more than rare ones
+    suite   measures get_profile_by_id and create_career_profile latency
+            percentiles and throughput at several table sizes, from one thread,
+            many threads and several processes (as LiveKit runs one process
+            per job), and writes the results as JSON for regression tracking
+
+Usage:
+    python benchmark_db.py lookup [--rows N] [--lookups N] [--pool-size N]
+    python benchmark_db.py search [--rows N] [--queries N]
+    python benchmark_db.py suite [--sizes 10000,100000,1000000] [--ops N]
+                                 [--threads N] [--processes N] [--output FILE]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sqlite3
+import statistics
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from db_driver import CareerProfile, DatabaseDriver
+
+# Synthetic profile data used to populate the benchmark database
+DREAM_JOBS = ["product manager", "software engineer", "data scientist", "designer",
+              "nurse", "teacher", "financial analyst", "sales lead"]
+SKILLS = ["communication", "leadership", "teamwork", "problem solving", "python",
+          "negotiation", "public speaking", "empathy", "excel", "mentoring"]
+EDUCATION = ["BSc Computer Science", "MBA", "BA Psychology", "MSc Statistics",
+             "Nursing Diploma", "BEd", "High School"]
+# Long tail of niche skills (tools, certifications) so searches see both
+# very common and rare terms, as in real profiles
+NICHE_SKILLS = [f"tool{i}" for i in range(5000)]
+
+# BENCHMARK HELPERS
+# ------------------------------------------------------------------------
+
+def synthetic_profiles(rows, seed=42, start=0):
+    """
+    Generate deterministic synthetic profiles.
+    
+    Args:
+        rows (int): Generate profiles up to this ID number (exclusive)
+        seed (int): Random seed so runs are comparable
+        start (int): First ID number to generate
+        
+    Yields:
+        CareerProfile: Profiles with IDs user-<start> .. user-(rows-1)
+    """
+    rng = random.Random(seed + start)
+    for i in range(start, rows):
+        yield CareerProfile(
+            id=f"user-{i}",
+            dream_job=rng.choice(DREAM_JOBS),
+            current_skills=", ".join(rng.sample(SKILLS, 2) + [rng.choice(NICHE_SKILLS)]),
+            education=rng.choice(EDUCATION)
+        )
+
+def populate(driver, rows, start=0):
+    """
+    Fill the career_profiles table with synthetic profiles.
+    
+    Args:
+        driver (DatabaseDriver): Driver connected to the benchmark database
+        rows (int): Table size to grow to
+        start (int): Number of synthetic profiles already present
+    """
+    driver.bulk_import_profiles(synthetic_profiles(rows, start=start), batch_size=50000)
+
+def measure_lookups(driver, rows, lookups):
+    """
+    Time a series of random get_profile_by_id calls.
+    
+    Args:
+        driver (DatabaseDriver): Driver under test
+        rows (int): Number of profiles available for lookup
+        lookups (int): Number of lookups to perform
+        
+    Returns:
+        float: Lookups per second
+    """
+    ids = [f"user-{random.randrange(rows)}" for _ in range(lookups)]
+    start = time.perf_counter()
+    for profile_id in ids:
+        driver.get_profile_by_id(profile_id)
+    return lookups / (time.perf_counter() - start)
+
+def time_queries(fn, queries):
+    """
+    Run each query once and collect per-call latencies.
+    
+    Args:
+        fn (callable): Function taking one query argument
+        queries (list): Query arguments
+        
+    Returns:
+        dict: Median and p95 latency in milliseconds
+    """
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0],
+    }
+
+def scan_skills(driver, query):
+    """
+    Reference skill search without the full-text index (LIKE table scan).
+    
+    Both searches must consider every match to order the results, so the
+    scan orders by ID rather than stopping at the first rows it finds.
+    """
+    with driver._connection() as conn:
+        return conn.execute(
+            "SELECT id FROM career_profiles WHERE current_skills LIKE ? OR education LIKE ? ORDER BY id LIMIT 20",
+            (f"%{query}%", f"%{query}%")
+        ).fetchall()
+
+def scan_dream_job(driver, query):
+    """
+    Reference dream job search that bypasses the dream_job index.
+    """
+    with driver._connection() as conn:
+        return conn.execute(
+            "SELECT id FROM career_profiles NOT INDEXED WHERE lower(dream_job) = lower(?) ORDER BY id LIMIT 20",
+            (query,)
+        ).fetchall()
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def run_operations(driver, operation, ops, rows, worker_id, seed):
+    """
+    Perform one worker's share of a suite scenario.
+    
+    Args:
+        driver (DatabaseDriver): Driver to call
+        operation (str): "get_profile_by_id" or "create_career_profile"
+        ops (int): Number of calls to make
+        rows (int): Current table size (lookups target existing IDs)
+        worker_id (str): Unique worker label, used to keep created IDs distinct
+        seed (int): Random seed for lookup IDs
+        
+    Returns:
+        tuple: (latencies in ms, wall-clock start, wall-clock end)
+    """
+    rng = random.Random(seed)
+    latencies = []
+    wall_start = time.time()
+    if operation == "get_profile_by_id":
+        for _ in range(ops):
+            profile_id = f"user-{rng.randrange(rows)}"
+            start = time.perf_counter()
+            driver.get_profile_by_id(profile_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+    else:
+        for i in range(ops):
+            start = time.perf_counter()
+            driver.create_career_profile(f"bench-{worker_id}-{i}", "product manager", "communication", "MBA")
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, wall_start, time.time()
+
+def process_worker(db_path, pool_size, operation, ops, rows, worker_id, seed):
+    """
+    Entry point for suite worker processes: open a driver of its own, as
+    each LiveKit job process does, and run the scenario.
+    """
+    driver = DatabaseDriver(db_path=db_path, pool_size=pool_size)
+    try:
+        return run_operations(driver, operation, ops, rows, worker_id, seed)
+    finally:
+        driver.close()
+
+def summarize(rows, operation, mode, workers, outcomes):
+    """
+    Combine worker outcomes into one result record.
+    
+    Args:
+        rows (int): Table size the scenario ran against
+        operation (str): Driver method measured
+        mode (str): "single", "threads" or "processes"
+        workers (int): Number of concurrent workers
+        outcomes (list[tuple]): run_operations results from every worker
+        
+    Returns:
+        dict: Throughput and latency percentiles
+    """
+    latencies = sorted(latency for outcome in outcomes for latency in outcome[0])
+    elapsed = max(outcome[2] for outcome in outcomes) - min(outcome[1] for outcome in outcomes)
+    return {
+        "rows": rows,
+        "operation": operation,
+        "mode": mode,
+        "workers": workers,
+        "ops": len(latencies),
+        "elapsed_s": round(elapsed, 4),
+        "throughput_ops_s": round(len(latencies) / elapsed, 1) if elapsed > 0 else None,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 4),
+            "p50": round(percentile(latencies, 0.50), 4),
+            "p90": round(percentile(latencies, 0.90), 4),
+            "p99": round(percentile(latencies, 0.99), 4),
+            "max": round(latencies[-1], 4),
+        },
+    }
+
+def run_scenario(db_path, args, rows, operation, mode, workers):
+    """
+    Run one operation at one concurrency level against the benchmark database.
+    
+    Returns:
+        dict: Result record from summarize
+    """
+    ops_per_worker = max(1, args.ops // workers)
+    label = f"{rows}-{operation[:3]}-{mode}"
+
+    if mode == "processes":
+        # spawn matches how LiveKit starts job processes and avoids sharing
+        # SQLite handles across fork
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(process_worker, db_path, args.pool_size, operation, ops_per_worker,
+                                   rows, f"{label}-{w}", w) for w in range(workers)]
+            outcomes = [future.result() for future in futures]
+    else:
+        driver = DatabaseDriver(db_path=db_path, pool_size=max(args.pool_size, workers))
+        try:
+            if workers == 1:
+                outcomes = [run_operations(driver, operation, ops_per_worker, rows, f"{label}-0", 0)]
+            else:
+                barrier = threading.Barrier(workers)
+
+                def thread_worker(w):
+                    barrier.wait()
+                    return run_operations(driver, operation, ops_per_worker, rows, f"{label}-{w}", w)
+
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    outcomes = list(pool.map(thread_worker, range(workers)))
+        finally:
+            driver.close()
+
+    return summarize(rows, operation, mode, workers, outcomes)
+
+# COMMANDS
+# ------------------------------------------------------------------------
+
+def run_lookup(args):
+    """
+    Compare lookup throughput with and without connection pooling.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "benchmark.db")
+        populate_driver = DatabaseDriver(db_path=db_path, pool_size=1)
+        populate(populate_driver, args.rows)
+        populate_driver.close()
+
+        results = {}
+        for label, pool_size in (("connection per call", 0), ("pooled", args.pool_size)):
+            driver = DatabaseDriver(db_path=db_path, pool_size=pool_size)
+            results[label] = measure_lookups(driver, args.rows, args.lookups)
+            driver.close()
+
+    print("\n===== PROFILE LOOKUP THROUGHPUT =====")
+    for label, rate in results.items():
+        print(f"{label:>20}: {rate:,.0f} lookups/s")
+    baseline = results["connection per call"]
+    print(f"\nSpeedup: {results['pooled'] / baseline:.1f}x")
+
+def run_search(args):
+    """
+    Compare indexed searches with full table scans.
+    """
+    rng = random.Random(7)
+    common_queries = [rng.choice(SKILLS).split()[0] for _ in range(args.queries)]
+    rare_queries = [rng.choice(NICHE_SKILLS) for _ in range(args.queries)]
+    job_queries = [rng.choice(DREAM_JOBS).upper() for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "benchmark.db")
+        driver = DatabaseDriver(db_path=db_path, pool_size=1)
+        print(f"Populating {args.rows:,} profiles...")
+        start = time.perf_counter()
+        populate(driver, args.rows)
+        print(f"Populated in {time.perf_counter() - start:.1f}s "
+              f"(full-text index: {'on' if driver.full_text_search_enabled else 'off'})")
+
+        results = {
+            "dream job (index)": time_queries(driver.search_profiles_by_dream_job, job_queries),
+            "dream job (scan)": time_queries(lambda q: scan_dream_job(driver, q), job_queries),
+            "rare skill (fts5)": time_queries(driver.search_profiles_by_skills, rare_queries),
+            "rare skill (scan)": time_queries(lambda q: scan_skills(driver, q), rare_queries),
+            "common skill (fts5)": time_queries(driver.search_profiles_by_skills, common_queries),
+            "common skill (scan)": time_queries(lambda q: scan_skills(driver, q), common_queries),
+        }
+        driver.close()
+
+    print(f"\n===== SEARCH LATENCY AT {args.rows:,} ROWS =====")
+    for label, result in results.items():
+        print(f"{label:>22}: p50 {result['p50_ms']:8.2f} ms   p95 {result['p95_ms']:8.2f} ms")
+
+def run_suite(args):
+    """
+    Run every operation and concurrency mode at each table size and write JSON.
+    """
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    modes = [("single", 1), ("threads", args.threads), ("processes", args.processes)]
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "suite.db")
+        driver = DatabaseDriver(db_path=db_path, pool_size=1)
+        populated = 0
+        for rows in sizes:
+            print(f"Populating {rows:,} profiles...", file=sys.stderr)
+            populate(driver, rows, start=populated)
+            populated = rows
+            for operation in ("get_profile_by_id", "create_career_profile"):
+                for mode, workers in modes:
+                    result = run_scenario(db_path, args, rows, operation, mode, workers)
+                    results.append(result)
+                    print(f"  {operation:<22} {mode:<10} x{workers:<3} "
+                          f"{result['throughput_ops_s']:>10,.0f} ops/s   "
+                          f"p50 {result['latency_ms']['p50']:.3f} ms   "
+                          f"p99 {result['latency_ms']['p99']:.3f} ms", file=sys.stderr)
+        driver.close()
+
+    report = {
+        "benchmark": "database_driver_suite",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "sizes": sizes,
+            "ops": args.ops,
+            "threads": args.threads,
+            "processes": args.processes,
+            "pool_size": args.pool_size,
+        },
+        "results": results,
+    }
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+# APPLICATION ENTRY POINT
+# ------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the DatabaseDriver")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    lookup_parser = subparsers.add_parser("lookup", help="pooled vs unpooled profile lookups")
+    lookup_parser.add_argument("--rows", type=int, default=10000, help="profiles to populate")
+    lookup_parser.add_argument("--lookups", type=int, default=20000, help="lookups to time per mode")
+    lookup_parser.add_argument("--pool-size", type=int, default=4, help="pool size for the pooled run")
+    lookup_parser.set_defaults(handler=run_lookup)
+
+    search_parser = subparsers.add_parser("search", help="indexed vs scanned profile searches")
+    search_parser.add_argument("--rows", type=int, default=1000000, help="profiles to populate")
+    search_parser.add_argument("--queries", type=int, default=50, help="queries to time per method")
+    search_parser.set_defaults(handler=run_search)
+
+    suite_parser = subparsers.add_parser("suite", help="latency/throughput suite with JSON output")
+    suite_parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated table sizes")
+    suite_parser.add_argument("--ops", type=int, default=5000, help="operations per scenario (split across workers)")
+    suite_parser.add_argument("--threads", type=int, default=8, help="workers for the threaded mode")
+    suite_parser.add_argument("--processes", type=int, default=4, help="workers for the multi-process mode")
+    suite_parser.add_argument("--pool-size", type=int, default=4, help="connection pool size per driver")
+    suite_parser.add_argument("--output", default="benchmark_results.json", help="JSON file, or - for stdout")
+    suite_parser.set_defaults(handler=run_suite)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Skill Trend Benchmark Utility
+
+This script records a large synthetic performance history and compares the
+cost of trend queries between the previous implementation, which rescanned
+the whole history on every call, and the incremental per-skill aggregates
+maintained by track_performance. It also checks both give the same answers.
+
+Usage:
+    python benchmark_skill_trends.py [--entries N] [--queries N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+# Keep the benchmark's persisted history out of the application database;
+# must be set before prompts (and through it db_driver) is imported
+_TMP_DIR = tempfile.TemporaryDirectory()
+os.environ["LEVRA_DB_PATH"] = os.path.join(_TMP_DIR.name, "benchmark.db")
+
+import prompts
+
+SKILLS = ["communication", "leadership", "teamwork", "problem_solving",
+          "adaptability", "time_management", "emotional_intelligence", "critical_thinking"]
+
+# BENCHMARK HELPERS
+# ------------------------------------------------------------------------
+
+def rescan_skill_trend(history, skill_name):
+    """
+    The previous get_skill_trends implementation, which rebuilds the list of
+    scores for the skill from the full history on each call.
+    """
+    skill_scores = [entry["skill_scores"].get(skill_name, 0) for entry in history if skill_name in entry["skill_scores"]]
+    
+    if len(skill_scores) < 2:
+        return "insufficient_data"
+    
+    recent_avg = sum(skill_scores[-3:]) / len(skill_scores[-3:])
+    earlier_avg = sum(skill_scores[:-3]) / len(skill_scores[:-3]) if len(skill_scores) > 3 else skill_scores[0]
+    
+    if recent_avg > earlier_avg + 0.5:
+        return "improving"
+    elif recent_avg < earlier_avg - 0.5:
+        return "declining"
+    else:
+        return "stable"
+
+def record_history(entries, seed=42):
+    """
+    Record synthetic scored interactions through track_performance.
+    
+    Args:
+        entries (int): Number of interactions to record
+        seed (int): Random seed so runs are comparable
+        
+    Returns:
+        list[dict]: The full history, as the rescanning implementation needs it
+    """
+    rng = random.Random(seed)
+    history = []
+    for _ in range(entries):
+        skill_scores = {skill: rng.randint(1, 10) for skill in rng.sample(SKILLS, rng.randint(1, 4))}
+        history.append(prompts.track_performance("benchmark", skill_scores))
+    return history
+
+def time_calls(fn, calls):
+    """
+    Time repeated calls to fn.
+    
+    Returns:
+        float: Average microseconds per call
+    """
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(SKILLS[i % len(SKILLS)])
+    return (time.perf_counter() - start) / calls * 1e6
+
+# APPLICATION ENTRY POINT
+# ------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill trend queries")
+    parser.add_argument("--entries", type=int, default=100000, help="performance entries to record")
+    parser.add_argument("--queries", type=int, default=200, help="trend queries to time per method")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    history = record_history(args.entries)
+    record_us = (time.perf_counter() - start) / args.entries * 1e6
+
+    mismatches = [skill for skill in SKILLS
+                  if rescan_skill_trend(history, skill) != prompts.get_skill_trends(skill)]
+
+    rescan_us = time_calls(lambda skill: rescan_skill_trend(history, skill), args.queries)
+    aggregate_us = time_calls(prompts.get_skill_trends, args.queries)
+
+    start = time.perf_counter()
+    prompts.get_all_skill_trends()
+    all_us = (time.perf_counter() - start) * 1e6
+
+    print(f"\n===== SKILL TRENDS WITH {args.entries:,} ENTRIES =====")
+    print(f"      track_performance: {record_us:10.2f} us/call")
+    print(f"   rescan history trend: {rescan_us:10.2f} us/call")
+    print(f"   aggregate trend     : {aggregate_us:10.2f} us/call")
+    print(f"   all skills at once  : {all_us:10.2f} us")
+    print(f"\nSpeedup: {rescan_us / aggregate_us:,.0f}x, "
+          f"results {'match' if not mismatches else 'DIFFER for ' + ', '.join(mismatches)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+LEVRA AI Voice Agent - Bounded Conversation Context
+
+Without trimming, every utterance adds items to the realtime model's
+server-side conversation and long coaching sessions resend an ever-growing
+context, so response latency and cost climb over the session.
+
+ConversationWindow keeps that context within a token budget:
+
+- After every response, the model-reported prompt size is compared to the
+  budget. When it is exceeded, the oldest turns (outside a window of recent
+  items that is always kept) are deleted from the conversation.
+- Deleted turns are folded into a rolling summary, kept as a single system
+  item and itself bounded in size, so the model still knows what happened
+  earlier in the session.
+- Profile and scenario facts live in a pinned system item that is never
+  compacted and is refreshed whenever the facts change.
+
+Per-turn prompt token counts are emitted as structured "context" events,
+summarized by latency_report.py, so it can be verified that they stay flat.
+"""
+
+import os
+
+from livekit.agents import llm
+
+from latency import emit_event
+
+# CONTEXT CONFIGURATION
+# ------------------------------------------------------------------------
+
+# Prompt tokens above which older turns are compacted
+CONTEXT_TOKEN_BUDGET = int(os.getenv("LEVRA_CONTEXT_TOKEN_BUDGET", "6000"))
+
+# Most recent conversation items that are never compacted
+CONTEXT_KEEP_RECENT = int(os.getenv("LEVRA_CONTEXT_KEEP_RECENT", "8"))
+
+# Maximum estimated tokens of the rolling summary of compacted turns
+SUMMARY_TOKEN_BUDGET = int(os.getenv("LEVRA_SUMMARY_TOKEN_BUDGET", "500"))
+
+# Characters of each compacted turn kept in the summary
+SUMMARY_TURN_CHARS = 240
+
+# Rough text size of a token, used where no model count is available
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text):
+    """Rough token count of a piece of text"""
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+class ConversationWindow:
+    """
+    Token-budgeted sliding window over a realtime session's conversation.
+
+    Texts of items are collected as they appear (user transcripts, assistant
+    transcripts, messages created by the agent) because audio items carry no
+    text on the server side. Item sizes are estimated from those texts and
+    scaled to the model's actual prompt token count, so the estimate tracks
+    audio tokens as well.
+    """
+    def __init__(self, session, session_id, facts=None, token_budget=CONTEXT_TOKEN_BUDGET,
+                 keep_recent=CONTEXT_KEEP_RECENT, summary_tokens=SUMMARY_TOKEN_BUDGET):
+        """
+        Initialize the window and subscribe to the session's events.
+
+        Args:
+            session: Realtime model session whose conversation is managed
+            session_id (str): Session identifier attached to events
+            facts (callable, optional): Returns the text of the facts to keep pinned
+            token_budget (int): Prompt tokens above which turns are compacted
+            keep_recent (int): Most recent items that are never compacted
+            summary_tokens (int): Maximum estimated tokens of the rolling summary
+        """
+        self.session = session
+        self.session_id = session_id
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.summary_tokens = summary_tokens
+        self._facts = facts
+        self._texts = {}
+        self._summary_lines = []
+        self._summary_item_id = None
+        self._pinned_item_id = None
+        self._pinned_text = None
+        self.turns = 0
+        self.compactions = 0
+        self.items_compacted = 0
+
+        session.on("input_speech_transcription_completed", self._on_transcription)
+        session.on("response_done", self._on_response_done)
+        session.on("metrics_collected", self._on_metrics)
+
+    # TEXT COLLECTION
+    # ------------------------------------------------------------
+
+    def record(self, message):
+        """
+        Remember the text of a message the agent adds to the conversation.
+
+        Args:
+            message (ChatMessage): Message about to be created in the session
+        """
+        if isinstance(message.content, str):
+            self._texts[message.id] = (message.role, message.content)
+
+    def _on_transcription(self, transcription):
+        self._texts[transcription.item_id] = ("user", transcription.transcript)
+
+    def _on_response_done(self, response):
+        for output in response.output:
+            text = "".join(content.text for content in output.content)
+            if text:
+                self._texts[output.item_id] = (output.role, text)
+
+    # COMPACTION
+    # ------------------------------------------------------------
+
+    def _on_metrics(self, metrics):
+        prompt_tokens = getattr(metrics, "prompt_tokens", None)
+        if not prompt_tokens or getattr(metrics, "cancelled", False):
+            return
+        self.turns += 1
+        compacted = self.compact(prompt_tokens)
+        emit_event({"event": "context", "session_id": self.session_id, "turn": self.turns,
+                    "prompt_tokens": prompt_tokens, "completion_tokens": getattr(metrics, "completion_tokens", None),
+                    "compacted_items": compacted, "summary_tokens": estimate_tokens("\n".join(self._summary_lines))})
+
+    def compact(self, prompt_tokens):
+        """
+        Refresh pinned facts and, if over budget, compact the oldest turns.
+
+        Args:
+            prompt_tokens (int): Prompt tokens the model reported for the last turn
+
+        Returns:
+            int: Number of conversation items removed
+        """
+        self.refresh_pinned()
+        if prompt_tokens <= self.token_budget:
+            return 0
+
+        reserved = {self._summary_item_id, self._pinned_item_id}
+        items = [msg for msg in self.session.chat_ctx_copy().messages if msg.id not in reserved]
+        candidates = items[:max(0, len(items) - self.keep_recent)]
+        if not candidates:
+            return 0
+
+        # Scale text estimates to the real prompt size so audio is accounted for
+        estimates = {msg.id: estimate_tokens(self._text_of(msg)[1]) or 1 for msg in items}
+        scale = prompt_tokens / max(1, sum(estimates.values()))
+        excess = prompt_tokens - self.token_budget
+
+        dropped = []
+        freed = 0
+        for msg in candidates:
+            if freed >= excess:
+                break
+            dropped.append(msg)
+            freed += estimates[msg.id] * scale
+        # A function call and its output are removed together
+        call_ids = {msg.tool_call_id for msg in dropped if msg.tool_call_id}
+        dropped_ids = {msg.id for msg in dropped}
+        dropped += [msg for msg in items if msg.tool_call_id in call_ids and msg.id not in dropped_ids]
+        dropped_ids = {msg.id for msg in dropped}
+        dropped = [msg for msg in items if msg.id in dropped_ids]
+
+        for msg in dropped:
+            role, text = self._text_of(msg)
+            if text and not msg.tool_call_id:
+                text = " ".join(text.split())
+                self._summary_lines.append(f"{role}: {text[:SUMMARY_TURN_CHARS]}")
+
+        # Keep only the most recent part of the summary within its budget
+        while len(self._summary_lines) > 1 and estimate_tokens("\n".join(self._summary_lines)) > self.summary_tokens:
+            self._summary_lines.pop(0)
+        # The new summary takes the place of the dropped turns, so it is
+        # created after the last of them before they are deleted
+        self._replace_summary(after=dropped[-1].id)
+
+        for msg in dropped:
+            self.session.conversation.item.delete(item_id=msg.id)
+            self._texts.pop(msg.id, None)
+
+        self.compactions += 1
+        self.items_compacted += len(dropped)
+        return len(dropped)
+
+    def _text_of(self, msg):
+        """Role and best known text of a conversation item"""
+        if msg.id in self._texts:
+            return self._texts[msg.id]
+        return msg.role, msg.content if isinstance(msg.content, str) else ""
+
+    def _replace_summary(self, after):
+        """
+        Swap the summary item for one reflecting the current summary lines.
+
+        Items are always anchored to an existing item: the server reports
+        no predecessor for an item created at the head of the conversation,
+        which the session's local copy would append at the end instead.
+
+        Args:
+            after (str): ID of the item the new summary is created after
+        """
+        previous_id = self._summary_item_id
+        self._summary_item_id = None
+        if self._summary_lines:
+            message = llm.ChatMessage(
+                role="system",
+                content="Summary of the earlier part of this coaching session:\n" + "\n".join(self._summary_lines)
+            )
+            self.session.conversation.item.create(message, previous_item_id=after)
+            self._summary_item_id = message.id
+        if previous_id:
+            self.session.conversation.item.delete(item_id=previous_id)
+
+    # PINNED FACTS
+    # ------------------------------------------------------------
+
+    def refresh_pinned(self):
+        """
+        Re-create the pinned facts item if the facts have changed.
+
+        Updated facts replace the previous item in place. The first facts
+        are appended, which puts them first when pinned at session start.
+        """
+        if self._facts is None:
+            return
+        text = self._facts()
+        if text == self._pinned_text:
+            return
+        previous_id = self._pinned_item_id
+        self._pinned_item_id = None
+        self._pinned_text = text
+        if text:
+            message = llm.ChatMessage(role="system", content=f"Known facts about this learner and session:\n{text}")
+            self.session.conversation.item.create(message, previous_item_id=previous_id)
+            self._pinned_item_id = message.id
+        if previous_id:
+            self.session.conversation.item.delete(item_id=previous_id)
+
+    def stats(self):
+        """
+        Report window activity.
+
+        Returns:
+            dict: Turns seen, compactions, items removed and summary size
+        """
+        return {
+            "turns": self.turns,
+            "compactions": self.compactions,
+            "items_compacted": self.items_compacted,
+            "summary_lines": len(self._summary_lines),
+        }
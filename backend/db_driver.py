@@ -9,11 +9,238 @@ The module follows the Data Access Object (DAO) pattern to separate data persist
 from business logic.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+import asyncio
+import atexit
+import json
+import queue
 import sqlite3
+import threading
+import time
 import os
 
+# DATABASE CONFIGURATION
+# ------------------------------------------------------------------------
+
+# Location of the SQLite database file; override with LEVRA_DB_PATH to point
+# every component (agent, admin scripts, benchmarks) at the same file
+DEFAULT_DB_PATH = os.getenv(
+    "LEVRA_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "career_assistant.db")
+)
+
+# Number of connections kept open by the pool (0 disables pooling and opens
+# a fresh connection per call, which is the legacy behaviour)
+DEFAULT_POOL_SIZE = int(os.getenv("LEVRA_DB_POOL_SIZE", "4"))
+
+# Page cache per connection in KiB (negative values are KiB for SQLite)
+DEFAULT_CACHE_SIZE_KB = int(os.getenv("LEVRA_DB_CACHE_KB", "8192"))
+
+# Seconds a caller waits for a pooled connection or a database lock
+DEFAULT_TIMEOUT = float(os.getenv("LEVRA_DB_TIMEOUT", "5.0"))
+
+# Read-through profile cache: maximum entries (0 disables the cache), seconds a
+# found profile stays fresh, and seconds a "not found" answer is remembered
+DEFAULT_PROFILE_CACHE_SIZE = int(os.getenv("LEVRA_PROFILE_CACHE_SIZE", "1024"))
+DEFAULT_PROFILE_CACHE_TTL = float(os.getenv("LEVRA_PROFILE_CACHE_TTL", "300"))
+DEFAULT_PROFILE_CACHE_NEGATIVE_TTL = float(os.getenv("LEVRA_PROFILE_CACHE_NEGATIVE_TTL", "30"))
+
+# Number of compiled statements kept per connection by the sqlite3 module.
+# All queries below are module-level constants so they are compiled once per
+# connection and reused from this cache on every call.
+STATEMENT_CACHE_SIZE = 128
+
+# SQL STATEMENTS
+# ------------------------------------------------------------------------
+
+CREATE_PROFILES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS career_profiles (
+        doc_id INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        dream_job TEXT,
+        current_skills TEXT,
+        education TEXT
+    )
+"""
+INSERT_PROFILE_SQL = "INSERT INTO career_profiles (id, dream_job, current_skills, education) VALUES (?, ?, ?, ?)"
+SELECT_PROFILE_SQL = "SELECT id, dream_job, current_skills, education FROM career_profiles WHERE id = ?"
+SELECT_PROFILES_PAGE_SQL = "SELECT id, dream_job, current_skills, education FROM career_profiles WHERE id > ? ORDER BY id LIMIT ?"
+
+# Schema migrations applied in order on startup; PRAGMA user_version records
+# the last version applied to a database file
+SCHEMA_MIGRATIONS = [
+    (1, [
+        # Case-insensitive index so dream job equality and prefix (LIKE 'x%')
+        # searches avoid a full table scan; id is included so equality matches
+        # come back already in ID order without a sort
+        "CREATE INDEX IF NOT EXISTS idx_career_profiles_dream_job "
+        "ON career_profiles (dream_job COLLATE NOCASE, id)",
+    ]),
+    (2, [
+        # Full-text index over skills and education keyed by the profiles'
+        # rowid (superseded by migrations 4 and 5)
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS career_profiles_fts USING fts5(
+            current_skills, education,
+            content='career_profiles', content_rowid='rowid'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS career_profiles_fts_insert AFTER INSERT ON career_profiles BEGIN
+            INSERT INTO career_profiles_fts (rowid, current_skills, education)
+            VALUES (new.rowid, new.current_skills, new.education);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS career_profiles_fts_delete AFTER DELETE ON career_profiles BEGIN
+            INSERT INTO career_profiles_fts (career_profiles_fts, rowid, current_skills, education)
+            VALUES ('delete', old.rowid, old.current_skills, old.education);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS career_profiles_fts_update AFTER UPDATE ON career_profiles BEGIN
+            INSERT INTO career_profiles_fts (career_profiles_fts, rowid, current_skills, education)
+            VALUES ('delete', old.rowid, old.current_skills, old.education);
+            INSERT INTO career_profiles_fts (rowid, current_skills, education)
+            VALUES (new.rowid, new.current_skills, new.education);
+        END
+        """,
+        # Index the rows that existed before the migration
+        "INSERT INTO career_profiles_fts (career_profiles_fts) VALUES ('rebuild')",
+    ]),
+    (3, [
+        # Durable record of scored coaching interactions (see track_performance)
+        """
+        CREATE TABLE IF NOT EXISTS performance_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT,
+            scenario_type TEXT,
+            skill_scores TEXT,
+            overall_score REAL,
+            user_feedback TEXT,
+            recorded_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_performance_history_session "
+        "ON performance_history (session_id, recorded_at)",
+    ]),
+    (4, [
+        # Give profiles a stable integer key for the full-text index: the
+        # implicit rowid of a TEXT PRIMARY KEY table may be renumbered by VACUUM,
+        # while an INTEGER PRIMARY KEY is the rowid and never changes
+        "DROP TRIGGER IF EXISTS career_profiles_fts_insert",
+        "DROP TRIGGER IF EXISTS career_profiles_fts_delete",
+        "DROP TRIGGER IF EXISTS career_profiles_fts_update",
+        "DROP TABLE IF EXISTS career_profiles_fts",
+        """
+        CREATE TABLE career_profiles_v4 (
+            doc_id INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            dream_job TEXT,
+            current_skills TEXT,
+            education TEXT
+        )
+        """,
+        "INSERT INTO career_profiles_v4 (id, dream_job, current_skills, education) "
+        "SELECT id, dream_job, current_skills, education FROM career_profiles ORDER BY rowid",
+        "DROP TABLE career_profiles",
+        "ALTER TABLE career_profiles_v4 RENAME TO career_profiles",
+        "CREATE INDEX IF NOT EXISTS idx_career_profiles_dream_job "
+        "ON career_profiles (dream_job COLLATE NOCASE, id)",
+    ]),
+    (5, [
+        # Full-text index over skills and education, stored as an external
+        # content table keyed by doc_id and kept in sync by triggers
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS career_profiles_fts USING fts5(
+            current_skills, education,
+            content='career_profiles', content_rowid='doc_id'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS career_profiles_fts_insert AFTER INSERT ON career_profiles BEGIN
+            INSERT INTO career_profiles_fts (rowid, current_skills, education)
+            VALUES (new.doc_id, new.current_skills, new.education);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS career_profiles_fts_delete AFTER DELETE ON career_profiles BEGIN
+            INSERT INTO career_profiles_fts (career_profiles_fts, rowid, current_skills, education)
+            VALUES ('delete', old.doc_id, old.current_skills, old.education);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS career_profiles_fts_update AFTER UPDATE ON career_profiles BEGIN
+            INSERT INTO career_profiles_fts (career_profiles_fts, rowid, current_skills, education)
+            VALUES ('delete', old.doc_id, old.current_skills, old.education);
+            INSERT INTO career_profiles_fts (rowid, current_skills, education)
+            VALUES (new.doc_id, new.current_skills, new.education);
+        END
+        """,
+        "INSERT INTO career_profiles_fts (career_profiles_fts) VALUES ('rebuild')",
+    ]),
+]
+
+SEARCH_DREAM_JOB_SQL = """
+    SELECT id, dream_job, current_skills, education FROM career_profiles
+    WHERE dream_job = ? COLLATE NOCASE ORDER BY id LIMIT ?
+"""
+SEARCH_DREAM_JOB_PREFIX_SQL = """
+    SELECT id, dream_job, current_skills, education FROM career_profiles
+    WHERE dream_job LIKE ? ESCAPE '\\' ORDER BY id LIMIT ?
+"""
+# Skills matches weigh twice as much as education matches in the ranking
+SEARCH_SKILLS_SQL = """
+    SELECT p.id, p.dream_job, p.current_skills, p.education
+    FROM career_profiles_fts
+    JOIN career_profiles AS p ON p.doc_id = career_profiles_fts.rowid
+    WHERE career_profiles_fts MATCH ?
+    ORDER BY bm25(career_profiles_fts, 2.0, 1.0)
+    LIMIT ?
+"""
+SEARCH_SKILLS_SCAN_SQL = """
+    SELECT id, dream_job, current_skills, education FROM career_profiles
+    WHERE {conditions} ORDER BY id LIMIT ?
+"""
+
+# Bulk insert statements keyed by conflict policy
+BULK_INSERT_SQL = {
+    "skip": "INSERT OR IGNORE INTO career_profiles (id, dream_job, current_skills, education) VALUES (?, ?, ?, ?)",
+    "upsert": """
+        INSERT INTO career_profiles (id, dream_job, current_skills, education) VALUES (?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            dream_job = excluded.dream_job,
+            current_skills = excluded.current_skills,
+            education = excluded.education
+    """,
+    "fail": INSERT_PROFILE_SQL,
+}
+
+INSERT_PERFORMANCE_SQL = """
+    INSERT INTO performance_history (session_id, scenario_type, skill_scores, overall_score, user_feedback, recorded_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+SELECT_PERFORMANCE_SQL = """
+    SELECT session_id, scenario_type, skill_scores, overall_score, user_feedback, recorded_at
+    FROM performance_history {where} ORDER BY recorded_at DESC, id DESC LIMIT ?
+"""
+
+# Write-behind settings for performance history: rows per insert batch,
+# seconds a partial batch may wait, and entries buffered before dropping
+DEFAULT_PERFORMANCE_BATCH_SIZE = int(os.getenv("LEVRA_PERFORMANCE_BATCH_SIZE", "100"))
+DEFAULT_PERFORMANCE_FLUSH_INTERVAL = float(os.getenv("LEVRA_PERFORMANCE_FLUSH_INTERVAL", "2.0"))
+DEFAULT_PERFORMANCE_QUEUE_SIZE = int(os.getenv("LEVRA_PERFORMANCE_QUEUE_SIZE", "10000"))
+
+# Seconds between checks that the writer thread is still alive while flushing
+FLUSH_POLL_INTERVAL = 0.5
+
+# Rows written per transaction by bulk imports
+DEFAULT_BULK_BATCH_SIZE = 5000
+
 @dataclass
 class CareerProfile:
     """
@@ -33,6 +260,165 @@ class CareerProfile:
     current_skills: str
     education: str
     
+class ProfileCache:
+    """
+    Bounded, thread-safe LRU cache of career profiles keyed by profile ID.
+    
+    Entries expire after a TTL. Lookups that found no profile are cached as
+    well (with their own, usually shorter, TTL) so repeated lookups of unknown
+    IDs do not reach the database either. Hit, miss and eviction counters are
+    kept for monitoring.
+    
+    Every write to an ID (storing a profile or invalidating it) is numbered.
+    A reader takes generation() before querying the database and passes it
+    back to put(), so a read that raced with a write is discarded instead
+    of caching a stale profile, or hiding a new one for the negative TTL.
+    """
+    # Marker stored for IDs known not to exist in the database
+    NOT_FOUND = object()
+
+    def __init__(self, max_entries: int = DEFAULT_PROFILE_CACHE_SIZE, ttl: float = DEFAULT_PROFILE_CACHE_TTL,
+                 negative_ttl: float = DEFAULT_PROFILE_CACHE_NEGATIVE_TTL):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_entries (int): Maximum number of cached IDs before LRU eviction
+            ttl (float): Seconds a cached profile stays valid
+            negative_ttl (float): Seconds a cached "not found" result stays valid
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Write number of recently written IDs, bounded like the entries; IDs
+        # dropped from it are covered by the newest write number dropped
+        self._writes = 0
+        self._written = OrderedDict()
+        self._forgotten_write = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, id: str):
+        """
+        Look up a profile ID in the cache.
+        
+        Args:
+            id (str): Profile ID to look up
+            
+        Returns:
+            CareerProfile, ProfileCache.NOT_FOUND, or None when the ID is not cached
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[id]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(id)
+            self.hits += 1
+            return value
+
+    def generation(self) -> int:
+        """
+        Number of the latest write, taken before reading the database.
+        
+        Returns:
+            int: Value to pass as put(since=...) with the result of the read
+        """
+        with self._lock:
+            return self._writes
+
+    def _note_write(self, id: str):
+        """Number a write to an ID; the caller holds the lock"""
+        self._writes += 1
+        self._written[id] = self._writes
+        self._written.move_to_end(id)
+        while len(self._written) > max(1, self._max_entries):
+            _, forgotten = self._written.popitem(last=False)
+            self._forgotten_write = forgotten
+
+    def _written_since(self, id: str, since: int) -> bool:
+        """Whether an ID may have been written after a generation; the caller holds the lock"""
+        return self._written.get(id, self._forgotten_write) > since
+
+    def put(self, id: str, profile: Optional["CareerProfile"], since: Optional[int] = None):
+        """
+        Store a lookup result, evicting the least recently used entries if full.
+        
+        Args:
+            id (str): Profile ID the result belongs to
+            profile (CareerProfile, optional): Found profile, or None for "not found"
+            since (int, optional): generation() taken before the database read; the
+                result is discarded if the ID was written after it. Omitted only by
+                writers, whose value is the newest and counts as a write itself
+        """
+        if profile is None:
+            value, ttl = self.NOT_FOUND, self._negative_ttl
+        else:
+            value, ttl = profile, self._ttl
+
+        with self._lock:
+            if since is None:
+                self._note_write(id)
+            elif self._written_since(id, since):
+                return
+            if ttl <= 0:
+                return
+            self._entries[id] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, id: str):
+        """
+        Drop any cached result for a profile ID.
+        
+        Args:
+            id (str): Profile ID to forget
+        """
+        with self._lock:
+            self._note_write(id)
+            self._entries.pop(id, None)
+
+    def clear(self):
+        """
+        Drop every cached entry. Counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Snapshot of the cache counters.
+        
+        Returns:
+            dict: Size, capacity, hits, misses, evictions, expirations and hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
 class DatabaseDriver:
     """
     Manages database operations for career profiles.
@@ -41,43 +427,221 @@ class DatabaseDriver:
     connection management, schema initialization, and CRUD operations
     for career profiles.
     """
-    def __init__(self):
+    def __init__(self, db_path: Optional[str] = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 cache_size_kb: int = DEFAULT_CACHE_SIZE_KB, timeout: float = DEFAULT_TIMEOUT,
+                 profile_cache: Optional[ProfileCache] = None):
         """
         Initialize the database driver.
         
-        Creates a database connection to a SQLite file in the same directory
-        and ensures required tables exist.
+        Opens a bounded pool of SQLite connections to the configured database
+        file and ensures required tables exist.
+        
+        Args:
+            db_path (str, optional): Path to the SQLite file (defaults to DEFAULT_DB_PATH)
+            pool_size (int): Number of pooled connections; 0 opens one connection per call
+            cache_size_kb (int): SQLite page cache size per connection in KiB
+            timeout (float): Seconds to wait for a free connection or a database lock
+            profile_cache (ProfileCache, optional): Read-through cache for profile lookups
         """
-        self._db_path = os.path.join(os.path.dirname(__file__), "career_assistant.db")
+        self._db_path = db_path or DEFAULT_DB_PATH
+        self._pool_size = max(0, pool_size)
+        self._cache_size_kb = cache_size_kb
+        self._timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=self._pool_size) if self._pool_size else None
+        self._all_connections = []
+        self._pool_lock = threading.Lock()
+        self._closed = False
+        self._profile_cache = profile_cache
+        self._fts_enabled = False
         self._init_db()
         
     def _init_db(self):
         """
         Initialize the database schema if it doesn't exist.
         
-        Creates the career_profiles table with appropriate columns
-        for storing user career data.
+        Switches the database to WAL journaling (a persistent, file-level setting),
+        creates the career_profiles table with appropriate columns
+        for storing user career data and applies pending schema migrations.
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS career_profiles (
-                    id TEXT PRIMARY KEY,
-                    dream_job TEXT,
-                    current_skills TEXT,
-                    education TEXT
-                )
-            """)
-            conn.commit()
-            
-    def _get_connection(self):
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute(CREATE_PROFILES_TABLE_SQL)
+            self._migrate(conn)
+
+    def _migrate(self, conn):
+        """
+        Apply the SCHEMA_MIGRATIONS newer than the database's user_version.
+        
+        Each migration runs in its own IMMEDIATE transaction, so concurrent
+        processes starting at the same time apply it exactly once. If SQLite
+        was built without FTS5 the full-text migration is recorded as applied
+        without creating the index, and skill searches fall back to a table scan.
+        
+        Args:
+            conn (sqlite3.Connection): Borrowed pool connection
+        """
+        for version, statements in SCHEMA_MIGRATIONS:
+            try:
+                self._apply_migration(conn, version, statements)
+            except sqlite3.OperationalError as e:
+                conn.rollback()
+                if "fts5" not in str(e):
+                    raise
+                print(f"Database warning: full-text search unavailable ({e})")
+                self._apply_migration(conn, version, [])
+
+        self._fts_enabled = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'career_profiles_fts'"
+        ).fetchone() is not None
+
+    def _apply_migration(self, conn, version, statements):
+        """
+        Run one migration's statements and bump user_version, unless the
+        database is already at or beyond that version.
+        
+        Args:
+            conn (sqlite3.Connection): Borrowed pool connection
+            version (int): Schema version the migration brings the database to
+            statements (list[str]): SQL statements to execute
+        """
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("PRAGMA user_version").fetchone()[0] < version:
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+        conn.commit()
+
+    @property
+    def full_text_search_enabled(self):
+        """
+        Whether the FTS5 skills index is available in this database.
+        
+        Returns:
+            bool: True if skill searches use the full-text index
         """
-        Establish and return a database connection.
+        return self._fts_enabled
+
+    def _create_connection(self):
+        """
+        Open and configure a new database connection.
+        
+        WAL mode lets readers proceed while a writer commits, and
+        synchronous=NORMAL is durable across application crashes in WAL mode
+        while avoiding an fsync on every commit.
         
         Returns:
+            sqlite3.Connection: Configured connection to the SQLite database
+        """
+        conn = sqlite3.connect(
+            self._db_path,
+            timeout=self._timeout,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self._cache_size_kb)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA busy_timeout={int(self._timeout * 1000)}")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """
+        Borrow a connection from the pool for the duration of a block.
+        
+        Connections are opened lazily up to pool_size and returned to the pool
+        afterwards. Any transaction left open by the caller is rolled back so
+        the next borrower always receives a clean connection.
+        
+        Yields:
             sqlite3.Connection: Active connection to the SQLite database
+            
+        Raises:
+            sqlite3.OperationalError: If the driver is closed or no connection
+                becomes available within the configured timeout
+        """
+        if self._closed:
+            raise sqlite3.OperationalError("Database driver is closed")
+
+        if self._pool is None:
+            conn = self._create_connection()
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._release(conn)
+
+    def _acquire(self):
+        """
+        Take an idle connection from the pool, opening a new one if the pool
+        has not reached its size limit yet.
+        
+        Returns:
+            sqlite3.Connection: Connection reserved for the caller
         """
-        return sqlite3.connect(self._db_path)
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._pool_lock:
+            if len(self._all_connections) < self._pool_size:
+                conn = self._create_connection()
+                self._all_connections.append(conn)
+                return conn
+
+        try:
+            return self._pool.get(timeout=self._timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a database connection")
+
+    def _release(self, conn):
+        """
+        Return a borrowed connection to the pool, or close it if the driver
+        has been shut down in the meantime.
+        
+        Args:
+            conn (sqlite3.Connection): Connection previously obtained from _acquire
+        """
+        # Checked under the lock so close() cannot drain the pool between the
+        # check and the put, which would leave this connection open
+        with self._pool_lock:
+            if self._closed:
+                conn.close()
+                return
+            self._pool.put_nowait(conn)
+
+    def close(self):
+        """
+        Close every pooled connection and reject further use of the driver.
+        
+        Connections that are checked out at the time of the call are closed
+        when they are released. Safe to call more than once.
+        """
+        with self._pool_lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        if self._pool is None:
+            return
+
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
     
     def create_career_profile(self, id: str, dream_job: str, current_skills: str, education: str) -> Optional[CareerProfile]:
         """
@@ -96,22 +660,27 @@ class DatabaseDriver:
             No exceptions are raised; errors are logged and None is returned on failure
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "INSERT INTO career_profiles (id, dream_job, current_skills, education) VALUES (?, ?, ?, ?)",
-                    (id, dream_job, current_skills, education)
-                )
-                conn.commit()
-                return CareerProfile(id=id, dream_job=dream_job, current_skills=current_skills, education=education)
+            with self._connection() as conn, conn:
+                conn.execute(INSERT_PROFILE_SQL, (id, dream_job, current_skills, education))
         except sqlite3.Error as e:
             print(f"Database error: {e}")
+            if self._profile_cache is not None:
+                self._profile_cache.invalidate(id)
             return None
 
+        profile = CareerProfile(id=id, dream_job=dream_job, current_skills=current_skills, education=education)
+        if self._profile_cache is not None:
+            self._profile_cache.put(id, profile)
+        return profile
+
     def get_profile_by_id(self, id: str) -> Optional[CareerProfile]:
         """
         Retrieve a career profile by its unique identifier.
         
+        Served from the profile cache when one is configured; database results
+        (including "not found") are stored in the cache on the way back, unless
+        the profile was created or changed while the database was being read.
+        
         Args:
             id (str): Unique identifier of the profile to retrieve
             
@@ -121,24 +690,576 @@ class DatabaseDriver:
         Raises:
             No exceptions are raised; errors are logged and None is returned on failure
         """
+        if self._profile_cache is not None:
+            cached = self._profile_cache.get(id)
+            if cached is ProfileCache.NOT_FOUND:
+                return None
+            if cached is not None:
+                return cached
+            generation = self._profile_cache.generation()
+
+        try:
+            with self._connection() as conn:
+                row = conn.execute(SELECT_PROFILE_SQL, (id,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+
+        profile = None
+        if row:
+            profile = CareerProfile(
+                id=row[0],
+                dream_job=row[1],
+                current_skills=row[2],
+                education=row[3]
+            )
+
+        if self._profile_cache is not None:
+            self._profile_cache.put(id, profile, since=generation)
+        return profile
+
+    def bulk_import_profiles(self, profiles: Iterable[CareerProfile], batch_size: int = DEFAULT_BULK_BATCH_SIZE,
+                             on_conflict: str = "skip", on_batch=None) -> dict:
+        """
+        Insert a stream of career profiles using batched executemany calls.
+        
+        Each batch is written in a single transaction, so the cost of a commit
+        is paid once per batch instead of once per row. The input is consumed
+        lazily and only one batch is held in memory at a time.
+        
+        Args:
+            profiles (Iterable[CareerProfile]): Profiles to import
+            batch_size (int): Rows written per transaction
+            on_conflict (str): "skip" keeps existing rows, "upsert" overwrites them,
+                "fail" aborts the current batch on the first duplicate ID
+            on_batch (callable, optional): Called with the running "processed" and
+                "written" counts after each batch is committed
+            
+        Returns:
+            dict: Number of rows "processed", "written" and "skipped"
+            
+        Raises:
+            ValueError: If on_conflict is not a known policy
+            sqlite3.Error: If a batch fails; earlier batches stay committed
+            
+        Errors raised by the profiles iterable propagate the same way: the
+        batch being collected is discarded and earlier batches stay committed.
+        """
+        if on_conflict not in BULK_INSERT_SQL:
+            raise ValueError(f"Unknown conflict policy: {on_conflict}")
+        sql = BULK_INSERT_SQL[on_conflict]
+        batch_size = max(1, batch_size)
+
+        processed = written = 0
+        with self._connection() as conn:
+            batch = []
+            for profile in profiles:
+                batch.append((profile.id, profile.dream_job, profile.current_skills, profile.education))
+                if len(batch) >= batch_size:
+                    written += self._write_batch(conn, sql, batch)
+                    processed += len(batch)
+                    batch = []
+                    if on_batch:
+                        on_batch(processed, written)
+            if batch:
+                written += self._write_batch(conn, sql, batch)
+                processed += len(batch)
+                if on_batch:
+                    on_batch(processed, written)
+
+        return {"processed": processed, "written": written, "skipped": processed - written}
+
+    def _write_batch(self, conn, sql, batch):
+        """
+        Write one batch of profile rows in a single transaction and drop the
+        affected IDs from the profile cache.
+        
+        Args:
+            conn (sqlite3.Connection): Borrowed pool connection
+            sql (str): Insert statement for the active conflict policy
+            batch (list[tuple]): Rows to write
+            
+        Returns:
+            int: Number of rows inserted or updated
+        """
+        # rowcount rather than total_changes, which also counts the rows the
+        # full-text index triggers write
+        with conn:
+            written = conn.executemany(sql, batch).rowcount
+        if self._profile_cache is not None:
+            for row in batch:
+                self._profile_cache.invalidate(row[0])
+        return written
+
+    def iter_profiles(self, after: str = "", batch_size: int = DEFAULT_BULK_BATCH_SIZE) -> Iterator[CareerProfile]:
+        """
+        Stream every career profile in ID order.
+        
+        Profiles are fetched in pages using keyset pagination on the primary
+        key, and the pool connection is returned between pages, so exports of
+        any size run in constant memory without starving other callers.
+        
+        Args:
+            after (str): Only yield profiles whose ID sorts after this value
+            batch_size (int): Rows fetched per page
+            
+        Yields:
+            CareerProfile: Profiles in ascending ID order
+        """
+        batch_size = max(1, batch_size)
+        while True:
+            with self._connection() as conn:
+                rows = conn.execute(SELECT_PROFILES_PAGE_SQL, (after, batch_size)).fetchall()
+            for row in rows:
+                yield CareerProfile(id=row[0], dream_job=row[1], current_skills=row[2], education=row[3])
+            if len(rows) < batch_size:
+                return
+            after = rows[-1][0]
+
+    def search_profiles_by_dream_job(self, dream_job: str, limit: int = 20, prefix: bool = False) -> list[CareerProfile]:
+        """
+        Find profiles aiming for a given dream job using the dream_job index.
+        
+        Args:
+            dream_job (str): Dream job to match, case-insensitively
+            limit (int): Maximum number of profiles to return
+            prefix (bool): Match every dream job starting with the given text
+            
+        Returns:
+            list[CareerProfile]: Matching profiles ordered by ID (empty on error)
+        """
+        if prefix:
+            escaped = dream_job.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            sql, params = SEARCH_DREAM_JOB_PREFIX_SQL, (escaped + "%", limit)
+        else:
+            sql, params = SEARCH_DREAM_JOB_SQL, (dream_job, limit)
+        return self._search(sql, params)
+
+    def search_profiles_by_skills(self, query: str, limit: int = 20, match_all: bool = True) -> list[CareerProfile]:
+        """
+        Full-text search over current skills and education, best matches first.
+        
+        The query is split into words which are matched as literal terms, so
+        user input can never produce an FTS syntax error. Results are ranked by
+        BM25 with skills weighted above education.
+        
+        Args:
+            query (str): Free-text search such as "leadership public speaking"
+            limit (int): Maximum number of profiles to return
+            match_all (bool): Require every word (AND) instead of any word (OR)
+            
+        Returns:
+            list[CareerProfile]: Matching profiles in rank order (empty on error)
+        """
+        terms = [term for term in query.split() if term.strip('"')]
+        if not terms:
+            return []
+
+        if not self.full_text_search_enabled:
+            # Unranked fallback for SQLite builds without FTS5
+            clause = "(current_skills LIKE ? OR education LIKE ?)"
+            joiner = " AND " if match_all else " OR "
+            params = []
+            for term in terms:
+                params += [f"%{term}%", f"%{term}%"]
+            sql = SEARCH_SKILLS_SCAN_SQL.format(conditions=joiner.join([clause] * len(terms)))
+            return self._search(sql, (*params, limit))
+
+        joiner = " AND " if match_all else " OR "
+        match = joiner.join('"' + term.replace('"', '""') + '"' for term in terms)
+        return self._search(SEARCH_SKILLS_SQL, (match, limit))
+
+    def rebuild_search_index(self):
+        """
+        Rebuild the full-text index from the career_profiles table.
+        
+        The index is keyed by the doc_id INTEGER PRIMARY KEY, which VACUUM
+        keeps, so this is only needed to repair an index edited by hand.
+        """
+        if not self.full_text_search_enabled:
+            return
+        with self._connection() as conn, conn:
+            conn.execute("INSERT INTO career_profiles_fts (career_profiles_fts) VALUES ('rebuild')")
+
+    def _search(self, sql, params):
+        """
+        Run a profile search query and convert the rows to profiles.
+        
+        Args:
+            sql (str): Query selecting id, dream_job, current_skills, education
+            params (tuple): Query parameters
+            
+        Returns:
+            list[CareerProfile]: Matching profiles (empty on error)
+        """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM career_profiles WHERE id = ?", (id,))
-                row = cursor.fetchone()
-                if not row:
-                    return None
+            with self._connection() as conn:
+                rows = conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+        return [CareerProfile(id=row[0], dream_job=row[1], current_skills=row[2], education=row[3]) for row in rows]
+
+    def record_performance_entries(self, entries: list[dict]) -> int:
+        """
+        Persist a batch of performance history entries in one transaction.
+        
+        Args:
+            entries (list[dict]): Entries as produced by track_performance, with
+                an optional "session_id" and a numeric "recorded_at" timestamp
                 
-                return CareerProfile(
-                    id=row[0],
-                    dream_job=row[1],
-                    current_skills=row[2],
-                    education=row[3]
-                )
+        Returns:
+            int: Number of rows written
+            
+        Raises:
+            sqlite3.Error: If the batch could not be written
+        """
+        rows = [(
+            entry.get("session_id"),
+            entry.get("scenario_type"),
+            json.dumps(entry.get("skill_scores") or {}, default=str),
+            entry.get("overall_score"),
+            None if entry.get("user_feedback") is None else json.dumps(entry["user_feedback"], default=str),
+            entry.get("recorded_at") or time.time()
+        ) for entry in entries]
+
+        with self._connection() as conn, conn:
+            conn.executemany(INSERT_PERFORMANCE_SQL, rows)
+        return len(rows)
+
+    def get_performance_history(self, session_id: Optional[str] = None, limit: int = 100) -> list[dict]:
+        """
+        Retrieve the most recent persisted performance entries.
+        
+        Args:
+            session_id (str, optional): Only return entries for this session
+            limit (int): Maximum number of entries to return
+            
+        Returns:
+            list[dict]: Entries in chronological order (empty on error)
+        """
+        if session_id is None:
+            sql, params = SELECT_PERFORMANCE_SQL.format(where=""), (limit,)
+        else:
+            sql, params = SELECT_PERFORMANCE_SQL.format(where="WHERE session_id = ?"), (session_id, limit)
+
+        try:
+            with self._connection() as conn:
+                rows = conn.execute(sql, params).fetchall()
         except sqlite3.Error as e:
             print(f"Database error: {e}")
+            return []
+
+        return [{
+            "session_id": row[0],
+            "scenario_type": row[1],
+            "skill_scores": json.loads(row[2]) if row[2] else {},
+            "overall_score": row[3],
+            "user_feedback": json.loads(row[4]) if row[4] else None,
+            "recorded_at": row[5]
+        } for row in reversed(rows)]
+
+    def profile_cache_stats(self):
+        """
+        Report the profile cache counters.
+        
+        Returns:
+            dict: Cache statistics, or None if the cache is disabled
+        """
+        if self._profile_cache is None:
             return None
+        return self._profile_cache.stats()
+
+class AsyncDatabaseDriver:
+    """
+    Asyncio front-end for a DatabaseDriver.
+    
+    The LiveKit agent runs every session of a worker on one event loop, so a
+    blocking SQLite call there stalls audio and event handling for all of them.
+    This wrapper runs each query on a dedicated thread pool (sized to the
+    driver's connection pool) and exposes awaitable versions of the query methods.
+    """
+    def __init__(self, driver: DatabaseDriver, max_workers: Optional[int] = None):
+        """
+        Initialize the async driver.
+        
+        Args:
+            driver (DatabaseDriver): Synchronous driver that performs the queries
+            max_workers (int, optional): Executor threads (defaults to the driver's pool size)
+        """
+        self._driver = driver
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(1, driver._pool_size),
+            thread_name_prefix="levra-db"
+        )
+
+    async def _run(self, fn, *args):
+        """
+        Run a blocking driver method on the database executor.
+        
+        Args:
+            fn (callable): Bound DatabaseDriver method to call
+            *args: Positional arguments passed to the method
+            
+        Returns:
+            The method's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
 
-# Singleton database driver instance for application-wide use
-# This provides a single point of access to database operations
-DB = DatabaseDriver()
+    async def create_career_profile(self, id: str, dream_job: str, current_skills: str, education: str) -> Optional[CareerProfile]:
+        """
+        Awaitable version of DatabaseDriver.create_career_profile.
+        
+        Returns:
+            CareerProfile: Created profile object if successful, None otherwise
+        """
+        return await self._run(self._driver.create_career_profile, id, dream_job, current_skills, education)
+
+    async def get_profile_by_id(self, id: str) -> Optional[CareerProfile]:
+        """
+        Awaitable version of DatabaseDriver.get_profile_by_id.
+        
+        Returns:
+            CareerProfile: The found profile or None if not found
+        """
+        return await self._run(self._driver.get_profile_by_id, id)
+
+    async def search_profiles_by_dream_job(self, dream_job: str, limit: int = 20, prefix: bool = False) -> list[CareerProfile]:
+        """
+        Awaitable version of DatabaseDriver.search_profiles_by_dream_job.
+        
+        Returns:
+            list[CareerProfile]: Matching profiles ordered by ID
+        """
+        return await self._run(self._driver.search_profiles_by_dream_job, dream_job, limit, prefix)
+
+    async def search_profiles_by_skills(self, query: str, limit: int = 20, match_all: bool = True) -> list[CareerProfile]:
+        """
+        Awaitable version of DatabaseDriver.search_profiles_by_skills.
+        
+        Returns:
+            list[CareerProfile]: Matching profiles in rank order
+        """
+        return await self._run(self._driver.search_profiles_by_skills, query, limit, match_all)
+
+    def close(self):
+        """
+        Wait for queued queries to finish and stop the executor threads.
+        """
+        self._executor.shutdown(wait=True)
+
+class PerformanceHistoryWriter:
+    """
+    Write-behind queue that persists performance history off the caller's thread.
+    
+    record() only enqueues and never blocks; a background thread collects
+    entries into batches and writes them with a single transaction when the
+    batch is full, when the oldest buffered entry is older than the flush
+    interval, on flush() and on close(). If the buffer is full (the database
+    is unavailable for a long time) new entries are dropped and counted.
+    """
+    # Queue marker asking the writer thread to exit after writing its batch
+    _STOP = object()
+
+    def __init__(self, driver: DatabaseDriver, batch_size: int = DEFAULT_PERFORMANCE_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_PERFORMANCE_FLUSH_INTERVAL,
+                 max_queue: int = DEFAULT_PERFORMANCE_QUEUE_SIZE):
+        """
+        Initialize the writer and start its background thread.
+        
+        Args:
+            driver (DatabaseDriver): Driver used to write batches
+            batch_size (int): Entries written per transaction
+            flush_interval (float): Maximum seconds an entry waits before being written
+            max_queue (int): Entries buffered before new ones are dropped
+        """
+        self._driver = driver
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name="levra-performance-writer", daemon=True)
+        self._thread.start()
+
+    def record(self, entry: dict) -> bool:
+        """
+        Queue a performance entry for persistence without blocking.
+        
+        Args:
+            entry (dict): Entry to persist (see DatabaseDriver.record_performance_entries)
+            
+        Returns:
+            bool: True if queued, False if the writer is closed or the buffer is full
+        """
+        if self._closed:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every entry queued before this call has been written.
+        
+        Args:
+            timeout (float, optional): Maximum seconds to wait
+            
+        Returns:
+            bool: True if the flush completed within the timeout, False on
+                timeout or if the writer thread is no longer running
+        """
+        if self._closed or not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        # Wait in slices so a writer thread that died cannot block the caller forever
+        while not done.is_set():
+            if not self._thread.is_alive():
+                return False
+            remaining = FLUSH_POLL_INTERVAL if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            done.wait(min(remaining, FLUSH_POLL_INTERVAL))
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """
+        Write any buffered entries and stop the background thread.
+        Safe to call more than once.
+        
+        Args:
+            timeout (float): Maximum seconds to wait for the final flush
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            print("Performance history writer: buffer full at shutdown, pending entries lost")
+            return
+        self._thread.join(timeout)
+
+    def stats(self):
+        """
+        Snapshot of the writer counters.
+        
+        Returns:
+            dict: Entries written, dropped, failed and currently queued
+        """
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "queued": self._queue.qsize(),
+        }
+
+    def _run(self):
+        """
+        Background loop collecting queued entries into batches and writing them.
+        """
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                batch = self._write(batch)
+                continue
+
+            if item is self._STOP:
+                self._write(batch)
+                return
+            if isinstance(item, threading.Event):
+                batch = self._write(batch)
+                item.set()
+                continue
+
+            batch.append(item)
+            if len(batch) == 1:
+                deadline = time.monotonic() + self._flush_interval
+            if len(batch) >= self._batch_size:
+                batch = self._write(batch)
+
+    def _write(self, batch):
+        """
+        Write a batch, counting (rather than retrying) failures of any kind.
+        
+        Args:
+            batch (list[dict]): Entries to write
+            
+        Returns:
+            list: A fresh empty batch
+        """
+        if batch:
+            try:
+                self.written += self._driver.record_performance_entries(batch)
+            except sqlite3.Error as e:
+                self.failed += len(batch)
+                print(f"Database error: {e}")
+            except Exception as e:
+                # A bad entry must not stop the writer thread; later batches still get written
+                self.failed += len(batch)
+                print(f"Performance history writer: dropped batch of {len(batch)} entries: {e!r}")
+        return []
+
+# Singleton database driver instance for application-wide use, together with
+# non-blocking access to it for code running on an event loop (ASYNC_DB) and
+# background persistence of performance history (PERFORMANCE_WRITER, see
+# prompts.track_performance). They are created on first access, so tools that
+# import this module for another database (profile_io --db) never open,
+# migrate or start threads for DEFAULT_DB_PATH.
+# The profile cache is enabled unless LEVRA_PROFILE_CACHE_SIZE is set to 0
+SINGLETON_NAMES = ("DB", "ASYNC_DB", "PERFORMANCE_WRITER")
+_singletons_lock = threading.Lock()
+
+def _create_singletons():
+    """
+    Build the application-wide driver, async wrapper and history writer.
+    
+    Returns:
+        dict: Singleton name -> instance
+    """
+    db = DatabaseDriver(
+        profile_cache=ProfileCache() if DEFAULT_PROFILE_CACHE_SIZE > 0 else None
+    )
+    async_db = AsyncDatabaseDriver(db)
+    performance_writer = PerformanceHistoryWriter(db)
+
+    # Flush buffered history and drain the executor, then release pooled connections
+    # (and checkpoint the WAL) when the process exits; atexit runs handlers in
+    # reverse registration order
+    atexit.register(db.close)
+    atexit.register(async_db.close)
+    atexit.register(performance_writer.close)
+    return {"DB": db, "ASYNC_DB": async_db, "PERFORMANCE_WRITER": performance_writer}
+
+def __getattr__(name):
+    """
+    Create the singletons the first time one of them is looked up.
+    
+    Args:
+        name (str): Module attribute not found by normal lookup
+        
+    Returns:
+        The requested singleton
+    """
+    if name not in SINGLETON_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _singletons_lock:
+        if name not in globals():
+            globals().update(_create_singletons())
+    return globals()[name]
@@ -0,0 +1,144 @@
+"""
+Local LiveKit Room Service Stand-in
+
+A small Twirp server that answers the LiveKit room service calls used by the
+token server (ListRooms, CreateRoom, DeleteRoom) from an in-memory room list,
+so the token server can be load tested without a LiveKit deployment.
+
+The number of pre-existing rooms, the latency added to every call and a
+rate of injected failures are configurable. Point the token server at it
+with LIVEKIT_URL (any API key and secret are accepted):
+
+    python fake_livekit.py --port 7880 --rooms 5000 --latency-ms 20
+    LIVEKIT_URL=http://127.0.0.1:7880 python server.py --production
+
+Usage:
+    python fake_livekit.py [--host HOST] [--port PORT] [--rooms N]
+                           [--latency-ms MS] [--jitter-ms MS] [--error-rate P]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from aiohttp import web
+from livekit.protocol.models import Room
+from livekit.protocol.room import (
+    CreateRoomRequest,
+    DeleteRoomRequest,
+    DeleteRoomResponse,
+    ListRoomsRequest,
+    ListRoomsResponse,
+)
+
+# Twirp path prefix of the LiveKit room service
+TWIRP_PREFIX = "/twirp/livekit.RoomService"
+
+# FAKE ROOM SERVICE
+# ------------------------------------------------------------------------
+
+class FakeRoomService:
+    """
+    In-memory room service with injectable latency and failures.
+    """
+    def __init__(self, rooms=0, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0):
+        """
+        Initialize the service.
+
+        Args:
+            rooms (int): Number of rooms that exist from the start
+            latency_ms (float): Delay added to every call in milliseconds
+            jitter_ms (float): Random extra delay of up to this many milliseconds
+            error_rate (float): Fraction of calls answered with a 503 Twirp error
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rooms = {}
+        for i in range(rooms):
+            self._add_room(f"existing-{i}")
+        self.calls = {}
+        self.errors = 0
+
+    def _add_room(self, name):
+        room = Room(sid=f"RM_{len(self.rooms):012d}", name=name, creation_time=int(time.time()))
+        self.rooms[name] = room
+        return room
+
+    async def _simulate(self, method):
+        """
+        Apply latency and possibly fail the call.
+
+        Returns:
+            web.Response: An error response to return instead of the result, or None
+        """
+        self.calls[method] = self.calls.get(method, 0) + 1
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and random.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response({"code": "unavailable", "msg": "injected failure"}, status=503)
+        return None
+
+    async def list_rooms(self, request):
+        failure = await self._simulate("ListRooms")
+        if failure:
+            return failure
+        names = ListRoomsRequest.FromString(await request.read()).names
+        rooms = [self.rooms[name] for name in names if name in self.rooms] if names else self.rooms.values()
+        return web.Response(body=ListRoomsResponse(rooms=rooms).SerializeToString(),
+                            content_type="application/protobuf")
+
+    async def create_room(self, request):
+        failure = await self._simulate("CreateRoom")
+        if failure:
+            return failure
+        name = CreateRoomRequest.FromString(await request.read()).name
+        room = self.rooms.get(name) or self._add_room(name)
+        return web.Response(body=room.SerializeToString(), content_type="application/protobuf")
+
+    async def delete_room(self, request):
+        failure = await self._simulate("DeleteRoom")
+        if failure:
+            return failure
+        self.rooms.pop(DeleteRoomRequest.FromString(await request.read()).room, None)
+        return web.Response(body=DeleteRoomResponse().SerializeToString(), content_type="application/protobuf")
+
+    async def stats(self, request):
+        return web.json_response({"rooms": len(self.rooms), "calls": self.calls, "errors": self.errors})
+
+    def create_app(self):
+        """
+        Build the aiohttp application serving the Twirp routes.
+
+        Returns:
+            web.Application: Application ready to be run
+        """
+        app = web.Application()
+        app.router.add_post(f"{TWIRP_PREFIX}/ListRooms", self.list_rooms)
+        app.router.add_post(f"{TWIRP_PREFIX}/CreateRoom", self.create_room)
+        app.router.add_post(f"{TWIRP_PREFIX}/DeleteRoom", self.delete_room)
+        app.router.add_get("/stats", self.stats)
+        return app
+
+# APPLICATION ENTRY POINT
+# ------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the LiveKit room service")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=7880, help="port to listen on")
+    parser.add_argument("--rooms", type=int, default=0, help="rooms that exist from the start")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency added to every call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra latency up to this value")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls that fail with 503")
+    args = parser.parse_args()
+
+    service = FakeRoomService(args.rooms, args.latency_ms, args.jitter_ms, args.error_rate)
+    print(f"Fake LiveKit room service on http://{args.host}:{args.port} with {args.rooms} rooms")
+    web.run_app(service.create_app(), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+LEVRA AI Voice Agent - Conversation Latency Instrumentation
+
+Measures the delays a user actually feels in a coaching session:
+
+- join_to_welcome: participant joined -> welcome response created
+- speech_to_response: user speech committed -> response created
+- response_first_token: response created -> first model output (from the
+  realtime model's own metrics)
+- function:<name>: duration of each AI function call
+- profile_prefetch: profile lookup from the participant identity at join
+- agent_ready: job accepted -> agent started, excluding the participant wait
+
+Every measurement is written as a structured JSON event (one line, with the
+session id). Events go to stdout, or
+are appended to the file named by LEVRA_LATENCY_EVENTS_PATH so the events of
+many concurrent rooms and worker processes can be aggregated afterwards
+with latency_report.py.
+"""
+
+from collections import deque
+import json
+import os
+import statistics
+import threading
+import time
+
+# LATENCY CONFIGURATION
+# ------------------------------------------------------------------------
+
+# JSONL file that latency events are appended to (empty prints them to stdout)
+LATENCY_EVENTS_PATH = os.getenv("LEVRA_LATENCY_EVENTS_PATH", "")
+
+# Report buckets in seconds, spanning fast function calls to slow model turns
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 30.0)
+
+_events_lock = threading.Lock()
+
+def emit_event(event):
+    """
+    Write one structured event as a JSON line.
+
+    Args:
+        event (dict): JSON-serializable event; a wall-clock timestamp is added
+    """
+    line = json.dumps({"ts": round(time.time(), 3), **event}, default=str)
+    if not LATENCY_EVENTS_PATH:
+        print(line)
+        return
+    try:
+        with _events_lock, open(LATENCY_EVENTS_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        print(f"Error writing latency event: {str(e)}")
+
+# SESSION LATENCY TRACKING
+# ------------------------------------------------------------------------
+
+class LatencyTracker:
+    """
+    Latency measurements for one agent session.
+
+    Requests for a response are queued with the time the user-visible wait
+    began, and matched in order to the model's response_created events.
+    Responses the model starts on its own (e.g. after a function call)
+    find no queued request and are not counted.
+    """
+    def __init__(self, session_id):
+        """
+        Initialize the tracker.
+
+        Args:
+            session_id (str): Session identifier attached to every event
+        """
+        self.session_id = session_id
+        self._marks = {}
+        self._awaiting_response = deque()
+        self._function_starts = {}
+        self._samples = {}
+
+    def mark(self, name, at=None):
+        """Record the time of a named moment, e.g. participant_joined"""
+        self._marks[name] = time.perf_counter() if at is None else at
+
+    def marked(self, name):
+        """Time of a named moment, or None if it has not happened"""
+        return self._marks.get(name)
+
+    def observe(self, stage, seconds, **fields):
+        """
+        Record one measurement.
+
+        Args:
+            stage (str): Stage name, e.g. "speech_to_response"
+            seconds (float): Measured duration
+            **fields: Extra event fields such as the function name
+        """
+        self._samples.setdefault(stage, []).append(seconds)
+        emit_event({"event": "latency", "session_id": self.session_id, "stage": stage,
+                    "ms": round(seconds * 1000, 3), **fields})
+
+    def expect_response(self, stage, started=None):
+        """
+        Note that a response was requested and the user is now waiting.
+
+        Args:
+            stage (str): Stage to record once the response is created
+            started (float, optional): perf_counter time the wait began (defaults to now)
+        """
+        self._awaiting_response.append((stage, time.perf_counter() if started is None else started))
+
+    def cancel_expected_response(self):
+        """Drop the most recent response request, e.g. when it was cancelled"""
+        if self._awaiting_response:
+            self._awaiting_response.pop()
+
+    def response_created(self):
+        """Match a created response to the oldest outstanding request"""
+        if self._awaiting_response:
+            stage, started = self._awaiting_response.popleft()
+            self.observe(stage, time.perf_counter() - started)
+
+    def response_first_token(self, seconds):
+        """Record the model-reported time from response creation to its first output"""
+        if seconds is not None and seconds >= 0:
+            self.observe("response_first_token", seconds)
+
+    def function_started(self, call_id, name):
+        """Note that an AI function call began"""
+        self._function_starts[call_id] = (name, time.perf_counter())
+
+    def function_finished(self, call_id, error=None):
+        """Record the duration of an AI function call"""
+        started = self._function_starts.pop(call_id, None)
+        if started is None:
+            return
+        name, at = started
+        self.observe(f"function:{name}", time.perf_counter() - at, error=error)
+
+    def summary(self):
+        """
+        Summarize this session's measurements.
+
+        Returns:
+            dict: Per-stage count, mean, median and max in milliseconds
+        """
+        return {
+            stage: {
+                "count": len(samples),
+                "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+                "p50_ms": round(statistics.median(samples) * 1000, 3),
+                "max_ms": round(max(samples) * 1000, 3),
+            }
+            for stage, samples in self._samples.items()
+        }
+
+    def close(self):
+        """Emit the session summary event"""
+        emit_event({"event": "session_summary", "session_id": self.session_id, "stages": self.summary()})
@@ -0,0 +1,152 @@
+"""
+Conversation Latency Report Utility
+
+This script aggregates the latency events written by agent workers (see
+latency.py and LEVRA_LATENCY_EVENTS_PATH) across every session and process,
+and prints per-stage counts, percentiles and a bucketed histogram, along
+with prompt tokens per turn ("context" events) and speech turn totals
+("speech_turns" events).
+
+Usage:
+    python latency_report.py EVENTS.jsonl [EVENTS.jsonl ...] [--stage STAGE] [--json]
+"""
+
+import argparse
+import json
+import statistics
+
+from latency import LATENCY_BUCKETS
+
+# EVENT AGGREGATION
+# ------------------------------------------------------------------------
+
+def read_events(paths):
+    """
+    Lazily read structured events from JSONL files, skipping other output.
+
+    Args:
+        paths (list): Event file paths
+
+    Yields:
+        dict: Parsed events
+    """
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(event, dict) and "event" in event:
+                    yield event
+
+def load_samples(paths, stage_filter=None):
+    """
+    Read latency events from JSONL files.
+
+    Lines that are not latency events (session summaries, other output)
+    are skipped.
+
+    Args:
+        paths (list): Event file paths
+        stage_filter (str, optional): Only keep stages starting with this prefix
+
+    Returns:
+        tuple: Dict of stage -> list of milliseconds, and the set of session ids
+    """
+    samples = {}
+    sessions = set()
+    for event in read_events(paths):
+        if event["event"] != "latency":
+            continue
+        if stage_filter and not event["stage"].startswith(stage_filter):
+            continue
+        samples.setdefault(event["stage"], []).append(event["ms"])
+        sessions.add(event.get("session_id"))
+    return samples, sessions
+
+def load_conversation_totals(paths):
+    """
+    Read prompt sizes and speech turn counts from JSONL files.
+
+    Args:
+        paths (list): Event file paths
+
+    Returns:
+        dict: Prompt token percentiles per turn and summed speech turn counts
+    """
+    prompt_tokens = []
+    turns = {"fragments": 0, "turns": 0, "merged": 0, "cancelled": 0}
+    for event in read_events(paths):
+        if event["event"] == "context" and event.get("prompt_tokens"):
+            prompt_tokens.append(event["prompt_tokens"])
+        elif event["event"] == "speech_turns":
+            for key in turns:
+                turns[key] += event.get(key, 0)
+    prompt_tokens.sort()
+    prompts = {"turns": len(prompt_tokens)}
+    if prompt_tokens:
+        prompts.update(p50=prompt_tokens[len(prompt_tokens) // 2],
+                       p90=prompt_tokens[min(len(prompt_tokens) - 1, int(len(prompt_tokens) * 0.9))],
+                       max=prompt_tokens[-1])
+    return {"prompt_tokens": prompts, "speech_turns": turns}
+
+def summarize(values):
+    """
+    Summarize one stage's samples.
+
+    Args:
+        values (list): Latencies in milliseconds
+
+    Returns:
+        dict: Count, mean, percentiles, max and cumulative bucket counts
+    """
+    values = sorted(values)
+
+    def percentile(fraction):
+        return round(values[min(len(values) - 1, int(len(values) * fraction))], 3)
+
+    buckets = {}
+    for bound in LATENCY_BUCKETS:
+        limit = bound * 1000
+        buckets[f"<={limit:g}ms"] = sum(1 for v in values if v <= limit)
+    buckets["+Inf"] = len(values)
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.fmean(values), 3),
+        "p50_ms": percentile(0.50),
+        "p90_ms": percentile(0.90),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(values[-1], 3),
+        "buckets": buckets,
+    }
+
+# APPLICATION ENTRY POINT
+# ------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate agent latency events")
+    parser.add_argument("paths", nargs="+", help="latency event JSONL files")
+    parser.add_argument("--stage", help="only report stages starting with this prefix")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    samples, sessions = load_samples(args.paths, args.stage)
+    report = {"sessions": len(sessions),
+              "stages": {stage: summarize(values) for stage, values in sorted(samples.items())},
+              **load_conversation_totals(args.paths)}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\n===== Latency across {report['sessions']} sessions =====")
+    print(f"{'stage':<32}{'count':>8}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (ms)")
+    for stage, summary in report["stages"].items():
+        print(f"{stage:<32}{summary['count']:>8}{summary['mean_ms']:>10.1f}{summary['p50_ms']:>10.1f}"
+              f"{summary['p90_ms']:>10.1f}{summary['p99_ms']:>10.1f}{summary['max_ms']:>10.1f}")
+    print(f"\nPrompt tokens per turn: {report['prompt_tokens']}")
+    print(f"Speech turns: {report['speech_turns']}")
+
+if __name__ == "__main__":
+    main()
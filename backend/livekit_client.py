@@ -0,0 +1,265 @@
+"""
+Shared LiveKit Server API Client
+
+This module keeps one long-lived connection to the LiveKit server API for the
+whole token server process, instead of building a LiveKitAPI (and a fresh
+aiohttp session, TCP and TLS handshake) for every request.
+
+The client lives on the process-wide background event loop so it can be shared
+by request handlers regardless of which thread or event loop they run on.
+Calls go through a bounded concurrency limit, a per-attempt timeout and
+retries with exponential backoff for transient failures. Connection reuse is
+counted so the saved handshakes can be observed.
+"""
+
+from typing import Awaitable, Callable, Optional
+import asyncio
+import atexit
+import os
+import random
+import time
+
+import aiohttp
+from livekit.api import ListRoomsRequest, TwirpError, TwirpErrorCode
+from livekit.api.room_service import RoomService
+
+from background_loop import BACKGROUND_LOOP, BackgroundEventLoop
+from metrics import Counter, Histogram
+
+# CLIENT CONFIGURATION
+# ------------------------------------------------------------------------
+
+# Maximum open connections to the LiveKit server and concurrent API calls
+LIVEKIT_MAX_CONNECTIONS = int(os.getenv("LEVRA_LIVEKIT_MAX_CONNECTIONS", "20"))
+LIVEKIT_MAX_CONCURRENCY = int(os.getenv("LEVRA_LIVEKIT_MAX_CONCURRENCY", "50"))
+
+# Seconds an idle connection is kept open for reuse
+LIVEKIT_KEEPALIVE_TIMEOUT = float(os.getenv("LEVRA_LIVEKIT_KEEPALIVE_TIMEOUT", "60"))
+
+# Seconds allowed for one attempt of an API call
+LIVEKIT_CALL_TIMEOUT = float(os.getenv("LEVRA_LIVEKIT_CALL_TIMEOUT", "5"))
+
+# Retries after a transient failure and the base delay of the exponential backoff
+LIVEKIT_RETRIES = int(os.getenv("LEVRA_LIVEKIT_RETRIES", "2"))
+LIVEKIT_BACKOFF_BASE = float(os.getenv("LEVRA_LIVEKIT_BACKOFF_BASE", "0.1"))
+
+# Twirp error codes that indicate a temporary server-side condition
+RETRYABLE_TWIRP_CODES = {
+    TwirpErrorCode.UNAVAILABLE,
+    TwirpErrorCode.INTERNAL,
+    TwirpErrorCode.DEADLINE_EXCEEDED,
+    TwirpErrorCode.RESOURCE_EXHAUSTED,
+}
+
+# Per-attempt latency and failures of room service calls, by call name
+CALL_LATENCY = Histogram("levra_livekit_call_seconds",
+                         "Duration of LiveKit API call attempts in seconds", ("call",))
+CALL_ERRORS = Counter("levra_livekit_call_errors_total",
+                      "Failed LiveKit API call attempts by error type", ("call", "error"))
+
+def is_retryable(error):
+    """
+    Decide whether a failed API call may succeed if attempted again.
+    
+    Args:
+        error (Exception): Error raised by the attempt
+        
+    Returns:
+        bool: True for timeouts, connection failures and 5xx-type errors
+    """
+    if isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError)):
+        return True
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500
+    if isinstance(error, TwirpError):
+        return error.code in RETRYABLE_TWIRP_CODES
+    return False
+
+class LiveKitClient:
+    """
+    Process-wide LiveKit room service client with connection pooling.
+    
+    The aiohttp session and RoomService are created on the background loop on
+    first use and live until close(). Counters are plain integers updated on the
+    background loop only.
+    """
+    def __init__(self, url: Optional[str] = None, api_key: Optional[str] = None, api_secret: Optional[str] = None,
+                 max_connections: int = LIVEKIT_MAX_CONNECTIONS, max_concurrency: int = LIVEKIT_MAX_CONCURRENCY,
+                 keepalive_timeout: float = LIVEKIT_KEEPALIVE_TIMEOUT, call_timeout: float = LIVEKIT_CALL_TIMEOUT,
+                 retries: int = LIVEKIT_RETRIES, backoff_base: float = LIVEKIT_BACKOFF_BASE,
+                 background_loop: BackgroundEventLoop = BACKGROUND_LOOP):
+        """
+        Initialize the client; nothing is connected until the first call.
+        
+        Args:
+            url (str, optional): LiveKit server URL (defaults to LIVEKIT_URL)
+            api_key (str, optional): API key (defaults to LIVEKIT_API_KEY)
+            api_secret (str, optional): API secret (defaults to LIVEKIT_API_SECRET)
+            max_connections (int): Maximum pooled connections to the server
+            max_concurrency (int): Maximum API calls in flight at once
+            keepalive_timeout (float): Seconds idle connections are kept open
+            call_timeout (float): Seconds allowed per attempt
+            retries (int): Retries after a transient failure
+            backoff_base (float): First retry delay in seconds, doubled per retry
+            background_loop (BackgroundEventLoop): Loop the client's connections live on
+        """
+        self._url = url
+        self._api_key = api_key
+        self._api_secret = api_secret
+        self._max_connections = max_connections
+        self._max_concurrency = max_concurrency
+        self._keepalive_timeout = keepalive_timeout
+        self._call_timeout = call_timeout
+        self._retries = retries
+        self._backoff_base = backoff_base
+
+        self._background_loop = background_loop
+        self._started = False
+        self._session = None
+        self._room = None
+        self._semaphore = None
+
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.call_seconds = 0.0
+
+    # LIFECYCLE
+    # ------------------------------------------------------------
+
+    async def _open(self):
+        """
+        Create the pooled session and room service on the background loop.
+        Contains no await, so it cannot interleave with another call's check.
+        """
+        url = self._url or os.getenv("LIVEKIT_URL")
+        api_key = self._api_key or os.getenv("LIVEKIT_API_KEY")
+        api_secret = self._api_secret or os.getenv("LIVEKIT_API_SECRET")
+        if not url:
+            raise ValueError("url must be set")
+        if not api_key or not api_secret:
+            raise ValueError("api_key and api_secret must be set")
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+
+        connector = aiohttp.TCPConnector(limit=self._max_connections, keepalive_timeout=self._keepalive_timeout)
+        self._session = aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+        self._room = RoomService(self._session, url, api_key, api_secret)
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._started = True
+
+    async def _on_connection_created(self, session, context, params):
+        self.connections_created += 1
+
+    async def _on_connection_reused(self, session, context, params):
+        self.connections_reused += 1
+
+    def close(self):
+        """
+        Close pooled connections. Safe to call more than once.
+        """
+        if not self._started:
+            return
+        self._started = False
+        try:
+            self._background_loop.run(self._session.close(), timeout=5)
+        except Exception as e:
+            print(f"Error closing LiveKit client session: {str(e)}")
+
+    # API CALLS
+    # ------------------------------------------------------------
+
+    async def call(self, name: str, fn: Callable[[RoomService], Awaitable]):
+        """
+        Run a room service call on the shared client from any event loop.
+        
+        Args:
+            name (str): Call name used in logs
+            fn (callable): Receives the RoomService and returns the call's coroutine
+            
+        Returns:
+            The call's response
+            
+        Raises:
+            Exception: The last error once retries are exhausted, or a
+                non-retryable error immediately
+        """
+        return await self._background_loop.run_async(self._call_with_retry(name, fn))
+
+    async def _call_with_retry(self, name, fn):
+        """Bounded, timed, retried execution on the background loop"""
+        if not self._started:
+            await self._open()
+        async with self._semaphore:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                attempt = 0
+                while True:
+                    self.calls += 1
+                    start = time.perf_counter()
+                    try:
+                        return await asyncio.wait_for(fn(self._room), self._call_timeout)
+                    except Exception as e:
+                        CALL_ERRORS.inc(name, type(e).__name__)
+                        if isinstance(e, asyncio.TimeoutError):
+                            self.timeouts += 1
+                        if attempt >= self._retries or not is_retryable(e):
+                            self.errors += 1
+                            raise
+                        attempt += 1
+                        self.retries += 1
+                        delay = self._backoff_base * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                        print(f"LiveKit {name} failed ({type(e).__name__}), retry {attempt} in {delay:.2f}s")
+                    finally:
+                        # Observed per attempt, before any backoff below
+                        elapsed = time.perf_counter() - start
+                        self.call_seconds += elapsed
+                        CALL_LATENCY.observe(elapsed, name)
+                    await asyncio.sleep(delay)
+            finally:
+                self.in_flight -= 1
+
+    async def list_rooms(self, request: Optional[ListRoomsRequest] = None):
+        """
+        List rooms through the shared client.
+        
+        Args:
+            request (ListRoomsRequest, optional): Filter; defaults to all rooms
+            
+        Returns:
+            ListRoomsResponse: Rooms known to the LiveKit server
+        """
+        return await self.call("list_rooms", lambda room: room.list_rooms(request or ListRoomsRequest()))
+
+    def stats(self):
+        """
+        Snapshot of pool and call counters.
+        
+        Returns:
+            dict: Call, retry, error and timeout counts, concurrency and connection reuse
+        """
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_concurrency": self._max_concurrency,
+            "max_connections": self._max_connections,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "call_seconds": round(self.call_seconds, 4),
+        }
+
+# Shared client for the token server process
+LIVEKIT = LiveKitClient()
+atexit.register(LIVEKIT.close)
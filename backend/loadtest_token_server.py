@@ -0,0 +1,249 @@
+"""
+Token Server Load Test Utility
+
+This script drives the token server's /getToken endpoint at a fixed
+concurrency and reports throughput and latency percentiles. Passing several
+base URLs compares them under the same load, for example the Flask debug
+server against the production (uvicorn) serving mode:
+
+    python server.py                              # debug server on :5001
+    python server.py --production --port 5002     # production mode on :5002
+    python loadtest_token_server.py http://localhost:5001 http://localhost:5002
+
+With --serve the harness needs no LiveKit deployment: it starts the local
+room service stand-in (fake_livekit.py) with the requested room count and
+latency, starts the token server pointed at it and tests that instead.
+Rate limits are disabled on a server started this way; when testing an
+external server, raise LEVRA_RATE_LIMIT_PER_IP there first.
+
+    python loadtest_token_server.py --serve production --fake-rooms 5000 --fake-latency-ms 20 --json
+
+Usage:
+    python loadtest_token_server.py [URL ...] [--requests N] [--concurrency N]
+        [--room NAME] [--identities N] [--serve debug|production]
+        [--fake-rooms N] [--fake-latency-ms MS] [--room-strategy random|listed]
+        [--json] [--output FILE]
+"""
+
+from contextlib import contextmanager
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import aiohttp
+
+# LOAD GENERATION
+# ------------------------------------------------------------------------
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def run_load(base_url, requests, concurrency, room=None, identities=None):
+    """
+    Issue /getToken requests from a fixed number of concurrent clients.
+    
+    By default each request uses a distinct identity and no room, so the
+    server allocates a new room and signs a new token every time. Passing a
+    room measures signing alone, and a small identity pool with a room
+    measures the token cache.
+    
+    Args:
+        base_url (str): Token server base URL
+        requests (int): Total number of requests
+        concurrency (int): Requests kept in flight at once
+        room (str, optional): Existing room to request tokens for
+        identities (int, optional): Number of distinct identities to cycle through
+        
+    Returns:
+        dict: Request, error, throughput and latency statistics
+    """
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def client(session):
+        nonlocal errors
+        for i in counter:
+            params = {"name": f"loadtest-{i % identities if identities else i}"}
+            if room:
+                params["room"] = room
+            start = time.perf_counter()
+            try:
+                async with session.get(f"{base_url}/getToken", params=params) as resp:
+                    await resp.read()
+                    if resp.status != 200:
+                        errors += 1
+                        continue
+            except aiohttp.ClientError:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "url": base_url,
+        "requests": requests,
+        "concurrency": concurrency,
+        "room": room,
+        "identities": identities or requests,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 3) if latencies else None,
+            "p50": round(statistics.median(latencies), 3) if latencies else None,
+            "p90": round(percentile(latencies, 0.90), 3) if latencies else None,
+            "p95": round(percentile(latencies, 0.95), 3) if latencies else None,
+            "p99": round(percentile(latencies, 0.99), 3) if latencies else None,
+            "max": round(latencies[-1], 3) if latencies else None,
+        },
+    }
+
+# LOCAL TEST STACK
+# ------------------------------------------------------------------------
+
+def fetch_json(url):
+    """GET a URL and decode its JSON body"""
+    with urllib.request.urlopen(url, timeout=2) as resp:
+        return json.loads(resp.read())
+
+def wait_until_ready(url, process, timeout=30):
+    """
+    Poll a URL until it answers, failing early if its process exits.
+    
+    Raises:
+        RuntimeError: If the process exits or the URL does not answer in time
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(process.args)} exited with status {process.returncode}")
+        try:
+            fetch_json(url)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout}s")
+
+@contextmanager
+def local_stack(mode, server_port, fake_port, fake_rooms, fake_latency_ms, room_strategy):
+    """
+    Run the fake room service and a token server pointed at it.
+    
+    Args:
+        mode (str): "debug" for the Flask development server, "production" for uvicorn
+        server_port (int): Port for the token server
+        fake_port (int): Port for the fake room service
+        fake_rooms (int): Rooms that exist in the fake service from the start
+        fake_latency_ms (float): Latency the fake service adds to every call
+        room_strategy (str): Room name strategy for the token server
+        
+    Yields:
+        tuple: Token server base URL and fake room service base URL
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    server_url = f"http://127.0.0.1:{server_port}"
+    env = dict(os.environ,
+               LIVEKIT_URL=fake_url,
+               LIVEKIT_API_KEY=os.getenv("LIVEKIT_API_KEY") or "loadtest",
+               LIVEKIT_API_SECRET=os.getenv("LIVEKIT_API_SECRET") or "loadtest-secret-loadtest-secret-0",
+               LEVRA_ROOM_NAME_STRATEGY=room_strategy,
+               LEVRA_RATE_LIMIT_PER_IP="0",
+               LEVRA_RATE_LIMIT_PER_IDENTITY="0",
+               # Fresh admission state so pending rooms of earlier runs do not count
+               LEVRA_ADMISSION_DB=os.path.join(tempfile.mkdtemp(prefix="levra_loadtest_"), "admission.db"))
+    env.setdefault("LEVRA_SERVER_PORT", str(server_port))
+
+    processes = []
+    try:
+        fake = subprocess.Popen([sys.executable, os.path.join(here, "fake_livekit.py"), "--port", str(fake_port),
+                                 "--rooms", str(fake_rooms), "--latency-ms", str(fake_latency_ms)],
+                                cwd=here, stdout=subprocess.DEVNULL)
+        processes.append(fake)
+        wait_until_ready(f"{fake_url}/stats", fake)
+
+        server_args = [sys.executable, os.path.join(here, "server.py")]
+        if mode == "production":
+            server_args += ["--production", "--host", "127.0.0.1", "--port", str(server_port)]
+        server = subprocess.Popen(server_args, cwd=here, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        processes.append(server)
+        wait_until_ready(f"{server_url}/stats/tokens", server)
+        yield server_url, fake_url
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+# APPLICATION ENTRY POINT
+# ------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /getToken")
+    parser.add_argument("urls", nargs="*", help="token server base URLs to test in turn")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per URL")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent clients")
+    parser.add_argument("--room", help="request tokens for this existing room instead of new rooms")
+    parser.add_argument("--identities", type=int, help="distinct identities to cycle through (default: one per request)")
+    parser.add_argument("--serve", choices=("debug", "production"),
+                        help="start a token server backed by the local LiveKit stand-in and test it")
+    parser.add_argument("--server-port", type=int, default=5050, help="port for the started token server")
+    parser.add_argument("--fake-port", type=int, default=7880, help="port for the LiveKit stand-in")
+    parser.add_argument("--fake-rooms", type=int, default=1000, help="rooms that exist in the stand-in")
+    parser.add_argument("--fake-latency-ms", type=float, default=0.0, help="latency the stand-in adds per call")
+    parser.add_argument("--room-strategy", choices=("random", "listed"), default="listed",
+                        help="room name strategy of the started token server")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+    if not args.urls and not args.serve:
+        parser.error("give at least one URL or --serve")
+
+    def run_all(urls):
+        return [asyncio.run(run_load(url.rstrip("/"), args.requests, args.concurrency, args.room, args.identities))
+                for url in urls]
+
+    report = {"requests": args.requests, "concurrency": args.concurrency}
+    if args.serve:
+        report["stack"] = {"mode": args.serve, "fake_rooms": args.fake_rooms,
+                           "fake_latency_ms": args.fake_latency_ms, "room_strategy": args.room_strategy}
+        with local_stack(args.serve, args.server_port, args.fake_port, args.fake_rooms,
+                         args.fake_latency_ms, args.room_strategy) as (server_url, fake_url):
+            report["results"] = run_all([server_url] + args.urls)
+            report["stack"]["livekit_calls"] = fetch_json(f"{fake_url}/stats")["calls"]
+    else:
+        report["results"] = run_all(args.urls)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\n===== /getToken: {args.requests} requests, concurrency {args.concurrency} =====")
+    for result in report["results"]:
+        latency = result["latency_ms"]
+        print(f"{result['url']:>30}: {result['throughput_rps']:>8} req/s   p50 {latency['p50']} ms   "
+              f"p99 {latency['p99']} ms   errors {result['errors']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+LEVRA AI Voice Agent - Metrics
+
+Minimal Prometheus-compatible metrics for the token server, rendered in the
+text exposition format by a /metrics endpoint.
+
+Counters and histograms are sharded per thread: each thread updates its own
+dictionary without taking a lock, and shards are only summed when metrics
+are scraped. Updates on the request path therefore never contend with each
+other or with a scrape. Values that already exist elsewhere (cache and
+client counters) are exported through callbacks read at scrape time instead
+of being counted twice.
+
+Worker processes behind one port share their metrics through a directory
+(see MetricsRegistry.share), so a scrape reports totals for all of them.
+"""
+
+from bisect import bisect_left
+import itertools
+import json
+import math
+import os
+import threading
+import time
+import weakref
+
+# Default latency buckets in seconds, from sub-millisecond to ten seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Seconds between writes of a process's metrics to the shared directory
+METRICS_SHARE_INTERVAL = float(os.getenv("LEVRA_METRICS_SHARE_INTERVAL", "5"))
+
+def _format_value(value):
+    """Format a sample value the way Prometheus expects"""
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+def _escape(value):
+    """Escape a label value for the exposition format"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra=None):
+    """Render a {name="value",...} label set, or nothing when there are no labels"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together by a scrape.
+
+    With several worker processes behind one port, a scrape reaches an
+    arbitrary worker. After share() each process periodically writes its
+    samples to a file in a common directory and a scrape merges the files of
+    every process, so counters do not jump between workers' values. Counts
+    of exited workers are kept so totals never go down; their gauges are
+    dropped once their file stops being refreshed.
+    """
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+        self._share_dir = None
+        self._share_path = None
+        self._share_interval = METRICS_SHARE_INTERVAL
+
+    def register(self, metric):
+        """Add a metric to the registry and return it"""
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def share(self, directory, interval=METRICS_SHARE_INTERVAL):
+        """
+        Aggregate metrics with the other processes sharing a directory.
+
+        Args:
+            directory (str): Directory every worker process writes its samples to
+            interval (float): Seconds between writes of this process's samples
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._share_dir = directory
+        self._share_path = os.path.join(directory, f"metrics-{os.getpid()}.json")
+        self._share_interval = interval
+        self._write_shared(self._collect())
+        threading.Thread(target=self._share_loop, name="metrics-share", daemon=True).start()
+
+    def _collect(self):
+        """This process's samples of every metric, keyed by metric name"""
+        with self._lock:
+            metrics = list(self._metrics)
+        return metrics, {metric.name: metric.samples() for metric in metrics}
+
+    def _share_loop(self):
+        """Keep this process's file fresh so scrapes in other workers see it"""
+        while True:
+            time.sleep(self._share_interval)
+            self._write_shared(self._collect())
+
+    def _write_shared(self, collected):
+        """Atomically replace this process's samples file"""
+        _, samples = collected
+        data = {name: [[list(labelvalues), value] for labelvalues, value in values.items()]
+                for name, values in samples.items()}
+        tmp_path = self._share_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._share_path)
+        except OSError as e:
+            print(f"Error sharing metrics: {str(e)}")
+
+    def _read_shared(self):
+        """
+        Samples written by the other processes.
+
+        Returns:
+            list: (samples by metric name, whether the file is still refreshed) per process
+        """
+        stale_before = time.time() - 3 * self._share_interval
+        processes = []
+        for entry in os.scandir(self._share_dir):
+            if not entry.name.endswith(".json") or entry.path == self._share_path:
+                continue
+            try:
+                fresh = entry.stat().st_mtime >= stale_before
+                with open(entry.path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                # Vanished or half-written by a dying worker; skip it this scrape
+                continue
+            processes.append(({name: {tuple(labelvalues): value for labelvalues, value in values}
+                               for name, values in data.items()}, fresh))
+        return processes
+
+    def render(self):
+        """
+        Render every registered metric.
+
+        Returns:
+            str: Metrics in the Prometheus text exposition format
+        """
+        collected = self._collect()
+        metrics, samples = collected
+        if self._share_dir is not None:
+            self._write_shared(collected)
+            others = self._read_shared()
+            for metric in metrics:
+                per_process = [samples[metric.name]] + [
+                    process.get(metric.name, {}) for process, fresh in others
+                    if fresh or metric.kind != "gauge"
+                ]
+                samples[metric.name] = metric.combine(per_process)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render_samples(samples[metric.name]))
+        return "\n".join(lines) + "\n"
+
+# Process-wide registry exported by the token server
+REGISTRY = MetricsRegistry()
+
+class _ShardedMetric:
+    """
+    Base for metrics whose values are kept in one dictionary per thread.
+
+    When a thread exits its shard is folded into a base value, so threads
+    that come and go do not accumulate shards.
+    """
+    kind = "untyped"
+
+    def __init__(self, name, help, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = {}
+        self._base = {}
+        self._shard_ids = itertools.count()
+        self._shards_lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _shard(self):
+        """This thread's values, created (under a lock) on first use only"""
+        shard = getattr(self._local, "values", None)
+        if shard is None:
+            shard = self._local.values = {}
+            # The owner object lives in the thread-local storage and is
+            # released when the thread exits, which retires the shard
+            self._local.owner = owner = _ShardOwner()
+            shard_id = next(self._shard_ids)
+            with self._shards_lock:
+                self._shards[shard_id] = shard
+            weakref.finalize(owner, self._retire, shard_id)
+        return shard
+
+    def _retire(self, shard_id):
+        """Fold an exited thread's shard into the base value"""
+        with self._shards_lock:
+            shard = self._shards.pop(shard_id, None)
+            if shard:
+                self._base = self.combine([self._base, shard])
+
+    def _snapshots(self):
+        """Copies of the base and every live thread's values, safe to iterate while threads update"""
+        with self._shards_lock:
+            snapshots = [self._base.copy()]
+            shards = list(self._shards.values())
+        return snapshots + [shard.copy() for shard in shards]
+
+    def samples(self):
+        """Current values by label combination, summed over threads"""
+        return self.combine(self._snapshots())
+
+    def render(self):
+        return self.render_samples(self.samples())
+
+class _ShardOwner:
+    """Placeholder whose lifetime is that of the thread owning a shard"""
+
+class Counter(_ShardedMetric):
+    """
+    Monotonically increasing count, optionally split by labels.
+    """
+    kind = "counter"
+
+    def inc(self, *labelvalues, amount=1):
+        """
+        Increase the count for a label combination.
+
+        Args:
+            *labelvalues: One value per label name, in order
+            amount (float): Amount to add
+        """
+        shard = self._shard()
+        shard[labelvalues] = shard.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues):
+        """Current total for a label combination across all threads"""
+        return self.samples().get(labelvalues, 0)
+
+    @staticmethod
+    def combine(parts):
+        """Sum counts by label combination"""
+        totals = {}
+        for part in parts:
+            for labelvalues, value in part.items():
+                totals[labelvalues] = totals.get(labelvalues, 0) + value
+        return totals
+
+    def render_samples(self, totals):
+        return [f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+                for labelvalues, value in sorted(totals.items())]
+
+class Histogram(_ShardedMetric):
+    """
+    Distribution of observed values over fixed buckets, optionally split by labels.
+    """
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames, registry)
+
+    def observe(self, value, *labelvalues):
+        """
+        Record one observation.
+
+        Args:
+            value (float): Observed value, e.g. a duration in seconds
+            *labelvalues: One value per label name, in order
+        """
+        shard = self._shard()
+        state = shard.get(labelvalues)
+        if state is None:
+            # Per-bucket counts (last slot is +Inf), then sum
+            state = shard[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    @staticmethod
+    def combine(parts):
+        """Add bucket counts and sums by label combination"""
+        totals = {}
+        for part in parts:
+            for labelvalues, state in part.items():
+                total = totals.setdefault(labelvalues, [0] * len(state))
+                for i, value in enumerate(state):
+                    total[i] += value
+        return totals
+
+    def render_samples(self, totals):
+        lines = []
+        for labelvalues, state in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, labelvalues, ("le", _format_value(float(bound))))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class CallbackMetric:
+    """
+    Metric whose value is read from a callback at scrape time.
+
+    The callback returns either a single number or a dict mapping tuples of
+    label values to numbers. Values of several processes are summed, or for
+    gauges combined as configured by aggregate ("sum" or "max").
+    """
+    def __init__(self, name, help, callback, kind="gauge", labelnames=(), aggregate="sum", registry=REGISTRY):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.aggregate = aggregate
+        self._callback = callback
+        if registry is not None:
+            registry.register(self)
+
+    def samples(self):
+        """Current values by label combination, empty if the callback fails"""
+        try:
+            values = self._callback()
+        except Exception as e:
+            print(f"Error collecting metric {self.name}: {str(e)}")
+            return {}
+        if not isinstance(values, dict):
+            values = {(): values}
+        return values
+
+    def combine(self, parts):
+        """Combine the values of several processes by label combination"""
+        values = {}
+        for part in parts:
+            for labelvalues, value in part.items():
+                values.setdefault(labelvalues, []).append(value)
+        if self.aggregate == "max":
+            return {labelvalues: max(found) for labelvalues, found in values.items()}
+        return {labelvalues: sum(found) for labelvalues, found in values.items()}
+
+    def render(self):
+        return self.render_samples(self.samples())
+
+    def render_samples(self, values):
+        return [f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+                for labelvalues, value in sorted(values.items())]
@@ -0,0 +1,282 @@
+"""
+Bulk Profile Import/Export Utility
+
+This script moves career profiles in and out of the database in bulk, for
+seeding environments, migrations and onboarding whole organisations at once.
+Files are streamed row by row and written in large transactions, so inputs
+of any size are processed in constant memory.
+
+Supported formats are CSV (with a header row) and JSON Lines, each row having
+the fields id, dream_job, current_skills and education. Invalid rows are
+reported with their line number and skipped, or abort the import with
+--strict; either way the summary says which batches were committed.
+
+Usage:
+    python profile_io.py import users.csv [--on-conflict skip|upsert|fail] [--batch-size N] [--strict]
+    python profile_io.py export profiles.jsonl
+    python profile_io.py export - --format csv > profiles.csv
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+import time
+
+from db_driver import CareerProfile, DatabaseDriver, DEFAULT_BULK_BATCH_SIZE, DEFAULT_DB_PATH
+
+# Column order used for both formats
+FIELDS = ["id", "dream_job", "current_skills", "education"]
+
+# Invalid rows reported individually before only counting the rest
+MAX_REPORTED_ERRORS = 20
+
+# FILE FORMAT HELPERS
+# ------------------------------------------------------------------------
+
+def detect_format(path, requested):
+    """
+    Resolve the file format from the --format flag or the file extension.
+    
+    Args:
+        path (str): File path, or "-" for stdin/stdout
+        requested (str, optional): Explicit format from the command line
+        
+    Returns:
+        str: "csv" or "jsonl"
+    """
+    if requested:
+        return requested
+    if path.lower().endswith(".csv"):
+        return "csv"
+    return "jsonl"
+
+def parse_rows(handle, fmt):
+    """
+    Lazily split an open file into rows.
+    
+    Args:
+        handle (file): Open text file
+        fmt (str): "csv" or "jsonl"
+        
+    Yields:
+        tuple: (line number, row dict or None, error message or None)
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(handle)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"invalid JSON ({e.msg})"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, f"expected a JSON object, got {type(row).__name__}"
+            continue
+        yield line_number, row, None
+
+def validate_row(row):
+    """
+    Check that a row can be stored as a profile.
+    
+    Args:
+        row (dict): Parsed row
+        
+    Returns:
+        str: Error message, or None if the row is valid
+    """
+    if not str(row.get("id") or "").strip():
+        return "missing id"
+    for field in FIELDS[1:]:
+        value = row.get(field)
+        if value is not None and not isinstance(value, (str, int, float)):
+            return f"{field} must be text, got {type(value).__name__}"
+    return None
+
+def read_profiles(handle, fmt, progress, strict=False):
+    """
+    Lazily parse profiles from an open file.
+    
+    Invalid rows are reported on stderr with their line number, counted in
+    progress["rejected"] and skipped, unless strict is set.
+    
+    Args:
+        handle (file): Open text file
+        fmt (str): "csv" or "jsonl"
+        progress (dict): Updated with the current "line" and the "rejected" count
+        strict (bool): Stop at the first invalid row instead of skipping it
+        
+    Yields:
+        CareerProfile: Parsed profiles in file order
+        
+    Raises:
+        ValueError: On the first invalid row when strict is set
+    """
+    for line_number, row, error in parse_rows(handle, fmt):
+        progress["line"] = line_number
+        error = error or validate_row(row)
+        if error:
+            if strict:
+                raise ValueError(f"invalid row at line {line_number}: {error}")
+            progress["rejected"] += 1
+            if progress["rejected"] <= MAX_REPORTED_ERRORS:
+                print(f"Skipping line {line_number}: {error}", file=sys.stderr)
+            elif progress["rejected"] == MAX_REPORTED_ERRORS + 1:
+                print("Further invalid lines are counted but not reported", file=sys.stderr)
+            continue
+        yield CareerProfile(
+            id=str(row["id"]).strip(),
+            dream_job=str(row.get("dream_job") or ""),
+            current_skills=str(row.get("current_skills") or ""),
+            education=str(row.get("education") or "")
+        )
+
+def write_profiles(handle, fmt, profiles):
+    """
+    Write profiles to an open file as they are produced.
+    
+    Args:
+        handle (file): Open text file
+        fmt (str): "csv" or "jsonl"
+        profiles (Iterable[CareerProfile]): Profiles to write
+        
+    Returns:
+        int: Number of profiles written
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(handle)
+        writer.writerow(FIELDS)
+        for profile in profiles:
+            writer.writerow([profile.id, profile.dream_job, profile.current_skills, profile.education])
+            count += 1
+    else:
+        for profile in profiles:
+            handle.write(json.dumps({
+                "id": profile.id,
+                "dream_job": profile.dream_job,
+                "current_skills": profile.current_skills,
+                "education": profile.education
+            }, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+# COMMANDS
+# ------------------------------------------------------------------------
+
+def report_committed(committed):
+    """
+    Print which batches an interrupted import committed.
+    
+    Args:
+        committed (list[tuple]): (profiles processed, last input line) per committed batch
+    """
+    if not committed:
+        print("No batches were committed", file=sys.stderr)
+        return
+    processed, line = committed[-1]
+    print(f"Committed {len(committed)} batch(es): {processed} profiles up to line {line}; "
+          f"the batch in progress was rolled back", file=sys.stderr)
+
+def run_import(driver, args):
+    """
+    Import profiles from a CSV or JSONL file and print a summary.
+    
+    If the import stops early (a database error, or an invalid row with
+    --strict) the batches committed so far are listed and the process exits
+    with status 1.
+    """
+    fmt = detect_format(args.path, args.format)
+    progress = {"line": 0, "rejected": 0}
+    committed = []
+    start = time.perf_counter()
+
+    def on_batch(processed, written):
+        committed.append((processed, progress["line"]))
+
+    def import_from(handle):
+        return driver.bulk_import_profiles(read_profiles(handle, fmt, progress, strict=args.strict),
+                                           batch_size=args.batch_size, on_conflict=args.on_conflict,
+                                           on_batch=on_batch)
+
+    try:
+        if args.path == "-":
+            result = import_from(sys.stdin)
+        else:
+            with open(args.path, newline="", encoding="utf-8") as handle:
+                result = import_from(handle)
+    except ValueError as e:
+        print(f"Import stopped: {e}", file=sys.stderr)
+        report_committed(committed)
+        sys.exit(1)
+    except sqlite3.Error as e:
+        print(f"Import stopped in the batch ending at line {progress['line']}: {e}", file=sys.stderr)
+        report_committed(committed)
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - start
+    print(f"Processed {result['processed']} profiles in {elapsed:.2f}s "
+          f"({result['processed'] / elapsed if elapsed else 0:,.0f} rows/s), "
+          f"committed in {len(committed)} batch(es)", file=sys.stderr)
+    print(f"Written: {result['written']}, skipped: {result['skipped']}, rejected: {progress['rejected']}",
+          file=sys.stderr)
+
+def run_export(driver, args):
+    """
+    Stream every profile to a CSV or JSONL file (or stdout).
+    """
+    fmt = detect_format(args.path, args.format)
+    profiles = driver.iter_profiles(batch_size=args.batch_size)
+
+    if args.path == "-":
+        count = write_profiles(sys.stdout, fmt, profiles)
+    else:
+        with open(args.path, "w", newline="", encoding="utf-8") as handle:
+            count = write_profiles(handle, fmt, profiles)
+
+    print(f"Exported {count} profiles", file=sys.stderr)
+
+# APPLICATION ENTRY POINT
+# ------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import/export of career profiles")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="path to the SQLite database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="load profiles from a file")
+    import_parser.add_argument("path", help="input file, or - for stdin")
+    import_parser.add_argument("--on-conflict", choices=["skip", "upsert", "fail"], default="skip",
+                               help="what to do when a profile ID already exists")
+    import_parser.add_argument("--strict", action="store_true",
+                               help="stop at the first invalid row instead of skipping it")
+    import_parser.set_defaults(handler=run_import)
+
+    export_parser = subparsers.add_parser("export", help="write all profiles to a file")
+    export_parser.add_argument("path", help="output file, or - for stdout")
+    export_parser.set_defaults(handler=run_export)
+
+    for sub in (import_parser, export_parser):
+        sub.add_argument("--format", choices=["csv", "jsonl"], help="file format (default: from extension)")
+        sub.add_argument("--batch-size", type=int, default=DEFAULT_BULK_BATCH_SIZE,
+                         help="rows per transaction or page")
+
+    args = parser.parse_args()
+    driver = DatabaseDriver(db_path=args.db, pool_size=1)
+    try:
+        args.handler(driver, args)
+    except sqlite3.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        driver.close()
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,24 @@ This system bridges the Human Skills gap through engaging, data-driven learning
 that simulate real-world professional interactions.
 """
 
+from collections import deque
+import os
+import time
+
+from db_driver import PERFORMANCE_WRITER
+from session_state import SessionStateStore
+
+# Number of performance entries kept in memory for adaptive decisions; the full
+# history is persisted to the database by the write-behind PERFORMANCE_WRITER
+PERFORMANCE_HISTORY_LIMIT = int(os.getenv("LEVRA_PERFORMANCE_HISTORY_LIMIT", "200"))
+
+# Skill trend settings: number of most recent scores compared against the
+# earlier average, the minimum change that counts as a trend, and the weight
+# of the newest score in the exponentially weighted moving average
+TREND_RECENT_WINDOW = 3
+TREND_THRESHOLD = 0.5
+TREND_EWMA_ALPHA = 0.3
+
 # Core AI Learning Coach instructions optimized for LEVRA's immersive learning platform
 # These instructions define the AI's role as an adaptive, context-aware learning coach
 INSTRUCTIONS = """
@@ -471,54 +489,141 @@ def select_appropriate_scenario(user_context, previous_scenarios=None):
         "character_context": selected_scenario["character_context"]
     }
 
+# Incremental skill trend tracking
+class SkillAggregate:
+    """
+    Rolling statistics for one skill, updated in constant time per score.
+    
+    Keeps the total and count of every score, a ring buffer of the most recent
+    TREND_RECENT_WINDOW scores (with its running sum), the first score and an
+    EWMA, which is everything needed to classify the trend without the history.
+    """
+    __slots__ = ("count", "total", "first", "recent", "recent_total", "ewma")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.first = None
+        self.recent = deque(maxlen=TREND_RECENT_WINDOW)
+        self.recent_total = 0.0
+        self.ewma = None
+
+    def add(self, score):
+        """Fold one score into the aggregate"""
+        if len(self.recent) == self.recent.maxlen:
+            self.recent_total -= self.recent[0]
+        self.recent.append(score)
+        self.recent_total += score
+        self.count += 1
+        self.total += score
+        if self.first is None:
+            self.first = score
+        self.ewma = score if self.ewma is None else TREND_EWMA_ALPHA * score + (1 - TREND_EWMA_ALPHA) * self.ewma
+
+    def trend(self):
+        """
+        Classify the trend as improving, declining, stable or insufficient_data
+        by comparing the recent window's average with the average of all
+        earlier scores (or the first score when there are no earlier ones)
+        """
+        if self.count < 2:
+            return "insufficient_data"
+
+        recent_avg = self.recent_total / len(self.recent)
+        earlier_count = self.count - len(self.recent)
+        earlier_avg = (self.total - self.recent_total) / earlier_count if earlier_count > 0 else self.first
+
+        if recent_avg > earlier_avg + TREND_THRESHOLD:
+            return "improving"
+        elif recent_avg < earlier_avg - TREND_THRESHOLD:
+            return "declining"
+        else:
+            return "stable"
+
+    def summary(self):
+        """Snapshot of the aggregate as a plain dict"""
+        return {
+            "count": self.count,
+            "average": self.total / self.count if self.count else None,
+            "recent_average": self.recent_total / len(self.recent) if self.recent else None,
+            "ewma": self.ewma,
+            "trend": self.trend()
+        }
+
 # Conversation state management for adaptive learning
-CONVERSATION_STATE = {
-    "current_scenario": None,
-    "user_context": {},
-    "performance_history": [],
-    "learning_pathway": None,
-    "session_goals": []
-}
+def new_conversation_state():
+    """Build the initial conversation state for a new coaching session"""
+    return {
+        "current_scenario": None,
+        "user_context": {},
+        "performance_history": deque(maxlen=PERFORMANCE_HISTORY_LIMIT),
+        "skill_aggregates": {},
+        "learning_pathway": None,
+        "session_goals": []
+    }
+
+# Conversation state per coaching session, keyed by room ID; the agent creates
+# a session when a job starts and releases it when the job ends
+SESSIONS = SessionStateStore(new_conversation_state)
 
 def update_conversation_state(key, value):
-    """Update conversation state for adaptive learning"""
-    CONVERSATION_STATE[key] = value
+    """Update conversation state of the current session for adaptive learning"""
+    SESSIONS.current()[key] = value
 
 def get_conversation_state(key):
-    """Retrieve conversation state value"""
-    return CONVERSATION_STATE.get(key, None)
+    """Retrieve conversation state value of the current session"""
+    return SESSIONS.current().get(key, None)
 
 # Performance tracking utilities
-def track_performance(scenario_type, skill_scores, user_feedback=None):
-    """Track user performance for adaptive learning"""
+def track_performance(scenario_type, skill_scores, user_feedback=None, session_id=None):
+    """
+    Track user performance for adaptive learning.
+    
+    The entry is kept in the bounded in-memory history (oldest entries are
+    discarded beyond PERFORMANCE_HISTORY_LIMIT) and queued for durable storage
+    without waiting on the database.
+    """
     performance_entry = {
         "scenario_type": scenario_type,
         "skill_scores": skill_scores,
         "overall_score": calculate_skill_score(skill_scores),
-        "timestamp": "current_session",  # Could be replaced with actual timestamp
+        "timestamp": "current_session",
+        "recorded_at": time.time(),
+        "session_id": session_id or SESSIONS.current_session_id(),
         "user_feedback": user_feedback
     }
     
-    current_history = get_conversation_state("performance_history") or []
+    current_history = get_conversation_state("performance_history")
+    if current_history is None:
+        current_history = deque(maxlen=PERFORMANCE_HISTORY_LIMIT)
     current_history.append(performance_entry)
     update_conversation_state("performance_history", current_history)
+    update_skill_aggregates(skill_scores)
+    PERFORMANCE_WRITER.record(performance_entry)
     
     return performance_entry
 
+def update_skill_aggregates(skill_scores):
+    """Fold one interaction's skill scores into the per-skill aggregates"""
+    aggregates = get_conversation_state("skill_aggregates")
+    if aggregates is None:
+        aggregates = {}
+        update_conversation_state("skill_aggregates", aggregates)
+
+    for skill_name, score in skill_scores.items():
+        aggregate = aggregates.get(skill_name)
+        if aggregate is None:
+            aggregate = aggregates[skill_name] = SkillAggregate()
+        aggregate.add(score)
+
 def get_skill_trends(skill_name):
     """Analyze skill improvement trends over time"""
-    history = get_conversation_state("performance_history") or []
-    skill_scores = [entry["skill_scores"].get(skill_name, 0) for entry in history if skill_name in entry["skill_scores"]]
-    
-    if len(skill_scores) < 2:
+    aggregate = (get_conversation_state("skill_aggregates") or {}).get(skill_name)
+    if aggregate is None:
         return "insufficient_data"
-    
-    recent_avg = sum(skill_scores[-3:]) / len(skill_scores[-3:])  # Last 3 scores
-    earlier_avg = sum(skill_scores[:-3]) / len(skill_scores[:-3]) if len(skill_scores) > 3 else skill_scores[0]
-    
-    if recent_avg > earlier_avg + 0.5:
-        return "improving"
-    elif recent_avg < earlier_avg - 0.5:
-        return "declining"
-    else:
-        return "stable"
\ No newline at end of file
+    return aggregate.trend()
+
+def get_all_skill_trends():
+    """Summarize count, averages, EWMA and trend for every tracked skill"""
+    aggregates = get_conversation_state("skill_aggregates") or {}
+    return {skill_name: aggregate.summary() for skill_name, aggregate in aggregates.items()}
@@ -1,47 +1,348 @@
 import os
 from livekit import api
-from flask import Flask, request
+from flask import Flask, Response, g, request, jsonify
 from dotenv import load_dotenv
 from flask_cors import CORS
-from livekit.api import LiveKitAPI, ListRoomsRequest
-import uuid
+from background_loop import BACKGROUND_LOOP
+from livekit_client import LIVEKIT
+from token_cache import TOKEN_CACHE
+from admission import ADMISSION_STORE, RATE_LIMIT_PER_IDENTITY, RATE_LIMIT_PER_IP, RateLimiter, RoomCapacity
+from metrics import REGISTRY, CallbackMetric, Counter, Histogram
+from datetime import timedelta
+import argparse
+import asyncio
+import math
+import re
+import secrets
+import shutil
+import socket
+import tempfile
+import time
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Room name allocation: "random" relies on collision-resistant names alone,
+# "listed" additionally checks names against a cached list of LiveKit rooms
+ROOM_NAME_STRATEGY = os.getenv("LEVRA_ROOM_NAME_STRATEGY", "random")
+
+# Seconds the cached room list is trusted before LiveKit is asked again
+ROOM_LIST_TTL = float(os.getenv("LEVRA_ROOM_LIST_TTL", "5"))
+
+# Maximum number of identities accepted by one batch token request
+BATCH_TOKEN_LIMIT = int(os.getenv("LEVRA_BATCH_TOKEN_LIMIT", "500"))
+
+# Room policies accepted by the batch token endpoint
+ROOM_POLICIES = ("per_learner", "shared")
+
+# Rooms a batch request may name for the "shared" policy: the "room-" namespace
+# used by generated room names, with a bounded length
+SHARED_ROOM_PATTERN = re.compile(r"room-[A-Za-z0-9_-]+")
+MAX_ROOM_NAME_LENGTH = 128
+
+# SERVER CONFIGURATION
+# ------------------------------------------------------------------------
+
+# Production serving defaults, overridable on the command line
+SERVER_HOST = os.getenv("LEVRA_SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("LEVRA_SERVER_PORT", "5001"))
+SERVER_WORKERS = int(os.getenv("LEVRA_SERVER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Request-handling threads per worker process
+SERVER_THREADS = int(os.getenv("LEVRA_SERVER_THREADS", "32"))
+
+# Seconds in-flight requests may take to finish after a shutdown signal
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("LEVRA_SERVER_GRACEFUL_TIMEOUT", "10"))
+
+# Directory the worker processes share their metrics through; set by
+# run_production for its workers rather than by hand
+METRICS_DIR_ENV = "LEVRA_METRICS_DIR"
+
+class LevraFlask(Flask):
+    """
+    Flask application that runs async views on the process-wide background
+    event loop instead of creating a new event loop for every request, so
+    async resources (the pooled LiveKit client) persist between requests.
+    """
+    def async_to_sync(self, func):
+        def run(*args, **kwargs):
+            return BACKGROUND_LOOP.run(func(*args, **kwargs))
+        return run
+
 # Initialize Flask application with CORS support for all origins
-app = Flask(__name__)
+app = LevraFlask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
 
+# METRICS
+# ------------------------------------------------------------------------
+
+REQUESTS = Counter("levra_http_requests_total",
+                   "HTTP requests handled, by route, method and status", ("route", "method", "status"))
+REQUEST_LATENCY = Histogram("levra_http_request_seconds",
+                            "HTTP request handling time in seconds, by route", ("route",))
+ROOMS_ALLOCATED = Counter("levra_rooms_allocated_total", "New room names handed out")
+TOKENS_ISSUED = Counter("levra_tokens_issued_total", "Access tokens returned to clients")
+
+# The hit ratio is rate(hits) / (rate(hits) + rate(misses)) in PromQL, which
+# stays correct when the counters of several workers are summed
+CallbackMetric("levra_token_cache_hits_total", "Access token cache hits",
+               lambda: TOKEN_CACHE.stats()["hits"], kind="counter")
+CallbackMetric("levra_token_cache_misses_total", "Access token cache misses",
+               lambda: TOKEN_CACHE.stats()["misses"], kind="counter")
+CallbackMetric("levra_token_cache_entries", "Access tokens currently cached",
+               lambda: TOKEN_CACHE.stats()["entries"])
+CallbackMetric("levra_livekit_calls_in_flight", "LiveKit API calls currently in flight",
+               lambda: LIVEKIT.stats()["in_flight"])
+CallbackMetric("levra_livekit_call_retries_total", "LiveKit API call retries",
+               lambda: LIVEKIT.stats()["retries"], kind="counter")
+CallbackMetric("levra_livekit_connections_total", "LiveKit API connections, by whether they were new or reused",
+               lambda: {("created",): LIVEKIT.connections_created, ("reused",): LIVEKIT.connections_reused},
+               kind="counter", labelnames=("state",))
+
+@app.before_request
+def start_request_timer():
+    """Record when request handling started"""
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request and record its latency under its route pattern"""
+    started = g.pop("request_started", None)
+    # The matched rule keeps label cardinality bounded, unlike the raw path
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    REQUESTS.inc(route, request.method, str(response.status_code))
+    if started is not None:
+        REQUEST_LATENCY.observe(time.perf_counter() - started, route)
+    return response
+
 # ROOM MANAGEMENT FUNCTIONS
 # ------------------------------------------------------------------------
 
+def new_room_name():
+    """
+    Build a collision-resistant, time-ordered room name.
+    
+    The millisecond timestamp keeps names sortable by creation time and the
+    72 random bits make a clash between names created in the same millisecond
+    negligible, so no lookup against existing rooms is needed.
+    
+    Returns:
+        str: A room name in the format "room-{timestamp hex}-{random hex}"
+    """
+    return f"room-{int(time.time() * 1000):x}-{secrets.token_hex(9)}"
+
+class RoomNameCache:
+    """
+    Set of existing LiveKit room names refreshed at most once per TTL.
+    
+    Names allocated by this process are added immediately, so they are
+    never handed out twice while the cached list is still fresh.
+    """
+    def __init__(self, ttl):
+        self._ttl = ttl
+        self._names = set()
+        self._expires_at = 0.0
+        self._refreshing = None
+
+    async def contains(self, name):
+        """
+        Check whether a room name is taken, refreshing the list if stale.
+        
+        Args:
+            name (str): Room name to check
+            
+        Returns:
+            bool: True if the room exists or was recently allocated
+        """
+        if time.monotonic() >= self._expires_at:
+            # Concurrent requests share one in-flight refresh instead of each
+            # listing every room when the cache expires
+            if self._refreshing is None:
+                self._refreshing = asyncio.ensure_future(self._refresh())
+            await asyncio.shield(self._refreshing)
+        return name in self._names
+
+    async def _refresh(self):
+        """Reload the room list from LiveKit"""
+        try:
+            self._names = set(await get_rooms())
+            self._expires_at = time.monotonic() + self._ttl
+        finally:
+            self._refreshing = None
+
+    def add(self, name):
+        """Record a newly allocated room name"""
+        self._names.add(name)
+
+ROOM_NAMES = RoomNameCache(ROOM_LIST_TTL)
+
 async def generate_room_name():
     """
-    Generate a unique room name with UUID to ensure uniqueness.
-    Verifies the name doesn't already exist in LiveKit.
+    Generate a unique room name.
+    
+    With the default "random" strategy the name is used as is; with
+    "listed" it is also checked against the cached LiveKit room list.
+    
+    Returns:
+        str: A unique room name
+    """
+    return (await generate_room_names(1))[0]
+
+async def generate_room_names(count):
+    """
+    Generate several unique room names in one pass.
+    
+    With the "listed" strategy the LiveKit room list is fetched at most once
+    for the whole batch rather than once per name.
     
+    Args:
+        count (int): Number of room names to generate
+        
     Returns:
-        str: A unique room name in the format "room-{uuid}"
+        list: Unique room names as strings
     """
-    name = "room-" + str(uuid.uuid4())[:8]
-    rooms = await get_rooms()
-    while name in rooms:
-        name = "room-" + str(uuid.uuid4())[:8]
-    return name
+    names = []
+    while len(names) < count:
+        name = new_room_name()
+        if ROOM_NAME_STRATEGY == "listed":
+            if await ROOM_NAMES.contains(name):
+                continue
+            ROOM_NAMES.add(name)
+        names.append(name)
+    ROOMS_ALLOCATED.inc(amount=count)
+    return names
 
 async def get_rooms():
     """
     Retrieve a list of all room names currently in LiveKit server.
     
+    Uses the shared, pooled LiveKit client so no new connection is opened.
+    
     Returns:
         list: List of room names as strings
     """
-    api = LiveKitAPI()
-    rooms = await api.room.list_rooms(ListRoomsRequest())
-    await api.aclose()
+    rooms = await LIVEKIT.list_rooms()
     return [room.name for room in rooms.rooms]
 
+# TOKEN ISSUANCE
+# ------------------------------------------------------------------------
+
+def issue_token(identity, room):
+    """
+    Return a LiveKit access token allowing identity to join room.
+    
+    Tokens are cached per identity, room and grants, so repeated requests
+    (reconnects, page reloads) reuse a still-valid JWT instead of signing
+    a new one. A cached token is replaced once it nears expiry.
+    
+    Args:
+        identity (str): Participant identity, also used as display name
+        room (str): Room the token grants access to
+        
+    Returns:
+        str: JWT token for LiveKit authentication
+    """
+    grants = api.VideoGrants(room_join=True, room=room)
+    
+    def mint():
+        return api.AccessToken(os.getenv("LIVEKIT_API_KEY"), os.getenv("LIVEKIT_API_SECRET")) \
+            .with_identity(identity)\
+            .with_name(identity)\
+            .with_grants(grants)\
+            .with_ttl(timedelta(seconds=TOKEN_CACHE.ttl))\
+            .to_jwt()
+    
+    TOKENS_ISSUED.inc()
+    # VideoGrants holds lists, so its repr stands in for a hashable key
+    return TOKEN_CACHE.get_or_mint((identity, room, repr(grants)), mint)
+
+# ADMISSION CONTROL
+# ------------------------------------------------------------------------
+
+# Active room limit, refreshed from LiveKit's room list, and request rate limits
+ROOM_CAPACITY = RoomCapacity(get_rooms)
+IDENTITY_LIMITS = RateLimiter("identity", RATE_LIMIT_PER_IDENTITY)
+IP_LIMITS = RateLimiter("ip", RATE_LIMIT_PER_IP)
+
+CallbackMetric("levra_rooms_in_use", "Active rooms counted against the admission limit",
+               lambda: ROOM_CAPACITY.stats()["rooms_in_use"], aggregate="max")
+CallbackMetric("levra_admission_rejected_total", "Requests refused, by reason",
+               lambda: {("capacity",): ROOM_CAPACITY.stats()["rejected"],
+                        ("identity_rate",): IDENTITY_LIMITS.stats()["limited"],
+                        ("ip_rate",): IP_LIMITS.stats()["limited"]},
+               kind="counter", labelnames=("reason",))
+
+def rejection(message, status, retry_after):
+    """
+    Build an error response telling the client when to try again.
+    
+    Args:
+        message (str): Reason for the rejection
+        status (int): HTTP status code (429 or 503)
+        retry_after (float): Seconds before a retry is likely to succeed
+        
+    Returns:
+        Response: JSON error response with a Retry-After header
+    """
+    seconds = max(1, math.ceil(retry_after))
+    response = jsonify({"error": message, "retry_after": seconds})
+    response.status_code = status
+    response.headers["Retry-After"] = str(seconds)
+    return response
+
+def charge_request(address, identities, rooms):
+    """
+    Charge one request to the client address and each identity, then
+    reserve capacity for its rooms, all in one admission store transaction.
+    
+    Rate limit charges made before a room rejection are kept, as they
+    would be for separate checks.
+    
+    Args:
+        address (str): Client IP address
+        identities (list): Identities the request names
+        rooms (list): Room names about to be handed out or joined
+        
+    Returns:
+        tuple: (message, status, retry_after) of the first failed check, otherwise None
+    """
+    with ADMISSION_STORE.transaction():
+        retry_after = IP_LIMITS.acquire(address)
+        if retry_after:
+            return "too many requests from this address", 429, retry_after
+        for identity in identities:
+            retry_after = IDENTITY_LIMITS.acquire(identity)
+            if retry_after:
+                return f"too many requests for identity {identity}", 429, retry_after
+        retry_after = ROOM_CAPACITY.reserve(rooms)
+        if retry_after:
+            return "all agents are busy, please retry shortly", 503, retry_after
+    return None
+
+async def admit_request(identities, rooms):
+    """
+    Apply the rate limits and the room limit to a token request.
+    
+    Rooms that are already active are admitted without using capacity.
+    
+    Args:
+        identities (list): Identities the request names; anonymous requests
+            pass none and are limited by address only
+        rooms (list): Room names about to be handed out or joined
+        
+    Returns:
+        Response: A 429 rejection if a rate limit is exceeded, a 503 rejection
+        if agents are at capacity, otherwise None
+    """
+    if ROOM_CAPACITY.enabled:
+        await ROOM_CAPACITY.sync()
+    # The limiters share state with the other workers through SQLite
+    rejected = await asyncio.to_thread(charge_request, request.remote_addr or "unknown", identities, rooms)
+    if rejected:
+        message, status, retry_after = rejected
+        return rejection(message, status, retry_after)
+    return None
+
 # API ENDPOINTS
 # ------------------------------------------------------------------------
 
@@ -55,26 +356,194 @@ async def get_token():
         room: Room ID (generates new room if not provided)
         
     Returns:
-        str: JWT token for LiveKit authentication
+        str: JWT token for LiveKit authentication, or a JSON error with a
+        Retry-After header (429 when rate limited, 503 when agents are at capacity)
     """
-    name = request.args.get("name", "my name")
+    name = request.args.get("name")
     room = request.args.get("room", None)
     
     if not room:
         room = await generate_room_name()
+    # Anonymous requests share the default name, so only the IP limit applies;
+    # a client-chosen room may be new too, so it needs capacity like any other
+    rejected = await admit_request([name] if name else [], [room])
+    if rejected:
+        return rejected
+    
+    return issue_token(name or "my name", room)
+
+@app.route("/getTokens", methods=["POST"])
+async def get_tokens():
+    """
+    Endpoint issuing LiveKit tokens for a whole cohort in one request.
+    
+    JSON body:
+        identities: List of learner identities (also used as display names)
+        room_policy: "per_learner" gives each learner their own new room,
+            "shared" puts every learner in the same room (default "per_learner")
+        room: Room ID for the "shared" policy, "room-" followed by letters,
+            digits, "-" or "_" (generates a new room if not provided)
         
-    token = api.AccessToken(os.getenv("LIVEKIT_API_KEY"), os.getenv("LIVEKIT_API_SECRET")) \
-        .with_identity(name)\
-        .with_name(name)\
-        .with_grants(api.VideoGrants(
-            room_join=True,
-            room=room
-        ))
+    Returns:
+        JSON: {"tokens": [{"identity", "room", "token"}, ...]} in request order,
+        or {"error": ...} with status 400 for an invalid request, 429 when
+        rate limited or 503 when agents lack capacity for the new rooms
+    """
+    body = request.get_json(silent=True) or {}
+    identities = body.get("identities")
+    policy = body.get("room_policy", "per_learner")
     
-    return token.to_jwt()
+    if not isinstance(identities, list) or not identities:
+        return jsonify({"error": "identities must be a non-empty list"}), 400
+    if len(identities) > BATCH_TOKEN_LIMIT:
+        return jsonify({"error": f"at most {BATCH_TOKEN_LIMIT} identities per request"}), 400
+    if not all(isinstance(identity, str) and identity for identity in identities):
+        return jsonify({"error": "identities must be non-empty strings"}), 400
+    if len(set(identities)) != len(identities):
+        return jsonify({"error": "identities must be unique"}), 400
+    if policy not in ROOM_POLICIES:
+        return jsonify({"error": f"room_policy must be one of {', '.join(ROOM_POLICIES)}"}), 400
+    room = body.get("room")
+    if room is not None and not (isinstance(room, str) and len(room) <= MAX_ROOM_NAME_LENGTH
+                                 and SHARED_ROOM_PATTERN.fullmatch(room)):
+        return jsonify({"error": f"room must be a room name of at most {MAX_ROOM_NAME_LENGTH} characters "
+                                 f"matching {SHARED_ROOM_PATTERN.pattern}"}), 400
+    
+    if policy == "shared":
+        room = room or await generate_room_name()
+        rooms = [room] * len(identities)
+    else:
+        rooms = await generate_room_names(len(identities))
+    
+    # The whole cohort is admitted or refused together
+    rejected = await admit_request(identities, rooms)
+    if rejected:
+        return rejected
+    
+    return jsonify({"tokens": [
+        {"identity": identity, "room": room, "token": issue_token(identity, room)}
+        for identity, room in zip(identities, rooms)
+    ]})
+
+@app.route("/stats/livekit")
+def livekit_stats():
+    """
+    Endpoint reporting usage of the shared LiveKit API client.
+    
+    Returns:
+        JSON: Call counters, concurrency and connection reuse
+    """
+    return jsonify(LIVEKIT.stats())
+
+@app.route("/metrics")
+def metrics():
+    """
+    Endpoint exposing server metrics for Prometheus to scrape.
+    
+    Returns:
+        text: Metrics in the Prometheus text exposition format
+    """
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/stats/admission")
+def admission_stats():
+    """
+    Endpoint reporting room capacity and rate limiting.
+    
+    Returns:
+        JSON: Active room usage and per-identity/per-IP limiter counters
+    """
+    return jsonify({
+        "rooms": ROOM_CAPACITY.stats(),
+        "identity_limits": IDENTITY_LIMITS.stats(),
+        "ip_limits": IP_LIMITS.stats(),
+    })
+
+@app.route("/stats/tokens")
+def token_stats():
+    """
+    Endpoint reporting usage of the access token cache.
+    
+    Returns:
+        JSON: Cache size, hits, misses, evictions and hit ratio
+    """
+    return jsonify(TOKEN_CACHE.stats())
 
 # APPLICATION ENTRY POINT
 # ------------------------------------------------------------------------
 
+def create_asgi_app():
+    """
+    Build the ASGI application used in production mode.
+    
+    Flask requests are served from a thread pool of SERVER_THREADS per worker
+    process while their async work runs on the shared background loop. With
+    several workers, each one shares its metrics so any of them can answer
+    a scrape with the totals of all.
+    
+    Returns:
+        ASGI application wrapping the Flask app
+    """
+    from a2wsgi import WSGIMiddleware
+    
+    if os.getenv(METRICS_DIR_ENV):
+        REGISTRY.share(os.environ[METRICS_DIR_ENV])
+    
+    return WSGIMiddleware(app, workers=SERVER_THREADS)
+
+def run_production(host, port, workers):
+    """
+    Serve the token server with uvicorn worker processes.
+    
+    On SIGINT/SIGTERM uvicorn stops accepting connections and waits up to
+    SERVER_GRACEFUL_TIMEOUT seconds for in-flight requests before exiting.
+    
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind
+        workers (int): Number of worker processes
+    """
+    import uvicorn
+    from uvicorn.supervisors import Multiprocess
+    
+    config = uvicorn.Config(
+        "server:create_asgi_app",
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT,
+        access_log=False,
+    )
+    server = uvicorn.Server(config)
+    
+    if workers > 1:
+        # Worker processes get the listening socket in a form asyncio does not
+        # recognise as TCP, so it skips its usual TCP_NODELAY; set it here so
+        # accepted connections inherit it and small responses are not held
+        # back by Nagle's algorithm on keep-alive connections
+        sock = config.bind_socket()
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # A fresh directory per run, so counts of a previous run are not added
+        metrics_dir = tempfile.mkdtemp(prefix="levra_metrics_")
+        os.environ[METRICS_DIR_ENV] = metrics_dir
+        try:
+            Multiprocess(config, target=server.run, sockets=[sock]).run()
+        finally:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+    else:
+        server.run()
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5001, debug=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="LEVRA token server")
+    parser.add_argument("--production", action="store_true",
+                        help="serve with uvicorn worker processes instead of the Flask debug server")
+    parser.add_argument("--host", default=SERVER_HOST, help="interface to bind")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="port to bind")
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS, help="worker processes (production only)")
+    args = parser.parse_args()
+
+    if args.production:
+        run_production(args.host, args.port, args.workers)
+    else:
+        app.run(host=args.host, port=args.port, debug=True)
\ No newline at end of file
@@ -0,0 +1,301 @@
+"""
+Session State Store for LEVRA AI Learning Coach
+
+This module keeps conversation state per coaching session instead of in one
+process-wide dictionary, so a worker process can host many concurrent sessions
+without them overwriting each other's scenario and history.
+
+Each session is keyed by its room (or job) ID. The agent creates the session
+when a job starts and releases it when the job ends; the session is also bound
+to the current asyncio context, so code running on behalf of that job (event
+handlers, function tools) reaches its own state without passing IDs around.
+Sessions a job is still running are never evicted; they live until the job
+releases them, however quiet the user is. Other sessions (and job sessions
+that are never released) are evicted after an idle timeout, and the least
+recently used of them when the store exceeds its session or memory cap.
+"""
+
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Callable, Optional
+import os
+import sys
+import threading
+import time
+
+# STORE CONFIGURATION
+# ------------------------------------------------------------------------
+
+# Seconds without access after which a session is evicted
+DEFAULT_SESSION_IDLE_TIMEOUT = float(os.getenv("LEVRA_SESSION_IDLE_TIMEOUT", "3600"))
+
+# Maximum number of live sessions per process
+DEFAULT_MAX_SESSIONS = int(os.getenv("LEVRA_MAX_SESSIONS", "1000"))
+
+# Approximate memory budget for all session state in bytes (0 disables the cap)
+DEFAULT_SESSION_MAX_BYTES = int(os.getenv("LEVRA_SESSION_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Seconds between periodic stats reports (see start_reporting)
+DEFAULT_SESSION_STATS_INTERVAL = float(os.getenv("LEVRA_SESSION_STATS_INTERVAL", "60"))
+
+# Minimum seconds between memory measurements of all session state; walking
+# every state object is too costly to repeat on each session start
+SIZE_REFRESH_INTERVAL = 10.0
+
+# Session used by code that runs outside any job (scripts, benchmarks)
+DEFAULT_SESSION_ID = "default"
+
+# ID of the session bound to the current asyncio task / thread context
+_current_session_id: ContextVar[Optional[str]] = ContextVar("levra_session_id", default=None)
+
+def estimate_size(obj, _seen=None):
+    """
+    Approximate the memory held by an object graph in bytes.
+    
+    Follows dicts, sequences, sets and objects with __dict__ or __slots__,
+    counting every object once.
+    
+    Args:
+        obj: Root object to measure
+        
+    Returns:
+        int: Estimated size in bytes
+    """
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)) or hasattr(obj, "maxlen"):
+        size += sum(estimate_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += estimate_size(vars(obj), seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(estimate_size(getattr(obj, slot), seen) for slot in obj.__slots__ if hasattr(obj, slot))
+    return size
+
+class SessionStateStore:
+    """
+    Bounded, thread-safe map of session ID to conversation state.
+    
+    State dictionaries are built by the factory passed at construction. The
+    store tracks last access per session for idle eviction and exposes gauges
+    for live sessions and bytes held. Sessions created as active (bound to a
+    running job) are exempt from eviction until released.
+    """
+    def __init__(self, factory: Callable[[], dict], idle_timeout: float = DEFAULT_SESSION_IDLE_TIMEOUT,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS, max_bytes: int = DEFAULT_SESSION_MAX_BYTES):
+        """
+        Initialize an empty store.
+        
+        Args:
+            factory (callable): Returns a fresh state dict for a new session
+            idle_timeout (float): Seconds without access before a session is evicted
+            max_sessions (int): Maximum number of live sessions
+            max_bytes (int): Approximate memory cap for all state (0 disables it)
+        """
+        self._factory = factory
+        self._idle_timeout = idle_timeout
+        self._max_sessions = max(1, max_sessions)
+        self._max_bytes = max_bytes
+        self._sessions = OrderedDict()
+        self._last_access = {}
+        self._active = set()
+        self._idle_warned = set()
+        self._lock = threading.Lock()
+        self._reporter = None
+        self._stop_reporting = threading.Event()
+        self.bytes_held = 0
+        self._sizes = {}
+        self._measured_at = None
+        self.created = 0
+        self.released = 0
+        self.evicted_idle = 0
+        self.evicted_capacity = 0
+
+    def create(self, session_id: str, bind: bool = True, active: bool = True) -> dict:
+        """
+        Create (or return the existing) state for a session.
+        
+        Args:
+            session_id (str): Room or job ID identifying the session
+            bind (bool): Also make it the current session for this context
+            active (bool): Keep the session until release() (a running job),
+                instead of letting it be evicted when idle or over a cap
+            
+        Returns:
+            dict: The session's state
+        """
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                state = self._sessions[session_id] = self._factory()
+                self.created += 1
+            if active:
+                self._active.add(session_id)
+            self._touch(session_id)
+            self._sweep()
+        if bind:
+            _current_session_id.set(session_id)
+        return state
+
+    def release(self, session_id: str):
+        """
+        Drop a session's state when its job ends.
+        
+        Args:
+            session_id (str): Session to release
+        """
+        with self._lock:
+            if session_id in self._sessions:
+                self._forget(session_id)
+                self.released += 1
+        if _current_session_id.get() == session_id:
+            _current_session_id.set(None)
+
+    def current(self) -> dict:
+        """
+        State of the session bound to the current context, creating the
+        default session when no job has bound one.
+        
+        Returns:
+            dict: Session state
+        """
+        session_id = _current_session_id.get() or DEFAULT_SESSION_ID
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is not None:
+                self._touch(session_id)
+                return state
+        return self.create(session_id, bind=False, active=False)
+
+    def current_session_id(self) -> Optional[str]:
+        """
+        Returns:
+            str: ID of the session bound to the current context, or None
+        """
+        return _current_session_id.get()
+
+    def sweep(self):
+        """
+        Evict idle sessions and enforce the session and memory caps.
+        """
+        with self._lock:
+            self._sweep()
+
+    def stats(self):
+        """
+        Gauges and counters for monitoring. Calling this re-measures the
+        memory held by every session.
+        
+        Returns:
+            dict: Live sessions, approximate bytes held and lifecycle counters
+        """
+        with self._lock:
+            self._sweep(measure=True)
+            return {
+                "live_sessions": len(self._sessions),
+                "active_sessions": len(self._active),
+                "bytes_held": self.bytes_held,
+                "created": self.created,
+                "released": self.released,
+                "evicted_idle": self.evicted_idle,
+                "evicted_capacity": self.evicted_capacity,
+            }
+
+    def start_reporting(self, interval: float = DEFAULT_SESSION_STATS_INTERVAL):
+        """
+        Print stats() periodically from a daemon thread. The periodic call
+        also sweeps, so idle sessions are evicted even when no new session
+        starts. Only the first call starts a reporter; 0 disables it.
+        
+        Args:
+            interval (float): Seconds between reports
+        """
+        with self._lock:
+            if self._reporter is not None or interval <= 0:
+                return
+            self._reporter = threading.Thread(target=self._report, args=(interval,),
+                                              name="levra-session-stats", daemon=True)
+        self._reporter.start()
+
+    def stop_reporting(self):
+        """
+        Stop the periodic stats reports started by start_reporting().
+        """
+        self._stop_reporting.set()
+
+    def _report(self, interval):
+        """Reporter thread body"""
+        while not self._stop_reporting.wait(interval):
+            print(f"Session state: {self.stats()}")
+
+    def _touch(self, session_id):
+        """Mark a session as most recently used (caller holds the lock)"""
+        self._sessions.move_to_end(session_id)
+        self._last_access[session_id] = time.monotonic()
+        self._idle_warned.discard(session_id)
+
+    def _evictable(self, keep=None):
+        """Sessions that may be evicted, least recently used first (caller holds the lock)"""
+        return [session_id for session_id in self._sessions
+                if session_id not in self._active and session_id != keep]
+
+    def _sweep(self, measure=False):
+        """
+        Eviction pass run with the lock held. Memory is re-measured when
+        requested or when the last measurement is older than SIZE_REFRESH_INTERVAL.
+        """
+        now = time.monotonic()
+        cutoff = now - self._idle_timeout
+        for session_id in list(self._sessions):
+            if self._last_access[session_id] > cutoff:
+                break
+            if session_id in self._active:
+                # A quiet user is not a finished job; keep the state until release()
+                if session_id not in self._idle_warned:
+                    self._idle_warned.add(session_id)
+                    print(f"WARNING: session {session_id} idle for "
+                          f"{now - self._last_access[session_id]:.0f}s but still active; not evicting")
+                continue
+            self._evict(session_id)
+            self.evicted_idle += 1
+
+        excess = len(self._sessions) - self._max_sessions
+        if excess > 0:
+            for session_id in self._evictable()[:excess]:
+                self._evict(session_id)
+                self.evicted_capacity += 1
+
+        if not measure and self._measured_at is not None and now - self._measured_at < SIZE_REFRESH_INTERVAL:
+            return
+        self._measured_at = now
+
+        self._sizes = {session_id: estimate_size(state) for session_id, state in self._sessions.items()}
+        self.bytes_held = sum(self._sizes.values())
+        if self._max_bytes and self.bytes_held > self._max_bytes:
+            # Never evict the most recently used session, which is the caller's
+            newest = next(reversed(self._sessions))
+            for session_id in self._evictable(keep=newest):
+                if self.bytes_held <= self._max_bytes:
+                    break
+                self._evict(session_id)
+                self.evicted_capacity += 1
+
+    def _evict(self, session_id):
+        """Remove a session without counting it as released"""
+        self._forget(session_id)
+        print(f"Session state evicted: {session_id}")
+
+    def _forget(self, session_id):
+        """Drop a session and its bookkeeping (caller holds the lock)"""
+        self._sessions.pop(session_id, None)
+        self._last_access.pop(session_id, None)
+        self._active.discard(session_id)
+        self._idle_warned.discard(session_id)
+        self.bytes_held -= self._sizes.pop(session_id, 0)
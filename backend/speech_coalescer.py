@@ -0,0 +1,135 @@
+"""
+LEVRA AI Voice Agent - Speech Turn Coalescing
+
+When a user pauses mid-sentence, the realtime model commits several short
+speech fragments in a row. Answering each one separately produces
+back-to-back responses that compete with each other and waste model time.
+
+TurnCoalescer sits between user_speech_committed and the conversation
+handlers. Fragments arriving within a short window of each other are
+merged into one turn. If the user speaks again while the answer to their
+previous turn is still being generated, that response is cancelled so only
+the answer to the complete utterance is heard.
+"""
+
+import asyncio
+import os
+
+# COALESCING CONFIGURATION
+# ------------------------------------------------------------------------
+
+# Milliseconds to wait after a speech fragment for the user to continue
+# (0 hands every fragment over immediately)
+SPEECH_COALESCE_WINDOW_MS = float(os.getenv("LEVRA_SPEECH_COALESCE_WINDOW_MS", "600"))
+
+class TurnCoalescer:
+    """
+    Debounces committed speech fragments into turns and cancels stale responses.
+
+    Must be used from the event loop the agent session runs on.
+    """
+    def __init__(self, on_turn, cancel_response, window_ms=SPEECH_COALESCE_WINDOW_MS):
+        """
+        Initialize the coalescer.
+
+        Args:
+            on_turn (callable): Called with (text, committed_at) for each merged turn,
+                where committed_at is the perf_counter time of its last fragment
+            cancel_response (callable): Cancels the model's in-progress response
+            window_ms (float): Quiet period that ends a turn, in milliseconds
+        """
+        self._on_turn = on_turn
+        self._cancel_response = cancel_response
+        self.window = window_ms / 1000
+        self._fragments = []
+        self._last_committed_at = None
+        self._timer = None
+        self._awaiting_response = False
+        self._responding = False
+        self._cancel_on_create = False
+        self.fragments = 0
+        self.turns = 0
+        self.merged = 0
+        self.cancelled = 0
+
+    def add(self, text, committed_at):
+        """
+        Accept a committed speech fragment.
+
+        Args:
+            text (str): Fragment text
+            committed_at (float): perf_counter time the fragment was committed
+        """
+        self.fragments += 1
+        self._fragments.append(text)
+        self._last_committed_at = committed_at
+        self._cancel_stale_response()
+
+        if self._timer is not None:
+            self._timer.cancel()
+        if self.window <= 0:
+            self.flush()
+        else:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+
+    def _cancel_stale_response(self):
+        """Cancel the answer to the previous turn now that the user kept talking"""
+        if self._responding:
+            self._cancel_response()
+            self._responding = False
+            self.cancelled += 1
+        elif self._awaiting_response:
+            # The response was requested but not created yet; cancel it on arrival
+            self._cancel_on_create = True
+
+    def flush(self):
+        """Hand the buffered fragments over as one turn"""
+        self._timer = None
+        if not self._fragments:
+            return
+        text = " ".join(fragment.strip() for fragment in self._fragments)
+        self.merged += len(self._fragments) - 1
+        self.turns += 1
+        self._fragments = []
+        self._awaiting_response = True
+        self._on_turn(text, self._last_committed_at)
+
+    # RESPONSE TRACKING
+    # ------------------------------------------------------------
+
+    def response_created(self):
+        """Note that the model started a response"""
+        if not self._awaiting_response:
+            return
+        self._awaiting_response = False
+        if self._cancel_on_create:
+            self._cancel_on_create = False
+            self._cancel_response()
+            self.cancelled += 1
+        else:
+            self._responding = True
+
+    def response_done(self):
+        """Note that the model finished (or cancelled) its response"""
+        self._responding = False
+
+    def close(self):
+        """Drop any buffered fragments and pending timer"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._fragments = []
+
+    def stats(self):
+        """
+        Report coalescing activity.
+
+        Returns:
+            dict: Fragments received, turns handed over, fragments merged and responses cancelled
+        """
+        return {
+            "fragments": self.fragments,
+            "turns": self.turns,
+            "merged": self.merged,
+            "cancelled": self.cancelled,
+        }
@@ -0,0 +1,18 @@
+"""
+Shared test setup for the backend modules.
+
+The backend is a flat directory of modules that import each other by name,
+so it is put on sys.path here. Every module-level DatabaseDriver and the
+admission store are pointed at throwaway files before anything imports them.
+"""
+
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+TEST_DIR = tempfile.mkdtemp(prefix="levra-tests-")
+os.environ["LEVRA_DB_PATH"] = os.path.join(TEST_DIR, "career_assistant.db")
+os.environ["LEVRA_ADMISSION_DB"] = os.path.join(TEST_DIR, "admission.db")
@@ -0,0 +1,130 @@
+"""
+Tests for token server admission control and its shared state.
+"""
+
+import asyncio
+
+import pytest
+
+from admission import AdmissionStore, RateLimiter, RoomCapacity
+
+@pytest.fixture
+def store(tmp_path):
+    return AdmissionStore(str(tmp_path / "admission.db"))
+
+def rooms(*names):
+    async def list_rooms():
+        return list(names)
+    return list_rooms
+
+def test_rate_limit_is_shared_between_limiters(store):
+    # Two limiters on one file stand in for two worker processes
+    first = RateLimiter("identity", 2, store=store)
+    second = RateLimiter("identity", 2, store=store)
+
+    assert first.acquire("ada") == 0
+    assert second.acquire("ada") == 0
+    assert first.acquire("ada") > 0
+    assert second.acquire("grace") == 0
+    assert first.stats()["limited"] == 1
+    assert second.stats()["tracked_keys"] == 2
+
+def test_rate_limit_scopes_are_separate(store):
+    assert RateLimiter("identity", 1, store=store).acquire("x") == 0
+    assert RateLimiter("ip", 1, store=store).acquire("x") == 0
+
+def test_room_capacity_is_shared_between_workers(store):
+    first = RoomCapacity(rooms(), max_rooms=2, store=store)
+    second = RoomCapacity(rooms(), max_rooms=2, store=store)
+
+    async def scenario():
+        assert await first.admit(["a"]) == 0
+        assert await second.admit(["b"]) == 0
+        assert await first.admit(["c"]) > 0
+        # Joining a room another worker allocated needs no capacity
+        assert await first.admit(["b"]) == 0
+
+    asyncio.run(scenario())
+    assert second.in_use() == 2
+    assert first.stats()["rejected"] == 1
+
+def test_live_rooms_count_once(store):
+    capacity = RoomCapacity(rooms("a", "b"), max_rooms=3, store=store)
+
+    async def scenario():
+        assert await capacity.admit(["a"]) == 0
+        assert await capacity.admit(["c"]) == 0
+        assert await capacity.admit(["d"]) > 0
+
+    asyncio.run(scenario())
+    assert capacity.stats()["rooms_in_use"] == 3
+
+def test_nested_transactions_commit_or_roll_back_together(store):
+    limiter = RateLimiter("ip", 1, store=store)
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            assert limiter.acquire("x") == 0
+            raise RuntimeError("request failed")
+    assert limiter.acquire("x") == 0
+    assert limiter.acquire("x") > 0
+
+# TOKEN ENDPOINTS
+# ------------------------------------------------------------------------
+
+@pytest.fixture
+def client(monkeypatch, store):
+    monkeypatch.setenv("LIVEKIT_API_KEY", "test")
+    monkeypatch.setenv("LIVEKIT_API_SECRET", "test-secret-test-secret-test-secret")
+    import server
+    monkeypatch.setattr(server, "ADMISSION_STORE", store)
+    monkeypatch.setattr(server, "ROOM_CAPACITY", RoomCapacity(rooms("open"), max_rooms=1, store=store))
+    monkeypatch.setattr(server, "IDENTITY_LIMITS", RateLimiter("identity", 1, store=store))
+    monkeypatch.setattr(server, "IP_LIMITS", RateLimiter("ip", 100, store=store))
+    return server.app.test_client()
+
+def test_client_chosen_room_is_admitted(client):
+    # The one slot is taken by the open room, so a new room is refused
+    response = client.get("/getToken?name=ada&room=brand-new")
+    assert response.status_code == 503
+    assert client.get("/getToken?name=grace&room=open").status_code == 200
+
+def test_anonymous_clients_do_not_share_an_identity_bucket(client):
+    assert client.get("/getToken?room=open").status_code == 200
+    assert client.get("/getToken?room=open").status_code == 200
+    assert client.get("/getToken?name=ada&room=open").status_code == 200
+    assert client.get("/getToken?name=ada&room=open").status_code == 429
+
+def test_shared_cohort_room_is_admitted(client):
+    response = client.post("/getTokens", json={"identities": ["a", "b"], "room_policy": "shared",
+                                               "room": "room-elsewhere"})
+    assert response.status_code == 503
+
+@pytest.mark.parametrize("room", ["", "elsewhere", "room-", "room-a/b", "room-" + "x" * 124, 42, ["room-a"]])
+def test_shared_cohort_room_must_be_a_valid_name(client, room):
+    response = client.post("/getTokens", json={"identities": ["a"], "room_policy": "shared", "room": room})
+    assert response.status_code == 400
+    assert "room must be" in response.get_json()["error"]
+
+def test_shared_cohort_gets_a_valid_room(client, monkeypatch):
+    import server
+    monkeypatch.setattr(server, "ROOM_CAPACITY", RoomCapacity(rooms("room-open"), max_rooms=1,
+                                                              store=server.ADMISSION_STORE))
+    response = client.post("/getTokens", json={"identities": ["a", "b"], "room_policy": "shared",
+                                               "room": "room-open"})
+    assert response.status_code == 200
+    assert {token["room"] for token in response.get_json()["tokens"]} == {"room-open"}
+
+def test_token_request_takes_one_store_transaction(client, store):
+    # The first request also refreshes the room list, at most once per sync interval
+    assert client.get("/getToken?name=grace&room=open").status_code == 200
+    statements = []
+    connect = store._connect
+
+    def traced_connect():
+        conn = connect()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    store._connect = traced_connect
+    assert client.get("/getToken?name=ada&room=open").status_code == 200
+    assert statements.count("BEGIN IMMEDIATE") == 1
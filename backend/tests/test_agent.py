@@ -0,0 +1,265 @@
+"""
+Tests for the agent's event wiring, driven through the real MultimodalAgent
+with a fake realtime model and room.
+"""
+
+import asyncio
+import functools
+import types
+
+import pytest
+from livekit.agents import utils
+from livekit.plugins.openai.realtime.realtime_model import InputTranscriptionCompleted
+
+import agent
+from speech_coalescer import TurnCoalescer
+
+class FakeConversationItem:
+    def __init__(self, session):
+        self._session = session
+
+    def create(self, message, previous_item_id=None):
+        self._session.created.append((message, previous_item_id))
+
+    def delete(self, *, item_id):
+        self._session.deleted.append(item_id)
+
+class FakeSession(utils.EventEmitter):
+    """Realtime session recording what the agent sends to the model"""
+    def __init__(self):
+        super().__init__()
+        self.id = "session-1"
+        self.created = []
+        self.deleted = []
+        self.responses = 0
+        self.requested_metadata = None
+        self.cancelled = 0
+        # Never resolves, so the agent's audio tasks do not start
+        self._init_sync_task = asyncio.get_running_loop().create_future()
+        self.conversation = types.SimpleNamespace(item=FakeConversationItem(self))
+        self.response = types.SimpleNamespace(create=self._create_response, cancel=self._cancel_response)
+
+    def _create_response(self, metadata=None):
+        self.responses += 1
+        self.requested_metadata = metadata
+
+    def start_response(self, metadata=None):
+        """Emit response_created as the server does, for the agent's request by default"""
+        if metadata is None:
+            metadata = self.requested_metadata
+        self.emit("response_created", types.SimpleNamespace(metadata=metadata))
+
+    def auto_response(self):
+        """A response the server starts by itself, as with create_response enabled"""
+        self.emit("response_created", types.SimpleNamespace(metadata=None))
+
+    def _cancel_response(self):
+        self.cancelled += 1
+
+    def created_texts(self, role=None):
+        return [message.content for message, _ in self.created if role is None or message.role == role]
+
+class FakeModel:
+    def __init__(self):
+        self.sessions = []
+        self.capabilities = types.SimpleNamespace(supports_truncate=False)
+
+    def session(self, chat_ctx=None, fnc_ctx=None):
+        session = FakeSession()
+        self.sessions.append(session)
+        return session
+
+class FakeRoom(utils.EventEmitter):
+    def __init__(self):
+        super().__init__()
+        self.name = "room-test"
+        self.remote_participants = {}
+
+class FakeJobContext:
+    def __init__(self):
+        self.room = FakeRoom()
+        self.job = types.SimpleNamespace(id="job-test")
+        self.proc = types.SimpleNamespace(userdata={"openai_api_key": "sk-test"})
+        self.shutdown_callbacks = []
+
+    async def connect(self, auto_subscribe=None):
+        pass
+
+    async def wait_for_participant(self):
+        return types.SimpleNamespace(identity="learner-without-profile")
+
+    def add_shutdown_callback(self, callback):
+        self.shutdown_callbacks.append(callback)
+
+class RecordingAgent(agent.MultimodalAgent):
+    """The real agent, with the transcript forwarder its audio task would create"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._stt_forwarder = types.SimpleNamespace(update=lambda event: None)
+
+@pytest.fixture
+def model(monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(agent, "configure_model", lambda api_key: model)
+    monkeypatch.setattr(agent, "MultimodalAgent", RecordingAgent)
+    monkeypatch.setattr(agent, "WELCOME_AUDIO_ENABLED", False)
+    monkeypatch.setattr(agent, "TurnCoalescer", functools.partial(TurnCoalescer, window_ms=20))
+    return model
+
+async def start_agent(ctx=None):
+    ctx = ctx or FakeJobContext()
+    await agent.entrypoint(ctx)
+    return ctx
+
+def say(session, item_id, transcript):
+    session.emit("input_speech_committed")
+    session.emit("input_speech_transcription_completed", InputTranscriptionCompleted(item_id, transcript))
+
+def test_speech_fragments_become_one_turn(model):
+    async def scenario():
+        await start_agent()
+        session = model.sessions[0]
+        responses = session.responses
+        say(session, "item-1", "I want to practise")
+        say(session, "item-2", "giving feedback")
+        await asyncio.sleep(0.1)
+        return session, responses
+
+    session, responses_before = asyncio.run(scenario())
+    assert session.responses == responses_before + 1
+    assert any("I want to practise giving feedback" in text for text in session.created_texts("system"))
+
+def returning_learner(monkeypatch, delay=0.0):
+    async def prefetch_profile(self, id):
+        await asyncio.sleep(delay)
+        self.load_profile(types.SimpleNamespace(id=id, dream_job="product manager",
+                                                current_skills="sql", education="BSc"))
+        return True
+    monkeypatch.setattr(agent.AssistantFnc, "prefetch_profile", prefetch_profile)
+
+def pinned(session):
+    return [text for text in session.created_texts("system") if text.startswith("Known facts")]
+
+def test_prefetched_profile_is_pinned_at_start(model, monkeypatch):
+    returning_learner(monkeypatch)
+
+    async def scenario():
+        await start_agent()
+        return model.sessions[0]
+
+    session = asyncio.run(scenario())
+    assert len(pinned(session)) == 1
+    assert "product manager" in pinned(session)[0]
+
+def test_late_profile_is_pinned_when_the_lookup_finishes(model, monkeypatch):
+    returning_learner(monkeypatch, delay=0.05)
+    monkeypatch.setattr(agent, "PROFILE_PREFETCH_TIMEOUT", 0)
+
+    async def scenario():
+        await start_agent()
+        session = model.sessions[0]
+        pinned_at_start = len(pinned(session))
+        await asyncio.sleep(0.1)
+        return session, pinned_at_start
+
+    session, pinned_at_start = asyncio.run(scenario())
+    assert pinned_at_start == 0
+    assert len(pinned(session)) == 1
+
+def cached_welcome(monkeypatch, played):
+    async def play():
+        await asyncio.sleep(0.01)
+        return played
+    monkeypatch.setattr(agent, "start_cached_welcome", lambda *args: asyncio.create_task(play()))
+
+def welcomes(session):
+    return [text for text in session.created_texts("assistant") if text == agent.WELCOME_MESSAGE]
+
+async def start_and_settle(model):
+    await start_agent()
+    await asyncio.sleep(0.05)
+    return model.sessions[0]
+
+def test_model_greets_when_no_welcome_audio_is_cached(model):
+    session = asyncio.run(start_and_settle(model))
+    assert session.responses == 1
+    assert len(welcomes(session)) == 1
+
+def test_cached_welcome_is_recorded_without_a_response(model, monkeypatch):
+    cached_welcome(monkeypatch, played=True)
+    session = asyncio.run(start_and_settle(model))
+    assert session.responses == 0
+    assert len(welcomes(session)) == 1
+
+def test_model_greets_when_cached_playback_fails(model, monkeypatch):
+    cached_welcome(monkeypatch, played=False)
+    session = asyncio.run(start_and_settle(model))
+    assert session.responses == 1
+    assert len(welcomes(session)) == 1
+
+@pytest.fixture
+def trackers(monkeypatch):
+    trackers = []
+
+    class RecordingTracker(agent.LatencyTracker):
+        def __init__(self, session_id):
+            super().__init__(session_id)
+            trackers.append(self)
+
+    monkeypatch.setattr(agent, "LatencyTracker", RecordingTracker)
+    return trackers
+
+def test_model_welcome_latency_is_recorded(model, trackers):
+    async def scenario():
+        session = await start_and_settle(model)
+        session.start_response()
+
+    asyncio.run(scenario())
+    assert trackers[0].summary()["join_to_welcome"]["count"] == 1
+
+def test_speech_to_response_is_measured_from_the_commit(model, trackers):
+    async def scenario():
+        session = await start_and_settle(model)
+        session.start_response()
+        session.emit("input_speech_committed")
+        # Transcription finishes a while after the commit
+        await asyncio.sleep(0.05)
+        session.emit("input_speech_transcription_completed", InputTranscriptionCompleted("item-1", "hello"))
+        await asyncio.sleep(0.05)
+        session.start_response()
+
+    asyncio.run(scenario())
+    stage = trackers[0].summary()["speech_to_response"]
+    assert stage["count"] == 1
+    assert stage["max_ms"] >= 90
+
+def test_model_leaves_answering_to_the_agent():
+    async def configure():
+        return agent.configure_model("sk-test")
+
+    model = asyncio.run(configure())
+    assert model._default_opts.turn_detection.create_response is False
+
+def test_server_started_responses_do_not_confuse_the_turn(model, trackers):
+    async def scenario():
+        session = await start_and_settle(model)
+        session.start_response()
+        responses = session.responses
+        # A server answering on its own would start a response per fragment
+        session.emit("input_speech_committed")
+        session.auto_response()
+        session.emit("input_speech_committed")
+        session.auto_response()
+        session.emit("input_speech_transcription_completed", InputTranscriptionCompleted("item-1", "I lead"))
+        session.emit("input_speech_transcription_completed", InputTranscriptionCompleted("item-2", "a team"))
+        await asyncio.sleep(0.05)
+        session.start_response()
+        return session, responses
+
+    session, responses_before = asyncio.run(scenario())
+    assert session.responses == responses_before + 1
+    assert session.requested_metadata == agent.AGENT_RESPONSE_METADATA
+    # Nothing was cancelled and the user's speech was not added a second time
+    assert session.cancelled == 0
+    assert session.created_texts("user") == []
+    assert trackers[0].summary()["speech_to_response"]["count"] == 1
@@ -0,0 +1,102 @@
+"""
+Tests for the asyncio front-end of the database driver and the assistant
+functions that use it.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import api
+from db_driver import AsyncDatabaseDriver, DatabaseDriver
+
+@pytest.fixture
+def driver(tmp_path):
+    driver = DatabaseDriver(str(tmp_path / "async.db"), pool_size=2)
+    yield driver
+    driver.close()
+
+@pytest.fixture
+def async_db(driver):
+    async_db = AsyncDatabaseDriver(driver)
+    yield async_db
+    async_db.close()
+
+def test_queries_run_on_the_database_executor(driver, async_db, monkeypatch):
+    threads = []
+    get_profile_by_id = driver.get_profile_by_id
+
+    def slow_lookup(id):
+        threads.append(threading.current_thread().name)
+        time.sleep(0.1)
+        return get_profile_by_id(id)
+
+    monkeypatch.setattr(driver, "get_profile_by_id", slow_lookup)
+
+    async def scenario():
+        await async_db.create_career_profile("ada", "Engineer", "Python", "BSc")
+        lookup = asyncio.ensure_future(async_db.get_profile_by_id("ada"))
+        # The loop keeps running other work while the query blocks
+        ticks = 0
+        while not lookup.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return await lookup, ticks
+
+    profile, ticks = asyncio.run(scenario())
+    assert profile.dream_job == "Engineer"
+    assert ticks >= 5
+    assert threads[0].startswith("levra-db")
+
+def test_close_waits_for_queued_queries(driver, monkeypatch):
+    async_db = AsyncDatabaseDriver(driver, max_workers=1)
+    finished = []
+    create_career_profile = driver.create_career_profile
+
+    def slow_create(*args):
+        time.sleep(0.05)
+        finished.append(args[0])
+        return create_career_profile(*args)
+
+    monkeypatch.setattr(driver, "create_career_profile", slow_create)
+
+    async def scenario():
+        for id in ("a", "b"):
+            asyncio.ensure_future(async_db.create_career_profile(id, "", "", ""))
+        await asyncio.sleep(0)
+        async_db.close()
+        with pytest.raises(RuntimeError):
+            await async_db.get_profile_by_id("a")
+
+    asyncio.run(scenario())
+    assert finished == ["a", "b"]
+    assert driver.get_profile_by_id("b") is not None
+
+@pytest.fixture
+def assistant(async_db, monkeypatch):
+    monkeypatch.setattr(api, "ASYNC_DB", async_db)
+    return api.AssistantFnc()
+
+def test_lookup_profile_loads_a_stored_profile(assistant, driver):
+    driver.create_career_profile("ada", "Engineer", "Python", "BSc")
+    reply = asyncio.run(assistant.lookup_profile("ada"))
+    assert reply == ("The profile details are: User with ID ada has a dream job as Engineer, "
+                     "with skills in Python, and educational background: BSc.")
+    assert assistant.has_profile()
+
+def test_lookup_profile_reports_unknown_ids(assistant):
+    assert asyncio.run(assistant.lookup_profile("nobody")) == "Profile not found"
+    assert not assistant.has_profile()
+
+def test_create_profile_stores_and_loads_the_profile(assistant, driver):
+    reply = asyncio.run(assistant.create_profile("ada", "Engineer", "Python", "BSc"))
+    assert reply == "Successfully created profile for ada with dream job: Engineer"
+    assert driver.get_profile_by_id("ada").education == "BSc"
+    assert assistant.get_profile_details().startswith("User with ID ada")
+
+def test_create_profile_reports_failures(assistant, driver):
+    driver.create_career_profile("ada", "Engineer", "Python", "BSc")
+    assert asyncio.run(assistant.create_profile("ada", "Nurse", "", "")) == "Failed to create profile"
+    assert not assistant.has_profile()
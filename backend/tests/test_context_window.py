@@ -0,0 +1,72 @@
+"""
+Tests for the token-budgeted conversation window, checked against a
+simulated server conversation and the session's local copy of it.
+"""
+
+import types
+
+from livekit.agents import llm
+from livekit.plugins.openai.realtime.remote_items import _RemoteConversationItems
+
+from context_window import ConversationWindow
+
+class SimulatedSession:
+    """
+    Realtime session whose conversation behaves like the server's.
+
+    The server places an item after previous_item_id, at the end when it is
+    None, and at the head for "root". It reports the actual predecessor back
+    (none at the head), which the local copy inserts after, as the session does.
+    """
+    def __init__(self):
+        self.server = []
+        self.local = _RemoteConversationItems()
+        self.conversation = types.SimpleNamespace(item=types.SimpleNamespace(create=self.create, delete=self.delete))
+
+    def on(self, event, callback):
+        pass
+
+    def create(self, message, previous_item_id=None):
+        if previous_item_id == "root":
+            index = 0
+        elif previous_item_id is None:
+            index = len(self.server)
+        else:
+            index = [msg.id for msg in self.server].index(previous_item_id) + 1
+        self.server.insert(index, message)
+        reported = self.server[index - 1].id if index > 0 else None
+        self.local.insert_after(reported, message)
+
+    def delete(self, *, item_id):
+        self.server = [msg for msg in self.server if msg.id != item_id]
+        self.local.delete(item_id)
+
+    def chat_ctx_copy(self):
+        return self.local.to_chat_context()
+
+    def say(self, role, text):
+        self.create(llm.ChatMessage(role=role, content=text))
+
+def contents(messages):
+    return [msg.content.split(":")[0] if msg.role == "system" else msg.content for msg in messages]
+
+def test_compaction_keeps_the_local_copy_in_server_order():
+    facts = ["dream job: designer"]
+    session = SimulatedSession()
+    window = ConversationWindow(session, "room", facts=lambda: facts[0], token_budget=10, keep_recent=2)
+    window.refresh_pinned()
+    for turn in range(6):
+        session.say("user", f"question {turn}")
+        session.say("assistant", f"answer {turn}")
+
+    assert window.compact(prompt_tokens=40) > 0
+    facts[0] = "dream job: architect"
+    window.compact(prompt_tokens=40)
+
+    assert [msg.id for msg in session.chat_ctx_copy().messages] == [msg.id for msg in session.server]
+    order = contents(session.server)
+    assert order[0] == "Known facts about this learner and session"
+    assert order[1] == "Summary of the earlier part of this coaching session"
+    assert order[-2:] == ["question 5", "answer 5"]
+    assert "architect" in session.server[0].content
+    assert len(order) == 4
@@ -0,0 +1,91 @@
+"""
+Tests for the pooled SQLite connections of DatabaseDriver.
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from db_driver import DatabaseDriver
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "pool.db")
+
+def test_database_uses_wal_journal(db_path):
+    driver = DatabaseDriver(db_path, pool_size=2)
+    with driver._connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    driver.close()
+
+def test_pool_never_opens_more_than_pool_size_connections(db_path):
+    driver = DatabaseDriver(db_path, pool_size=2, timeout=5)
+    in_use = []
+    peak = []
+    lock = threading.Lock()
+    start = threading.Barrier(8)
+
+    def borrow():
+        start.wait()
+        for _ in range(20):
+            with driver._connection() as conn:
+                with lock:
+                    in_use.append(conn)
+                    peak.append(len(in_use))
+                conn.execute("SELECT 1").fetchone()
+                # Hold the connection long enough for borrowers to overlap
+                time.sleep(0.001)
+                with lock:
+                    in_use.remove(conn)
+
+    threads = [threading.Thread(target=borrow) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Connections are opened lazily, so fewer may exist if borrows never overlapped
+    assert len(driver._all_connections) <= 2
+    assert max(peak) <= 2
+    driver.close()
+
+def test_exhausted_pool_times_out(db_path):
+    driver = DatabaseDriver(db_path, pool_size=1, timeout=0.05)
+    with driver._connection():
+        with pytest.raises(sqlite3.OperationalError):
+            with driver._connection():
+                pass
+    driver.close()
+
+def test_open_transaction_is_rolled_back_on_release(db_path):
+    driver = DatabaseDriver(db_path, pool_size=1)
+    with driver._connection() as conn:
+        conn.execute("BEGIN")
+        conn.execute("INSERT INTO career_profiles (id) VALUES ('uncommitted')")
+    with driver._connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM career_profiles").fetchone()[0] == 0
+    driver.close()
+
+def test_closed_driver_rejects_use(db_path):
+    driver = DatabaseDriver(db_path, pool_size=1)
+    driver.close()
+    driver.close()
+    with pytest.raises(sqlite3.OperationalError):
+        with driver._connection():
+            pass
+
+def test_connection_released_after_close_is_closed(db_path):
+    driver = DatabaseDriver(db_path, pool_size=1)
+    with driver._connection() as conn:
+        driver.close()
+    assert driver._pool.empty()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+def test_unpooled_driver_round_trips_profiles(db_path):
+    driver = DatabaseDriver(db_path, pool_size=0)
+    assert driver.create_career_profile("ada", "Engineer", "Python", "BSc") is not None
+    assert driver.get_profile_by_id("ada").dream_job == "Engineer"
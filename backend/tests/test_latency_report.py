@@ -0,0 +1,27 @@
+"""
+Tests for the latency event report.
+"""
+
+import json
+
+from latency_report import load_conversation_totals, load_samples
+
+def test_report_reads_latency_context_and_turn_events(tmp_path):
+    path = tmp_path / "events.jsonl"
+    events = [
+        {"event": "latency", "session_id": "a", "stage": "speech_to_response", "ms": 420.0},
+        {"event": "context", "session_id": "a", "turn": 1, "prompt_tokens": 900},
+        {"event": "context", "session_id": "a", "turn": 2, "prompt_tokens": 1100},
+        {"event": "speech_turns", "session_id": "a", "fragments": 3, "turns": 2, "merged": 1, "cancelled": 0},
+        {"event": "speech_turns", "session_id": "b", "fragments": 2, "turns": 1, "merged": 1, "cancelled": 1},
+    ]
+    path.write_text("\n".join(json.dumps(event) for event in events) + "\nnot json\n", encoding="utf-8")
+
+    samples, sessions = load_samples([str(path)])
+    assert samples == {"speech_to_response": [420.0]}
+    assert sessions == {"a"}
+
+    totals = load_conversation_totals([str(path)])
+    assert totals["prompt_tokens"]["turns"] == 2
+    assert totals["prompt_tokens"]["max"] == 1100
+    assert totals["speech_turns"] == {"fragments": 5, "turns": 3, "merged": 2, "cancelled": 1}
@@ -0,0 +1,58 @@
+"""
+Tests for retries and call metrics of the shared LiveKit client.
+"""
+
+import asyncio
+
+import pytest
+
+import livekit_client
+from livekit_client import LiveKitClient
+from metrics import Histogram
+
+def started_client(**kwargs):
+    client = LiveKitClient(url="http://livekit.invalid", api_key="key", api_secret="secret", **kwargs)
+    client._started = True
+    client._room = object()
+    client._semaphore = asyncio.Semaphore(1)
+    return client
+
+def test_attempt_latency_excludes_retry_backoff(monkeypatch):
+    latency = Histogram("test_livekit_call_seconds", "test", ("call",), registry=None)
+    monkeypatch.setattr(livekit_client, "CALL_LATENCY", latency)
+    monkeypatch.setattr(livekit_client.random, "uniform", lambda low, high: 1.0)
+    client = started_client(retries=1, backoff_base=0.3)
+    attempts = []
+
+    async def flaky(room):
+        attempts.append(room)
+        if len(attempts) == 1:
+            raise asyncio.TimeoutError()
+        return "ok"
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await client._call_with_retry("list_rooms", flaky)
+        return result, loop.time() - started
+
+    result, elapsed = asyncio.run(run())
+    assert result == "ok"
+    assert elapsed >= 0.3
+    lines = dict(line.rsplit(" ", 1) for line in latency.render())
+    assert lines['test_livekit_call_seconds_count{call="list_rooms"}'] == "2"
+    assert float(lines['test_livekit_call_seconds_sum{call="list_rooms"}']) < 0.1
+    assert client.stats()["retries"] == 1
+
+def test_non_retryable_errors_are_raised_immediately():
+    client = started_client(retries=3, backoff_base=0.01)
+    attempts = []
+
+    async def broken(room):
+        attempts.append(room)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(client._call_with_retry("create_room", broken))
+    assert len(attempts) == 1
+    assert client.stats()["errors"] == 1
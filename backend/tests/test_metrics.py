@@ -0,0 +1,60 @@
+"""
+Tests for the Prometheus metrics: per-thread shards and multi-process sharing.
+"""
+
+import gc
+import os
+import threading
+import time
+
+from metrics import CallbackMetric, Counter, Histogram, MetricsRegistry
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    gc.collect()
+
+def test_exited_threads_fold_into_the_base_value():
+    counter = Counter("requests_total", "Requests", ("route",), registry=None)
+    histogram = Histogram("latency_seconds", "Latency", buckets=(1.0,), registry=None)
+
+    def work():
+        counter.inc("/a")
+        histogram.observe(0.5)
+
+    run_threads(work, 40)
+    counter.inc("/a")
+
+    assert len(counter._shards) == 1
+    assert len(histogram._shards) == 0
+    assert counter.value("/a") == 41
+    assert 'latency_seconds_count 40' in histogram.render()
+
+def test_scrape_merges_every_process(tmp_path):
+    # Two registries on one directory stand in for two worker processes
+    first, second = MetricsRegistry(), MetricsRegistry()
+    first_count = Counter("tokens_total", "Tokens", registry=first)
+    second_count = Counter("tokens_total", "Tokens", registry=second)
+    CallbackMetric("rooms_in_use", "Rooms", lambda: 3, aggregate="max", registry=first)
+    CallbackMetric("rooms_in_use", "Rooms", lambda: 5, aggregate="max", registry=second)
+    first_count.inc(amount=2)
+    second_count.inc(amount=7)
+
+    first._share_dir = second._share_dir = str(tmp_path)
+    first._share_path = str(tmp_path / "metrics-1.json")
+    second._share_path = str(tmp_path / "metrics-2.json")
+    second._write_shared(second._collect())
+
+    rendered = first.render()
+    assert "tokens_total 9" in rendered
+    assert "rooms_in_use 5" in rendered
+
+    # An exited worker keeps its counts but no longer reports gauges
+    stale = time.time() - 3600
+    os.utime(second._share_path, (stale, stale))
+    rendered = first.render()
+    assert "tokens_total 9" in rendered
+    assert "rooms_in_use 3" in rendered
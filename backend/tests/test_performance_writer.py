@@ -0,0 +1,73 @@
+"""
+Tests for the write-behind performance history writer.
+"""
+
+import threading
+
+import pytest
+
+from db_driver import DatabaseDriver, PerformanceHistoryWriter
+
+@pytest.fixture
+def driver(tmp_path):
+    driver = DatabaseDriver(str(tmp_path / "history.db"), pool_size=2)
+    yield driver
+    driver.close()
+
+def test_entries_are_written_in_batches(driver):
+    writer = PerformanceHistoryWriter(driver, batch_size=10, flush_interval=60)
+    for i in range(25):
+        assert writer.record({"session_id": "s", "scenario_type": "interview", "overall_score": i})
+    assert writer.flush(timeout=5)
+    assert writer.stats()["written"] == 25
+    assert len(driver.get_performance_history("s", limit=100)) == 25
+    writer.close()
+
+def test_partial_batch_is_written_after_the_flush_interval(driver):
+    writer = PerformanceHistoryWriter(driver, batch_size=100, flush_interval=0.05)
+    writer.record({"session_id": "late", "overall_score": 1})
+    for _ in range(100):
+        if writer.stats()["written"]:
+            break
+        threading.Event().wait(0.02)
+    assert writer.stats()["written"] == 1
+    writer.close()
+
+def test_non_serializable_scores_are_stored_as_text(driver):
+    writer = PerformanceHistoryWriter(driver, batch_size=1, flush_interval=60)
+    writer.record({"session_id": "odd", "skill_scores": {"clarity": {1, 2}}})
+    assert writer.flush(timeout=5)
+    history = driver.get_performance_history("odd")
+    assert history[0]["skill_scores"] == {"clarity": "{1, 2}"}
+    writer.close()
+
+def test_unexpected_error_drops_the_batch_but_keeps_the_writer_running(driver, monkeypatch):
+    writer = PerformanceHistoryWriter(driver, batch_size=1, flush_interval=60)
+    real_record = driver.record_performance_entries
+
+    def fail_once(entries):
+        monkeypatch.setattr(driver, "record_performance_entries", real_record)
+        raise TypeError("not serializable")
+
+    monkeypatch.setattr(driver, "record_performance_entries", fail_once)
+    writer.record({"session_id": "bad"})
+    assert writer.flush(timeout=5)
+    writer.record({"session_id": "good"})
+    assert writer.flush(timeout=5)
+
+    assert writer.stats()["failed"] == 1
+    assert writer.stats()["written"] == 1
+    assert writer._thread.is_alive()
+    writer.close()
+
+def test_flush_returns_when_the_writer_thread_is_gone(driver):
+    writer = PerformanceHistoryWriter(driver, batch_size=1, flush_interval=60)
+    writer._queue.put(writer._STOP)
+    writer._thread.join(5)
+    assert writer.flush(timeout=None) is False
+
+def test_record_drops_entries_once_closed(driver):
+    writer = PerformanceHistoryWriter(driver, batch_size=1, flush_interval=60, max_queue=1)
+    writer.close()
+    assert writer.record({"session_id": "late"}) is False
+    assert writer.stats()["dropped"] == 1
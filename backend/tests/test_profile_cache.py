@@ -0,0 +1,114 @@
+"""
+Tests for the read-through profile cache.
+"""
+
+import time
+
+import db_driver
+from db_driver import CareerProfile, DatabaseDriver, ProfileCache
+
+def make_profile(id):
+    return CareerProfile(id=id, dream_job="Engineer", current_skills="Python", education="BSc")
+
+def test_hit_miss_and_lru_eviction():
+    cache = ProfileCache(max_entries=2, ttl=60, negative_ttl=60)
+    cache.put("a", make_profile("a"))
+    cache.put("b", make_profile("b"))
+    assert cache.get("a").id == "a"
+    cache.put("c", make_profile("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("c").id == "c"
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+def test_entries_expire(monkeypatch):
+    cache = ProfileCache(max_entries=4, ttl=10, negative_ttl=1)
+    now = time.monotonic()
+    monkeypatch.setattr(db_driver.time, "monotonic", lambda: now)
+    cache.put("a", make_profile("a"))
+    cache.put("missing", None)
+    assert cache.get("missing") is ProfileCache.NOT_FOUND
+
+    monkeypatch.setattr(db_driver.time, "monotonic", lambda: now + 5)
+    assert cache.get("missing") is None
+    assert cache.get("a").id == "a"
+    assert cache.stats()["expirations"] == 1
+
+def test_stale_not_found_does_not_hide_a_concurrent_create():
+    cache = ProfileCache(max_entries=4, ttl=60, negative_ttl=60)
+    since = cache.generation()
+    # A create commits and caches the profile while the lookup is reading
+    cache.put("new", make_profile("new"))
+    cache.put("new", None, since=since)
+    assert cache.get("new").id == "new"
+
+def test_stale_not_found_is_dropped_after_invalidation():
+    cache = ProfileCache(max_entries=4, ttl=60, negative_ttl=60)
+    since = cache.generation()
+    cache.invalidate("imported")
+    cache.put("imported", None, since=since)
+    assert cache.get("imported") is None
+
+def test_stale_profile_read_does_not_replace_a_newer_write():
+    cache = ProfileCache(max_entries=4, ttl=60, negative_ttl=60)
+    since = cache.generation()
+    # An upsert caches the new profile while the lookup holds the old row
+    updated = make_profile("ada")
+    updated.dream_job = "Architect"
+    cache.put("ada", updated)
+    cache.put("ada", make_profile("ada"), since=since)
+    assert cache.get("ada").dream_job == "Architect"
+
+def test_stale_profile_read_is_dropped_after_invalidation():
+    cache = ProfileCache(max_entries=4, ttl=60, negative_ttl=60)
+    since = cache.generation()
+    cache.invalidate("ada")
+    cache.put("ada", make_profile("ada"), since=since)
+    assert cache.get("ada") is None
+
+def test_not_found_is_cached_without_concurrent_writes():
+    cache = ProfileCache(max_entries=1, ttl=60, negative_ttl=60)
+    cache.put("other", make_profile("other"))
+    since = cache.generation()
+    cache.put("unknown", None, since=since)
+    assert cache.get("unknown") is ProfileCache.NOT_FOUND
+
+def test_write_history_is_bounded_and_stays_conservative():
+    cache = ProfileCache(max_entries=2, ttl=60, negative_ttl=60)
+    since = cache.generation()
+    for i in range(5):
+        cache.invalidate(f"id-{i}")
+    assert len(cache._written) == 2
+    # id-0 fell out of the write history, so it must still count as written
+    cache.put("id-0", None, since=since)
+    assert cache.get("id-0") is None
+
+def test_driver_does_not_cache_not_found_over_a_racing_create(tmp_path, monkeypatch):
+    driver = DatabaseDriver(str(tmp_path / "cache.db"), pool_size=1,
+                            profile_cache=ProfileCache(max_entries=8, ttl=60, negative_ttl=60))
+    real_connection = driver._connection
+    raced = []
+
+    def connection_then_create():
+        # Let another caller create the profile between the read and the cache store
+        if not raced:
+            raced.append(True)
+            original = real_connection()
+            class Racing:
+                def __enter__(self):
+                    return original.__enter__()
+                def __exit__(self, *exc):
+                    result = original.__exit__(*exc)
+                    monkeypatch.setattr(driver, "_connection", real_connection)
+                    driver.create_career_profile("racer", "Designer", "Figma", "BA")
+                    return result
+            return Racing()
+        return real_connection()
+
+    monkeypatch.setattr(driver, "_connection", connection_then_create)
+    assert driver.get_profile_by_id("racer") is None
+    assert driver.get_profile_by_id("racer").dream_job == "Designer"
+    driver.close()
@@ -0,0 +1,80 @@
+"""
+Tests for the bulk profile import command.
+"""
+
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+import profile_io
+from db_driver import DatabaseDriver
+
+JSONL = "\n".join([
+    '{"id": "a", "dream_job": "Engineer"}',
+    '{"id": "b"}',
+    'not json',
+    '[1, 2]',
+    '{"id": "c", "dream_job": {"nested": true}}',
+    '{"dream_job": "No id"}',
+    '{"id": "d", "education": "BSc"}',
+]) + "\n"
+
+@pytest.fixture
+def driver(tmp_path):
+    driver = DatabaseDriver(str(tmp_path / "import.db"), pool_size=1)
+    yield driver
+    driver.close()
+
+def run_import(driver, monkeypatch, text, *flags):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(text))
+    monkeypatch.setattr(sys, "argv", ["profile_io.py", "import", "-", "--batch-size", "1", *flags])
+    # main() closes its driver; keep the fixture's open for the assertions
+    monkeypatch.setattr(profile_io, "DatabaseDriver", lambda **kwargs: driver)
+    monkeypatch.setattr(driver, "close", lambda: None)
+    profile_io.main()
+
+def test_invalid_lines_are_skipped_with_line_numbers(driver, monkeypatch, capsys):
+    run_import(driver, monkeypatch, JSONL)
+    err = capsys.readouterr().err
+    assert "Skipping line 3: invalid JSON" in err
+    assert "Skipping line 4: expected a JSON object, got list" in err
+    assert "Skipping line 5: dream_job must be text" in err
+    assert "Skipping line 6: missing id" in err
+    assert "Written: 3, skipped: 0, rejected: 4" in err
+    assert [profile.id for profile in driver.iter_profiles()] == ["a", "b", "d"]
+
+def test_strict_import_stops_cleanly_and_reports_committed_batches(driver, monkeypatch, capsys):
+    with pytest.raises(SystemExit) as exited:
+        run_import(driver, monkeypatch, JSONL, "--strict")
+    assert exited.value.code == 1
+    err = capsys.readouterr().err
+    assert "Import stopped: invalid row at line 3: invalid JSON" in err
+    assert "Committed 2 batch(es): 2 profiles up to line 2" in err
+    assert [profile.id for profile in driver.iter_profiles()] == ["a", "b"]
+
+def test_database_error_reports_committed_batches(driver, monkeypatch, capsys):
+    driver.create_career_profile("b", "", "", "")
+    with pytest.raises(SystemExit):
+        run_import(driver, monkeypatch, '{"id": "a"}\n{"id": "b"}\n', "--on-conflict", "fail")
+    err = capsys.readouterr().err
+    assert "Import stopped in the batch ending at line 2: UNIQUE constraint failed" in err
+    assert "Committed 1 batch(es): 1 profiles up to line 1" in err
+
+def test_csv_rows_report_their_file_line():
+    progress = {"line": 0, "rejected": 0}
+    handle = io.StringIO('id,dream_job\nq,"multi\nline"\n,missing\nr,ok\n')
+    profiles = list(profile_io.read_profiles(handle, "csv", progress))
+    assert [profile.id for profile in profiles] == ["q", "r"]
+    assert progress == {"line": 5, "rejected": 1}
+
+def test_cli_only_opens_the_given_database(tmp_path):
+    default_db = tmp_path / "default.db"
+    other_db = tmp_path / "other.db"
+    env = {**os.environ, "LEVRA_DB_PATH": str(default_db)}
+    subprocess.run([sys.executable, "profile_io.py", "--db", str(other_db), "export", "-"],
+                   cwd=os.path.dirname(profile_io.__file__), env=env, check=True, capture_output=True)
+    assert other_db.exists()
+    assert not default_db.exists()
@@ -0,0 +1,90 @@
+"""
+Tests for profile searches and the schema migrations behind them.
+"""
+
+import sqlite3
+
+import pytest
+
+from db_driver import SCHEMA_MIGRATIONS, DatabaseDriver
+
+LATEST_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+PROFILES = [
+    ("ada", "Data Scientist", "python statistics", "MSc mathematics"),
+    ("bob", "data engineer", "sql python", "BSc computing"),
+    ("cy", "Designer", "figma", "BA design, python course"),
+    ("dee", "data_analyst", "excel", "diploma"),
+]
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "search.db")
+
+@pytest.fixture
+def driver(db_path):
+    driver = DatabaseDriver(db_path, pool_size=1)
+    for profile in PROFILES:
+        driver.create_career_profile(*profile)
+    yield driver
+    driver.close()
+
+def ids(profiles):
+    return [profile.id for profile in profiles]
+
+def test_dream_job_search_is_case_insensitive(driver):
+    assert ids(driver.search_profiles_by_dream_job("data scientist")) == ["ada"]
+
+def test_dream_job_prefix_search_escapes_wildcards(driver):
+    assert ids(driver.search_profiles_by_dream_job("DATA", prefix=True)) == ["ada", "bob", "dee"]
+    assert ids(driver.search_profiles_by_dream_job("data_", prefix=True)) == ["dee"]
+
+def test_skills_search_ranks_skills_above_education(driver):
+    assert driver.full_text_search_enabled
+    assert ids(driver.search_profiles_by_skills("python"))[-1] == "cy"
+    assert ids(driver.search_profiles_by_skills("python sql")) == ["bob"]
+    assert set(ids(driver.search_profiles_by_skills("figma excel", match_all=False))) == {"cy", "dee"}
+
+def test_skills_search_treats_input_as_literal_terms(driver):
+    assert driver.search_profiles_by_skills('"') == []
+    assert driver.search_profiles_by_skills('python" OR "figma') == []
+    assert ids(driver.search_profiles_by_skills("NEAR(python")) == []
+
+def test_skills_search_survives_vacuum(driver):
+    with driver._connection() as conn, conn:
+        conn.execute("DELETE FROM career_profiles WHERE id IN ('ada', 'bob')")
+    with driver._connection() as conn:
+        conn.execute("VACUUM")
+    driver.create_career_profile("eve", "teacher", "public speaking", "PGCE")
+
+    assert ids(driver.search_profiles_by_skills("figma")) == ["cy"]
+    assert ids(driver.search_profiles_by_skills("speaking")) == ["eve"]
+    assert driver.search_profiles_by_skills("statistics") == []
+
+def test_migrates_a_version_0_database(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE career_profiles (id TEXT PRIMARY KEY, dream_job TEXT, "
+                 "current_skills TEXT, education TEXT)")
+    conn.executemany("INSERT INTO career_profiles VALUES (?, ?, ?, ?)", PROFILES)
+    conn.commit()
+    conn.close()
+
+    driver = DatabaseDriver(db_path, pool_size=1)
+    with driver._connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == LATEST_VERSION
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert {"idx_career_profiles_dream_job", "career_profiles_fts", "performance_history"} <= tables
+    assert ids(driver.search_profiles_by_skills("figma")) == ["cy"]
+    assert ids(driver.search_profiles_by_dream_job("designer")) == ["cy"]
+    assert driver.get_profile_by_id("dee").education == "diploma"
+    driver.close()
+
+def test_migrations_are_idempotent(driver, db_path):
+    with driver._connection() as conn:
+        driver._migrate(conn)
+    again = DatabaseDriver(db_path, pool_size=1)
+    with again._connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == LATEST_VERSION
+        assert conn.execute("SELECT COUNT(*) FROM career_profiles").fetchone()[0] == len(PROFILES)
+    assert ids(again.search_profiles_by_skills("figma")) == ["cy"]
+    again.close()
@@ -0,0 +1,70 @@
+"""
+Tests for room name allocation in the token server.
+"""
+
+import asyncio
+import itertools
+import re
+import types
+
+import pytest
+
+import server
+from server import RoomNameCache, new_room_name
+
+@pytest.fixture
+def listings(monkeypatch):
+    """Room lists returned by LiveKit, with a record of each listing"""
+    calls = []
+    rooms = {"room-taken"}
+
+    async def get_rooms():
+        calls.append(len(calls))
+        await asyncio.sleep(0.01)
+        return list(rooms)
+
+    monkeypatch.setattr(server, "get_rooms", get_rooms)
+    return calls
+
+def test_room_names_are_unique_time_ordered_and_shareable(monkeypatch):
+    clock = iter([1000.0, 1000.0, 1001.5])
+    monkeypatch.setattr(server, "time", types.SimpleNamespace(time=lambda: next(clock)))
+    names = [new_room_name() for _ in range(3)]
+
+    assert len(set(names)) == 3
+    assert all(re.fullmatch(r"room-[0-9a-f]+-[0-9a-f]{18}", name) for name in names)
+    assert all(server.SHARED_ROOM_PATTERN.fullmatch(name) for name in names)
+    assert names[2] > names[0]
+
+def test_concurrent_lookups_share_one_listing(listings):
+    cache = RoomNameCache(ttl=60)
+
+    async def scenario():
+        return await asyncio.gather(cache.contains("room-taken"), cache.contains("room-free"),
+                                    cache.contains("room-taken"))
+
+    assert asyncio.run(scenario()) == [True, False, True]
+    assert len(listings) == 1
+
+def test_listing_is_reused_until_the_ttl_expires(listings):
+    cache = RoomNameCache(ttl=0.1)
+
+    async def scenario():
+        await cache.contains("room-a")
+        cache.add("room-a")
+        assert await cache.contains("room-a")
+        await asyncio.sleep(0.15)
+        assert not await cache.contains("room-a")
+
+    asyncio.run(scenario())
+    assert len(listings) == 2
+
+def test_listed_strategy_skips_taken_names(listings, monkeypatch):
+    monkeypatch.setattr(server, "ROOM_NAME_STRATEGY", "listed")
+    monkeypatch.setattr(server, "ROOM_NAMES", RoomNameCache(ttl=60))
+    candidates = itertools.chain(["room-taken", "room-new"], (f"room-{i}" for i in itertools.count()))
+    monkeypatch.setattr(server, "new_room_name", lambda: next(candidates))
+
+    names = asyncio.run(server.generate_room_names(3))
+    assert names == ["room-new", "room-0", "room-1"]
+    assert len(listings) == 1
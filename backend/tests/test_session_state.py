@@ -0,0 +1,85 @@
+"""
+Tests for the per-session conversation state store.
+"""
+
+import time
+
+import pytest
+
+import session_state
+from session_state import SessionStateStore
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_state.time, "monotonic", lambda: now[0])
+    return now
+
+def new_store(**kwargs):
+    return SessionStateStore(lambda: {"history": []}, **kwargs)
+
+def test_sessions_are_isolated_and_bound_to_the_context():
+    store = new_store()
+    first = store.create("room-a")
+    first["history"].append("a")
+    assert store.current() is first
+    assert store.create("room-b", bind=False) == {"history": []}
+    store.release("room-a")
+    assert store.current_session_id() is None
+    assert store.stats()["released"] == 1
+
+def test_quiet_active_session_is_not_evicted(clock, capsys):
+    store = new_store(idle_timeout=60)
+    store.create("live", bind=False)["history"].append("turn")
+    clock[0] += 3600
+    store.sweep()
+    store.sweep()
+
+    assert store.create("live", bind=False)["history"] == ["turn"]
+    assert store.stats()["evicted_idle"] == 0
+    out = capsys.readouterr().out
+    assert out.count("WARNING: session live idle for 3600s but still active") == 1
+
+def test_idle_inactive_and_released_sessions_are_evicted(clock):
+    store = new_store(idle_timeout=60)
+    store.create("script", bind=False, active=False)
+    store.create("job", bind=False)
+    store.release("job")
+    clock[0] += 120
+    store.sweep()
+    assert store.stats()["live_sessions"] == 0
+    assert store.stats()["evicted_idle"] == 1
+
+def test_session_cap_only_evicts_inactive_sessions(clock):
+    store = new_store(max_sessions=2)
+    store.create("job-1", bind=False)
+    store.create("idle", bind=False, active=False)
+    store.create("job-2", bind=False)
+    store.create("job-3", bind=False)
+
+    stats = store.stats()
+    assert stats["evicted_capacity"] == 1
+    assert stats["active_sessions"] == 3
+    assert store.create("job-1", bind=False) is not None
+
+def test_memory_cap_spares_active_sessions(clock):
+    store = SessionStateStore(lambda: {"blob": "x" * 10_000}, max_bytes=15_000)
+    store.create("old-job", bind=False)
+    store.create("idle", bind=False, active=False)
+    store.create("new-job", bind=False)
+    stats = store.stats()
+    assert stats["live_sessions"] == 2
+    assert stats["active_sessions"] == 2
+
+def test_start_reporting_prints_stats_periodically(capsys):
+    store = new_store()
+    store.create("room", bind=False)
+    store.start_reporting(interval=0.01)
+    store.start_reporting(interval=0.01)
+    deadline = time.time() + 2
+    try:
+        while "Session state:" not in capsys.readouterr().out:
+            assert time.time() < deadline
+            time.sleep(0.02)
+    finally:
+        store.stop_reporting()
@@ -0,0 +1,71 @@
+"""
+Tests for the incremental per-skill trend aggregates.
+"""
+
+import contextvars
+import random
+
+import pytest
+
+import prompts
+from prompts import SkillAggregate
+
+def rescanned_trend(scores):
+    """The trend computed from the full score history"""
+    if len(scores) < 2:
+        return "insufficient_data"
+    window = prompts.TREND_RECENT_WINDOW
+    recent = scores[-window:]
+    earlier = scores[:-window] or scores[:1]
+    recent_avg = sum(recent) / len(recent)
+    earlier_avg = sum(earlier) / len(earlier)
+    if recent_avg > earlier_avg + prompts.TREND_THRESHOLD:
+        return "improving"
+    if recent_avg < earlier_avg - prompts.TREND_THRESHOLD:
+        return "declining"
+    return "stable"
+
+def test_aggregate_matches_the_full_history():
+    rng = random.Random(7)
+    aggregate = SkillAggregate()
+    scores = []
+    for _ in range(200):
+        score = rng.randint(1, 10)
+        aggregate.add(score)
+        scores.append(score)
+        assert aggregate.trend() == rescanned_trend(scores)
+
+    summary = aggregate.summary()
+    window = prompts.TREND_RECENT_WINDOW
+    assert summary["count"] == len(scores)
+    assert summary["average"] == pytest.approx(sum(scores) / len(scores))
+    assert summary["recent_average"] == pytest.approx(sum(scores[-window:]) / window)
+
+def test_ewma_weighs_recent_scores():
+    aggregate = SkillAggregate()
+    for score in (2, 2, 9):
+        aggregate.add(score)
+    alpha = prompts.TREND_EWMA_ALPHA
+    assert aggregate.ewma == pytest.approx(alpha * 9 + (1 - alpha) * 2)
+
+@pytest.fixture
+def session(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(prompts.PERFORMANCE_WRITER, "record", recorded.append)
+    context = contextvars.copy_context()
+    context.run(prompts.SESSIONS.create, "room-trends")
+    yield context
+    prompts.SESSIONS.release("room-trends")
+
+def test_track_performance_updates_every_skill(session):
+    def scenario():
+        for communication, leadership in ((4, 8), (5, 8), (8, 7), (9, 6)):
+            prompts.track_performance("team_leadership", {"communication": communication,
+                                                          "leadership": leadership})
+        return prompts.get_skill_trends("communication"), prompts.get_all_skill_trends()
+
+    trend, trends = session.run(scenario)
+    assert trend == "improving"
+    assert trends["leadership"]["trend"] == "declining"
+    assert trends["communication"]["count"] == 4
+    assert session.run(prompts.get_skill_trends, "empathy") == "insufficient_data"
@@ -0,0 +1,69 @@
+"""
+Tests for the access token cache used by the token server.
+"""
+
+import types
+
+import pytest
+
+import token_cache
+from token_cache import TokenCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(token_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+def minter():
+    minted = []
+
+    def mint():
+        minted.append(f"jwt-{len(minted)}")
+        return minted[-1]
+    return mint, minted
+
+def test_token_is_reused_until_the_refresh_margin(clock):
+    cache = TokenCache(max_entries=8, ttl=3600, refresh_margin=600)
+    mint, minted = minter()
+
+    assert cache.get_or_mint("ada", mint) == "jwt-0"
+    clock[0] += 2999
+    assert cache.get_or_mint("ada", mint) == "jwt-0"
+    # Within the margin of expiry a fresh token replaces the cached one
+    clock[0] += 1
+    assert cache.get_or_mint("ada", mint) == "jwt-1"
+    assert minted == ["jwt-0", "jwt-1"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+def test_refresh_margin_is_capped_at_half_the_ttl(clock):
+    cache = TokenCache(max_entries=8, ttl=60, refresh_margin=600)
+    mint, _ = minter()
+    assert cache.refresh_margin == 30
+
+    cache.get_or_mint("ada", mint)
+    clock[0] += 29
+    assert cache.get_or_mint("ada", mint) == "jwt-0"
+
+def test_cache_is_bounded_and_keyed_by_grants(clock):
+    cache = TokenCache(max_entries=2, ttl=3600, refresh_margin=600)
+    mint, _ = minter()
+    cache.get_or_mint(("ada", "room-1"), mint)
+    cache.get_or_mint(("ada", "room-2"), mint)
+    cache.get_or_mint(("ada", "room-1"), mint)
+    cache.get_or_mint(("grace", "room-1"), mint)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    # room-2 was the least recently used token
+    assert cache.get_or_mint(("ada", "room-2"), mint) == "jwt-3"
+
+def test_disabled_cache_always_mints(clock):
+    cache = TokenCache(max_entries=0, ttl=3600, refresh_margin=600)
+    mint, minted = minter()
+    cache.get_or_mint("ada", mint)
+    cache.get_or_mint("ada", mint)
+    assert len(minted) == 2
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,24 @@
+"""
+Tests for the read-only profile viewer.
+"""
+
+import sqlite3
+
+import pytest
+
+from view_table_data import open_read_only
+
+@pytest.mark.parametrize("name", ["100%.db", "a%20b.db", "what?.db", "hash#1.db", "with space.db"])
+def test_read_only_open_handles_reserved_characters(tmp_path, name):
+    path = tmp_path / name
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE marker (name TEXT)")
+        conn.execute("INSERT INTO marker VALUES (?)", (name,))
+    conn.close()
+
+    conn = open_read_only(str(path))
+    assert conn.execute("SELECT name FROM marker").fetchone()[0] == name
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("INSERT INTO marker VALUES ('write')")
+    conn.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [name]
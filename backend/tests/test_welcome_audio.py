@@ -0,0 +1,64 @@
+"""
+Tests for the synthesized welcome audio cache.
+"""
+
+import asyncio
+import os
+import types
+
+import pytest
+
+from welcome_audio import WelcomeAudio, WelcomeAudioCache
+
+AUDIO = WelcomeAudio(pcm=bytes(range(256)) * 4, sample_rate=24000, num_channels=1)
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / "welcome")
+
+def test_key_changes_with_voice_model_and_text(directory):
+    cache = WelcomeAudioCache(directory, tts_model="tts-1")
+    key = cache.key("shimmer", "Hello")
+
+    assert key == WelcomeAudioCache(directory, tts_model="tts-1").key("shimmer", "Hello")
+    assert key.startswith("shimmer-")
+    assert cache.key("alloy", "Hello") != key
+    assert cache.key("shimmer", "Hello!") != key
+    assert WelcomeAudioCache(directory, tts_model="tts-1-hd").key("shimmer", "Hello") != key
+
+def test_audio_round_trips_through_the_file(directory):
+    WelcomeAudioCache(directory).put("shimmer", "Hello", AUDIO)
+    # A fresh cache, as in another worker process, reads the WAV file
+    loaded = WelcomeAudioCache(directory).get("shimmer", "Hello")
+
+    assert loaded == AUDIO
+    assert loaded.duration == pytest.approx(1024 / 2 / 24000)
+    assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+def test_missing_or_damaged_files_are_cache_misses(directory):
+    cache = WelcomeAudioCache(directory)
+    assert cache.get("shimmer", "Hello") is None
+
+    os.makedirs(directory)
+    with open(os.path.join(directory, f"{cache.key('shimmer', 'Hello')}.wav"), "wb") as f:
+        f.write(b"not a wav file")
+    assert cache.get("shimmer", "Hello") is None
+
+class FakeTTS:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def synthesize(self, text):
+        for chunk in self.chunks:
+            yield types.SimpleNamespace(frame=types.SimpleNamespace(data=chunk, sample_rate=24000, num_channels=1))
+
+def test_synthesized_greeting_is_cached(directory):
+    cache = WelcomeAudioCache(directory)
+    audio = asyncio.run(cache.synthesize(FakeTTS([b"\x01\x00" * 4, b"\x02\x00" * 4]), "shimmer", "Hello"))
+
+    assert audio.pcm == b"\x01\x00" * 4 + b"\x02\x00" * 4
+    assert WelcomeAudioCache(directory).get("shimmer", "Hello") == audio
+
+def test_empty_synthesis_is_an_error(directory):
+    with pytest.raises(RuntimeError):
+        asyncio.run(WelcomeAudioCache(directory).synthesize(FakeTTS([]), "shimmer", "Hello"))
@@ -0,0 +1,30 @@
+"""
+Tests for the load agent workers report to LiveKit.
+"""
+
+import math
+import types
+
+import worker_load
+from worker_load import WorkerLoad, load_threshold
+
+def test_development_commands_never_mark_the_worker_full():
+    assert load_threshold(["agent.py", "dev"]) == math.inf
+    assert load_threshold(["agent.py", "connect", "--room", "room-1"]) == math.inf
+
+def test_production_uses_the_configured_threshold():
+    assert load_threshold(["agent.py", "start"]) == worker_load.WORKER_LOAD_THRESHOLD
+    assert load_threshold(["agent.py"]) == worker_load.WORKER_LOAD_THRESHOLD
+
+def test_session_cap_reaches_the_threshold(monkeypatch):
+    monkeypatch.setattr(worker_load.psutil, "cpu_percent", lambda interval=None: 0.0)
+    load = WorkerLoad(max_sessions=4, threshold=0.8)
+
+    assert load(types.SimpleNamespace(active_jobs=[1, 2])) == 0.4
+    assert load(types.SimpleNamespace(active_jobs=[1, 2, 3, 4])) == 1.0
+    assert load.last["sessions"] == 4
+
+def test_busy_cpu_outweighs_idle_sessions(monkeypatch):
+    monkeypatch.setattr(worker_load.psutil, "cpu_percent", lambda interval=None: 90.0)
+    load = WorkerLoad(max_sessions=4, threshold=0.8)
+    assert load(types.SimpleNamespace(active_jobs=[])) == 0.9
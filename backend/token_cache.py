@@ -0,0 +1,121 @@
+"""
+LEVRA AI Voice Agent - Access Token Cache
+
+Caches signed LiveKit access tokens so repeated requests for the same
+identity, room and grants (reconnects, page reloads) reuse an existing JWT
+instead of signing a new one every time. A cached token is handed out
+until it is within a configurable margin of its expiry, after which a
+fresh one is minted.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# TOKEN CACHE CONFIGURATION
+# ------------------------------------------------------------------------
+
+# Lifetime in seconds of issued access tokens (LiveKit's own default is 6 hours)
+DEFAULT_TOKEN_TTL = float(os.getenv("LEVRA_TOKEN_TTL", str(6 * 60 * 60)))
+
+# Seconds before expiry at which a cached token stops being reused, so
+# clients never receive a token that is about to lapse
+DEFAULT_TOKEN_REFRESH_MARGIN = float(os.getenv("LEVRA_TOKEN_REFRESH_MARGIN", "600"))
+
+# Maximum number of cached tokens (0 disables caching)
+DEFAULT_TOKEN_CACHE_SIZE = int(os.getenv("LEVRA_TOKEN_CACHE_SIZE", "10000"))
+
+class TokenCache:
+    """
+    Thread-safe, bounded LRU cache of signed tokens with expiry tracking.
+
+    Keys are any hashable description of what the token grants, typically
+    (identity, name, room, grants). Each entry remembers when its token
+    expires; entries closer to expiry than the refresh margin are treated
+    as misses and replaced.
+    """
+    def __init__(self, max_entries=DEFAULT_TOKEN_CACHE_SIZE, ttl=DEFAULT_TOKEN_TTL,
+                 refresh_margin=DEFAULT_TOKEN_REFRESH_MARGIN):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of cached tokens, 0 disables caching
+            ttl (float): Lifetime in seconds of the tokens being cached
+            refresh_margin (float): Seconds before expiry a token stops being reused
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # A margin at or beyond the TTL would make every token stale on arrival
+        self.refresh_margin = min(refresh_margin, ttl / 2)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_mint(self, key, mint):
+        """
+        Return a cached token for key, minting and caching one if needed.
+
+        Signing happens outside the lock, so concurrent misses for different
+        keys do not serialize on each other.
+
+        Args:
+            key: Hashable description of the token's identity and grants
+            mint (callable): Zero-argument function returning a new JWT
+                valid for this cache's TTL
+
+        Returns:
+            str: A JWT valid for at least the refresh margin
+        """
+        if self.max_entries <= 0:
+            with self._lock:
+                self._misses += 1
+            return mint()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry[1] - self.refresh_margin:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        # Expiry is measured from before signing, so it never overestimates
+        token = mint()
+        with self._lock:
+            self._entries[key] = (token, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return token
+
+    def clear(self):
+        """Drop every cached token"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Report cache usage.
+
+        Returns:
+            dict: Entry count, hits, misses, evictions and hit ratio
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+# Process-wide token cache used by the token server
+TOKEN_CACHE = TokenCache()
@@ -1,43 +1,172 @@
 """
 Database Inspection Utility
 
-This script provides a simple way to view all career profiles stored in the database.
+This script provides a simple way to view the career profiles stored in the database.
 It's intended as a debugging and administrative tool to verify data integrity
 and monitor application state.
 
-For production use, this functionality should be integrated into a proper
-administrative interface with authentication and more robust error handling.
+Profiles are streamed with keyset pagination over the primary key, so memory use
+stays constant regardless of table size, and the database is opened read-only so
+inspection never takes a write lock away from the running agent.
+
+Usage:
+    python view_table_data.py [--limit N] [--after ID] [--where COLUMN=VALUE ...]
+                              [--format table|csv|jsonl] [--page-size N] [--db PATH]
+
+Filters given with --where are combined with AND; a value containing % is
+matched with LIKE, anything else must match exactly.
 """
 
+import argparse
+import csv
+import json
+import os
+import pathlib
 import sqlite3
+import sys
 
 # Database configuration
-# In a more robust implementation, this would be imported from a shared config
-DATABASE_PATH = "career_assistant.db"
-
-# Establish connection to the SQLite database
-# Using a context manager would be better for automatic resource cleanup
-conn = sqlite3.connect(DATABASE_PATH)
-cursor = conn.cursor()
-
-# Query all career profile records from the database
-# In a larger application, consider pagination for performance
-cursor.execute("SELECT * FROM career_profiles")
-rows = cursor.fetchall()
-
-# Display header for better readability
-print("\n===== CAREER PROFILES IN DATABASE =====")
-print("ID | Dream Job | Skills | Education")
-print("-------------------------------------")
-
-# Print each record in a formatted way
-# For a more sophisticated application, consider using tabulate or similar library
-for row in rows:
-    print(f"ID: {row[0]}, Dream Job: {row[1]}, Skills: {row[2]}, Education: {row[3]}")
-
-# Display summary information
-print(f"\nTotal profiles: {len(rows)}")
-
-# Close database connection to release resources
-# Using a context manager (with statement) would handle this automatically
-conn.close()
\ No newline at end of file
+# Mirrors DEFAULT_DB_PATH in db_driver.py; that module is not imported here
+# because importing it opens a read-write connection pool on the database
+DATABASE_PATH = os.getenv(
+    "LEVRA_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "career_assistant.db")
+)
+
+# Columns that may be displayed and filtered on
+COLUMNS = ["id", "dream_job", "current_skills", "education"]
+
+# QUERY HELPERS
+# ------------------------------------------------------------------------
+
+def open_read_only(path):
+    """
+    Open the SQLite database in read-only mode.
+    
+    Args:
+        path (str): Path to the database file
+        
+    Returns:
+        sqlite3.Connection: Read-only connection
+    """
+    # as_uri() percent-encodes every reserved character, including "%" itself
+    uri = pathlib.Path(os.path.abspath(path)).as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True)
+
+def parse_filters(expressions):
+    """
+    Turn COLUMN=VALUE expressions into SQL conditions and parameters.
+    
+    Args:
+        expressions (list[str]): Filters from the command line
+        
+    Returns:
+        tuple: (list of SQL condition strings, list of parameters)
+        
+    Raises:
+        ValueError: If an expression is malformed or names an unknown column
+    """
+    conditions, params = [], []
+    for expression in expressions:
+        column, sep, value = expression.partition("=")
+        column = column.strip()
+        if not sep or column not in COLUMNS:
+            raise ValueError(f"Invalid filter '{expression}', expected COLUMN=VALUE with COLUMN in {', '.join(COLUMNS)}")
+        conditions.append(f"{column} LIKE ?" if "%" in value else f"{column} = ?")
+        params.append(value)
+    return conditions, params
+
+def iter_rows(conn, after, filters, limit, page_size):
+    """
+    Stream matching profile rows in ID order, one page at a time.
+    
+    Args:
+        conn (sqlite3.Connection): Read-only database connection
+        after (str): Only return rows whose ID sorts after this value
+        filters (tuple): SQL conditions and parameters from parse_filters
+        limit (int, optional): Maximum number of rows to return
+        page_size (int): Rows fetched per query
+        
+    Yields:
+        tuple: (id, dream_job, current_skills, education)
+    """
+    conditions, params = filters
+    sql = f"SELECT {', '.join(COLUMNS)} FROM career_profiles WHERE " \
+          + " AND ".join(["id > ?"] + conditions) + " ORDER BY id LIMIT ?"
+
+    remaining = limit
+    while remaining is None or remaining > 0:
+        fetch = page_size if remaining is None else min(page_size, remaining)
+        rows = conn.execute(sql, [after] + params + [fetch]).fetchall()
+        yield from rows
+        if len(rows) < fetch:
+            return
+        after = rows[-1][0]
+        if remaining is not None:
+            remaining -= len(rows)
+
+# OUTPUT WRITERS
+# ------------------------------------------------------------------------
+
+def write_table(rows):
+    """Print rows in the human-readable layout with a header and total."""
+    print("\n===== CAREER PROFILES IN DATABASE =====")
+    print("ID | Dream Job | Skills | Education")
+    print("-------------------------------------")
+
+    count = 0
+    for row in rows:
+        print(f"ID: {row[0]}, Dream Job: {row[1]}, Skills: {row[2]}, Education: {row[3]}")
+        count += 1
+
+    print(f"\nTotal profiles: {count}")
+
+def write_csv(rows):
+    """Write rows as CSV with a header line to stdout."""
+    writer = csv.writer(sys.stdout)
+    writer.writerow(COLUMNS)
+    writer.writerows(rows)
+
+def write_jsonl(rows):
+    """Write rows as one JSON object per line to stdout."""
+    for row in rows:
+        sys.stdout.write(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + "\n")
+
+WRITERS = {"table": write_table, "csv": write_csv, "jsonl": write_jsonl}
+
+# APPLICATION ENTRY POINT
+# ------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="View career profiles stored in the database")
+    parser.add_argument("--db", default=DATABASE_PATH, help="path to the SQLite database")
+    parser.add_argument("--limit", type=int, help="maximum number of profiles to show")
+    parser.add_argument("--after", default="", help="start after this profile ID")
+    parser.add_argument("--where", action="append", default=[], metavar="COLUMN=VALUE",
+                        help="filter on a column (repeatable; %% in VALUE uses LIKE)")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="table", help="output format")
+    parser.add_argument("--page-size", type=int, default=1000, help="rows fetched per query")
+    args = parser.parse_args()
+
+    try:
+        filters = parse_filters(args.where)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        conn = open_read_only(args.db)
+    except sqlite3.Error as e:
+        print(f"Could not open database '{args.db}': {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # Close database connection to release resources even if output fails
+    try:
+        WRITERS[args.format](iter_rows(conn, args.after, filters, args.limit, max(1, args.page_size)))
+    except sqlite3.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
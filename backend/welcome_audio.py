@@ -0,0 +1,192 @@
+"""
+LEVRA AI Voice Agent - Welcome Audio Cache
+
+The welcome message is the same for every session, so there is no need to
+wait for a realtime model round trip before the user hears it. The greeting
+is synthesized once per voice and text, kept in memory and as a WAV file on
+disk (shared by every worker process), and played straight into the room on
+its own audio track while the realtime model session starts in parallel.
+
+Cache keys hash the voice, TTS model and text together, so editing
+WELCOME_MESSAGE or changing the voice simply produces a new entry.
+"""
+
+from dataclasses import dataclass
+import hashlib
+import os
+import tempfile
+import threading
+import wave
+
+from livekit import rtc
+
+# WELCOME AUDIO CONFIGURATION
+# ------------------------------------------------------------------------
+
+# Play the welcome message from cached audio ("0" always asks the realtime model)
+WELCOME_AUDIO_ENABLED = os.getenv("LEVRA_WELCOME_AUDIO", "1") != "0"
+
+# Directory holding synthesized greetings as WAV files
+WELCOME_AUDIO_DIR = os.getenv("LEVRA_WELCOME_AUDIO_DIR",
+                              os.path.join(tempfile.gettempdir(), "levra_welcome_audio"))
+
+# Text-to-speech model used to synthesize the greeting
+WELCOME_TTS_MODEL = os.getenv("LEVRA_WELCOME_TTS_MODEL", "tts-1")
+
+# Length of each audio frame pushed to the room, in milliseconds
+FRAME_MS = 20
+
+@dataclass
+class WelcomeAudio:
+    """
+    Synthesized greeting as 16-bit PCM.
+    """
+    pcm: bytes
+    sample_rate: int
+    num_channels: int
+
+    @property
+    def duration(self):
+        """Length of the audio in seconds"""
+        return len(self.pcm) / (2 * self.num_channels * self.sample_rate)
+
+# WELCOME AUDIO CACHE
+# ------------------------------------------------------------------------
+
+class WelcomeAudioCache:
+    """
+    Memory and disk cache of synthesized greetings keyed by voice and text.
+    """
+    def __init__(self, directory=WELCOME_AUDIO_DIR, tts_model=WELCOME_TTS_MODEL):
+        """
+        Initialize the cache.
+
+        Args:
+            directory (str): Directory for WAV files, created on first write
+            tts_model (str): Text-to-speech model used for synthesis
+        """
+        self.directory = directory
+        self.tts_model = tts_model
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def key(self, voice, text):
+        """Stable cache key for a voice, TTS model and text"""
+        digest = hashlib.sha256(f"{voice}\0{self.tts_model}\0{text}".encode("utf-8")).hexdigest()
+        return f"{voice}-{digest[:16]}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def get(self, voice, text):
+        """
+        Return cached greeting audio, loading it from disk if needed.
+
+        Args:
+            voice (str): Voice name
+            text (str): Greeting text
+
+        Returns:
+            WelcomeAudio: Cached audio, or None if it has not been synthesized yet
+        """
+        key = self.key(voice, text)
+        with self._lock:
+            audio = self._memory.get(key)
+        if audio is not None:
+            return audio
+        try:
+            with wave.open(self._path(key), "rb") as f:
+                audio = WelcomeAudio(f.readframes(f.getnframes()), f.getframerate(), f.getnchannels())
+        except (OSError, EOFError, wave.Error):
+            return None
+        with self._lock:
+            self._memory[key] = audio
+        return audio
+
+    def put(self, voice, text, audio):
+        """
+        Store greeting audio in memory and on disk.
+
+        The file is written under a temporary name and renamed, so other
+        processes never read a partially written greeting.
+
+        Args:
+            voice (str): Voice name
+            text (str): Greeting text
+            audio (WelcomeAudio): Audio to store
+        """
+        key = self.key(voice, text)
+        with self._lock:
+            self._memory[key] = audio
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            partial = f"{self._path(key)}.{os.getpid()}.tmp"
+            with wave.open(partial, "wb") as f:
+                f.setnchannels(audio.num_channels)
+                f.setsampwidth(2)
+                f.setframerate(audio.sample_rate)
+                f.writeframes(audio.pcm)
+            os.replace(partial, self._path(key))
+        except OSError as e:
+            print(f"Error writing welcome audio cache: {str(e)}")
+
+    async def synthesize(self, tts, voice, text):
+        """
+        Synthesize a greeting and store it in the cache.
+
+        Args:
+            tts: LiveKit TTS instance configured with the voice
+            voice (str): Voice name used for the cache key
+            text (str): Greeting text
+
+        Returns:
+            WelcomeAudio: The synthesized audio
+        """
+        frames = []
+        async for synthesized in tts.synthesize(text):
+            frames.append(synthesized.frame)
+        if not frames:
+            raise RuntimeError("text-to-speech returned no audio")
+        audio = WelcomeAudio(b"".join(bytes(frame.data) for frame in frames),
+                             frames[0].sample_rate, frames[0].num_channels)
+        self.put(voice, text, audio)
+        return audio
+
+# Process-wide cache of synthesized greetings
+WELCOME_AUDIO = WelcomeAudioCache()
+
+# PLAYBACK
+# ------------------------------------------------------------------------
+
+async def play_welcome_audio(room, audio, on_started=None):
+    """
+    Publish greeting audio to the room on its own track and play it out.
+
+    The track is unpublished once playback completes, leaving the agent's
+    own track as the only voice for the rest of the session.
+
+    Args:
+        room (rtc.Room): Connected room
+        audio (WelcomeAudio): Greeting to play
+        on_started (callable, optional): Called when the first frame is queued
+    """
+    source = rtc.AudioSource(audio.sample_rate, audio.num_channels)
+    track = rtc.LocalAudioTrack.create_audio_track("welcome", source)
+    options = rtc.TrackPublishOptions(source=rtc.TrackSource.SOURCE_MICROPHONE)
+    publication = await room.local_participant.publish_track(track, options)
+    try:
+        samples_per_frame = audio.sample_rate * FRAME_MS // 1000
+        frame_bytes = samples_per_frame * audio.num_channels * 2
+        for offset in range(0, len(audio.pcm), frame_bytes):
+            chunk = audio.pcm[offset:offset + frame_bytes]
+            await source.capture_frame(rtc.AudioFrame(
+                chunk, audio.sample_rate, audio.num_channels, len(chunk) // (2 * audio.num_channels)))
+            if offset == 0 and on_started:
+                on_started()
+        await source.wait_for_playout()
+    finally:
+        try:
+            await room.local_participant.unpublish_track(publication.sid)
+        except Exception as e:
+            print(f"Error unpublishing welcome track: {str(e)}")
+        await source.aclose()
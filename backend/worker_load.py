@@ -0,0 +1,100 @@
+"""
+LEVRA AI Voice Agent - Worker Load Reporting
+
+LiveKit dispatches new jobs to the least loaded available worker, using the
+load each worker reports. The default load is CPU usage alone, which says
+little about a worker holding many mostly idle voice sessions.
+
+WorkerLoad combines two signals and reports the higher:
+
+- active sessions, scaled so that reaching the per-worker session cap
+  equals the load threshold (and exceeding it reports full load)
+- CPU usage of the machine since the previous report, which includes the
+  job processes running the sessions
+
+A worker whose load reaches the threshold is marked full and receives no
+new jobs until it cools down, so work goes to idle workers first.
+"""
+
+import math
+import os
+import sys
+
+import psutil
+
+# WORKER LOAD CONFIGURATION
+# ------------------------------------------------------------------------
+
+# Maximum concurrent coaching sessions per agent worker
+MAX_SESSIONS_PER_WORKER = int(os.getenv("LEVRA_MAX_SESSIONS_PER_WORKER", "8"))
+
+# Load at which the worker stops accepting new jobs in production (must be below 1;
+# development mode never marks a worker full)
+WORKER_LOAD_THRESHOLD = float(os.getenv("LEVRA_WORKER_LOAD_THRESHOLD", "0.75"))
+
+# LiveKit CLI commands that run the worker in development mode
+DEV_COMMANDS = ("dev", "connect")
+
+def load_threshold(argv=None):
+    """
+    Choose the load threshold for the mode the LiveKit CLI runs in.
+
+    Like LiveKit's own default, development mode never marks a worker full.
+
+    Args:
+        argv (list, optional): Command line, defaults to sys.argv
+
+    Returns:
+        float: Threshold for WorkerOptions.load_threshold
+    """
+    argv = sys.argv if argv is None else argv
+    if len(argv) > 1 and argv[1] in DEV_COMMANDS:
+        return math.inf
+    return WORKER_LOAD_THRESHOLD
+
+class WorkerLoad:
+    """
+    Load function for WorkerOptions.load_fnc.
+
+    Called by the worker about every few seconds from a thread pool.
+    """
+    def __init__(self, max_sessions=MAX_SESSIONS_PER_WORKER, threshold=WORKER_LOAD_THRESHOLD):
+        """
+        Initialize the load calculation.
+
+        Args:
+            max_sessions (int): Session cap per worker
+            threshold (float): Load at which the worker is marked full
+        """
+        self.max_sessions = max_sessions
+        self.threshold = threshold
+        self.last = {}
+        # Prime the CPU counter; the first reading covers the time since this call
+        psutil.cpu_percent(interval=None)
+
+    def __call__(self, worker):
+        """
+        Compute the worker's current load.
+
+        Args:
+            worker (Worker): The LiveKit agent worker
+
+        Returns:
+            float: Load between 0 and 1
+        """
+        sessions = len(worker.active_jobs)
+        if sessions >= self.max_sessions:
+            session_load = 1.0
+        else:
+            session_load = self.threshold * sessions / self.max_sessions
+
+        cpu_load = psutil.cpu_percent(interval=None) / 100
+
+        load = min(1.0, max(session_load, cpu_load))
+        self.last = {
+            "load": round(load, 3),
+            "sessions": sessions,
+            "cpu": round(cpu_load, 3),
+        }
+        return load
+